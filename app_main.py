@@ -22,6 +22,8 @@ import hashlib
 import atexit
 from typing import Optional, Dict, Any, List
 
+_PROCESS_T0 = time.perf_counter()
+
 # ---------------------------------------------------------------------------
 # DIAGNOSTICS — captures Python exceptions (all threads), native C crashes
 # (PortAudio segfaults/access violations), and Tkinter callback errors.
@@ -168,11 +170,16 @@ def setup_environment():
 setup_environment()
 
 # --- THIRD PARTY IMPORTS ---
-import torch
+# torch, faster-whisper and the qwen_tts model stack dominate cold start, so they are imported on first use
+# (the engine stack by the first engine load, after the window has painted). Track regressions with:
+#   python -m qwen_tts.cli.importtime app_main batch_director --forbid torch transformers faster_whisper
 import soundfile as sf
 import sounddevice as sd
 import numpy as np
 from PIL import Image, ImageTk
+from qwen_tts.lazy_imports import LazyModule, is_imported
+
+torch = LazyModule("torch")
 
 try:
     import windnd
@@ -180,21 +187,56 @@ except ImportError:
     windnd = None
 
 WHISPER_ERROR = None
-try:
-    from faster_whisper import WhisperModel
-    WHISPER_AVAILABLE = True
-except Exception as e:
-    WHISPER_AVAILABLE = False
-    WHISPER_ERROR = str(e)
+WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
+def _load_whisper_model_class():
+    """Import faster-whisper on first transcription request."""
+    global WHISPER_AVAILABLE, WHISPER_ERROR
+    try:
+        from faster_whisper import WhisperModel
+    except Exception as e:
+        WHISPER_AVAILABLE = False
+        WHISPER_ERROR = str(e)
+        raise
+    return WhisperModel
 
 # --- LOCAL IMPORTS ---
-try:
-    from qwen_tts import Qwen3TTSModel
-except Exception:
-    Qwen3TTSModel = None
+# Filled in by _import_engine_stack() on the first engine load
+Qwen3TTSModel = None
+VoicePromptCache = None
+RenderCache = None
+release_shared_speech_tokenizers = None
+EngineResidencyManager = None
+ENGINE_STACK_ERROR = None
+
+def _import_engine_stack():
+    """Import the qwen_tts model stack (torch, transformers, ...). Returns True if it is available."""
+    global Qwen3TTSModel, VoicePromptCache, RenderCache, release_shared_speech_tokenizers, EngineResidencyManager
+    global ENGINE_STACK_ERROR
+    if Qwen3TTSModel is not None:
+        return True
+    t0 = time.perf_counter()
+    try:
+        from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel as _model_cls
+        from qwen_tts.inference.voice_prompt_cache import VoicePromptCache as _cache_cls
+        from qwen_tts.inference.render_cache import RenderCache as _render_cache_cls
+        from qwen_tts.inference.qwen3_tts_tokenizer import release_shared_speech_tokenizers as _release_fn
+        from qwen_tts.inference.residency import EngineResidencyManager as _residency_cls
+    except Exception as e:
+        ENGINE_STACK_ERROR = str(e)
+        logging.error("Engine stack import failed: %s", e)
+        return False
+    VoicePromptCache = _cache_cls
+    RenderCache = _render_cache_cls
+    release_shared_speech_tokenizers = _release_fn
+    EngineResidencyManager = _residency_cls
+    Qwen3TTSModel = _model_cls  # set last: marks the stack as imported
+    logging.info("Engine stack imported in %.2fs", time.perf_counter() - t0)
+    return True
 
 # --- NEW IMPORT ---
 from batch_director import BatchDirector
+from qwen_tts.inference.job_journal import JobJournal
 
 # --- CONFIG & CONSTANTS ---
 # Repository Mappings
@@ -204,7 +246,6 @@ MODEL_REPOS = {
     "design": "Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign"
 }
 
-DEVICE = "cuda:0" if torch.cuda.is_available() else "cpu"
 STATS_FILE = "generation_stats.json"
 MAX_WAVEFORM_POINTS = 2000  # UI optimization
 
@@ -753,7 +794,8 @@ Controls how many token candidates the model considers at each step.
 ## Seed  (Reproducibility)
 Pins the random state for a deterministic, repeatable result.
 • Empty — A fresh random seed is chosen and written back automatically after generation.
-• Number — That exact seed is used every time, producing identical audio output."""
+• Number — That exact seed is used every time, producing identical audio output.
+  It also applies to every Batch item, and takes already rendered with it are reused from the render cache."""
 
 HELP_PLUGINS = """Plugins & Automation\n
 
@@ -867,6 +909,20 @@ class QwenTTSApp:
         self.assets_dir = os.path.join(APP_DATA_ROOT, "saved_assets")
         os.makedirs(self.assets_dir, exist_ok=True)
 
+        # Locked clone voices survive engine switches and restarts (keys include the engine checkpoint).
+        # Created with the engine stack in _init_engine_stack().
+        self.voice_prompt_cache = None
+        # Seeded generations already rendered once (same engine, text, voice, settings and seed) are served from
+        # disk by every tab and the Batch Director. Also created in _init_engine_stack().
+        self.render_cache = None
+
+        # Blocks finished by Batch / Batch Director jobs, so a job cut short by a crash resumes where it stopped
+        try:
+            self.job_journal = JobJournal(os.path.join(APP_DATA_ROOT, "job_journal.sqlite"))
+        except Exception as e:
+            logging.warning("Job journal unavailable, batch jobs will not be resumable: %s", e)
+            self.job_journal = None
+
         self.model_dir = ENGINE_ROOT 
 
         # Module Hub Initialization
@@ -898,6 +954,10 @@ class QwenTTSApp:
 
         self.model = None
         self.current_model_type = None 
+        # Recently used engines stay parked in host RAM so switches are a device copy, not a disk load.
+        # Created with the engine stack in _init_engine_stack().
+        self.engines = None
+        self._engine_stack_lock = threading.Lock()
         self.generated_audio = None
         self.sample_rate = 24000
         self.locked_voice_prompt = None
@@ -968,8 +1028,8 @@ class QwenTTSApp:
         self.set_busy(True, "Initializing Engine...")
         self.notebook.select(self.notebook.tabs()[0])  # Always start on Custom Voice
         
-        # Initial Model Load
-        self.switch_model("custom") # Start with custom
+        # Initial Model Load happens once the window is up (see end of __init__)
+        self._lock_interface(True)
         
         # Start helper loop (idling)
         self._update_helper_timer()
@@ -984,6 +1044,9 @@ class QwenTTSApp:
         # Start System Monitors
         self._start_vram_monitor()
 
+        # Initial Model Load — queued behind the first paint so the engine stack imports off the critical path
+        self.root.after_idle(lambda: self.switch_model("custom")) # Start with custom
+
     def setup_styles(self):
         self.colors = {
             "bg": "#f4f6f9",
@@ -1986,6 +2049,7 @@ class QwenTTSApp:
 
     def _whisper_thread(self, path, lang_code=None):
         try:
+            WhisperModel = _load_whisper_model_class()
             device = "cuda" if torch.cuda.is_available() else "cpu"
             compute_type = "float16" if device == "cuda" else "int8"
             
@@ -2065,10 +2129,21 @@ class QwenTTSApp:
         output_dir = self.batch_out_dir.get()
         temp = self.temp_var.get()
         top_p = self.top_p_var.get()
+        # A seed set in the controls applies to every item (and lets unchanged items hit the render cache)
+        try:
+            fixed_seed = int(self.seed_var.get().strip())
+            if fixed_seed < 0:
+                raise ValueError
+        except (ValueError, AttributeError):
+            fixed_seed = None
 
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
+        # Items an interrupted run already wrote into this folder are restored instead of regenerated
+        journal = self.job_journal.begin(os.path.abspath(output_dir)) if self.job_journal else None
+        failures = 0
+
         for i, task in enumerate(tasks):
             if self.cancel_signal.is_set():
                 break
@@ -2086,24 +2161,42 @@ class QwenTTSApp:
                     final_speaker = "Eric" 
                     instruction = speaker_raw 
 
-                wavs, sr = self.model.generate_custom_voice(
-                    text=text,
-                    speaker=final_speaker,
-                    instruct=instruction,
-                    temperature=temp,
-                    top_p=top_p
-                )
-                
-                sf.write(os.path.join(output_dir, f"{fname}.wav"), wavs[0], sr)
+                out_path = os.path.join(output_dir, f"{fname}.wav")
+                params = {"file": f"{fname}.wav", "speaker": final_speaker, "instruct": instruction,
+                          "text": text, "temperature": temp, "top_p": top_p}
+
+                if journal is None or journal.lookup(params, fixed_seed) is None:
+                    # explicit seed, so the journal can tell how the item was made
+                    seed = fixed_seed if fixed_seed is not None else random.randint(0, 0xFFFFFFFF)
+                    wavs, sr = self.model.generate_custom_voice(
+                        text=text,
+                        speaker=final_speaker,
+                        instruct=instruction,
+                        temperature=temp,
+                        top_p=top_p,
+                        seed=seed
+                    )
+
+                    sf.write(out_path, wavs[0], sr)
+                    if journal is not None:
+                        journal.record(params, seed, out_path, sr)
                 self.root.after(0, lambda v=i+1: self.batch_progress.configure(value=v))
                 
             except Exception as e:
+                failures += 1
                 print(f"Batch failed on item {i}: {e}")
+        else:
+            # ran through without a cancel; nothing left to resume once every item succeeded
+            if journal is not None and not failures:
+                journal.finish()
 
+        msg = "Batch processing finished."
+        if journal is not None and journal.restored:
+            msg += f"\n{journal.restored} item(s) were restored from an interrupted run."
         self.root.after(0, lambda: [
             self.set_busy(False),
             self._lock_interface(False),
-            messagebox.showinfo("Batch Complete", "Batch processing finished.")
+            messagebox.showinfo("Batch Complete", msg)
         ])
 
     def draw_waveform(self):
@@ -2663,6 +2756,9 @@ class QwenTTSApp:
         n = self.profile_var.get()
         if n in self.voice_configs:
             if messagebox.askyesno("Confirm", f"Delete profile '{n}'?"):
+                audio_path = self.voice_configs[n].get("audio_path")
+                if self.voice_prompt_cache and audio_path:
+                    self.voice_prompt_cache.invalidate_source(audio_path)
                 del self.voice_configs[n]
                 self.save_app_config()
                 self.update_profile_combo()
@@ -3691,7 +3787,7 @@ class QwenTTSApp:
         """Aggressively release all cached GPU memory."""
         gc.collect()
         gc.collect()  # Second pass catches circular refs freed by the first
-        if torch.cuda.is_available():
+        if is_imported("torch") and torch.cuda.is_available():
             torch.cuda.synchronize()  # Wait for all pending CUDA ops before freeing
             torch.cuda.empty_cache()
             torch.cuda.ipc_collect()
@@ -3705,74 +3801,124 @@ class QwenTTSApp:
         self._lock_interface(True)
         threading.Thread(target=self._load_model_thread, args=(mtype, on_success), daemon=True).start()
 
-    def _load_model_thread(self, mtype, on_success=None):
-        try:
-            # 1. Aggressive Cleanup
-            # Always run — even when model is None a worker thread may have severed it
-            # without draining VRAM, so we must synchronize before loading anything new.
-            if getattr(self, 'model', None) is not None:
-                print("Unloading previous engine...")
-                try:
-                    if hasattr(self.model, 'model'):
-                        del self.model.model      # destroy the heavy HF model first
-                except Exception:
-                    pass
-                try:
-                    if hasattr(self.model, 'processor'):
-                        del self.model.processor
-                except Exception:
-                    pass
-                del self.model
-                self.model = None
-            self.flush_vram()                     # synchronize + empty_cache always runs
-            if torch.cuda.is_available():
-                torch.cuda.synchronize()
-            time.sleep(2)                         # give the CUDA driver time to reclaim pages
-            
-            p = MODEL_CUSTOM if mtype == "custom" else (MODEL_DESIGN if mtype == "design" else MODEL_BASE)
-            repo_id = MODEL_REPOS.get(mtype)
-            
-            if self.cancel_signal.is_set(): raise Exception("Cancelled by user.")
-            
-            # 2. Check and Download if missing
-            if not os.path.exists(os.path.join(p, "config.json")):
-                print(f"Engine files missing at {p}. Downloading from {repo_id}...")
-                self.root.after(0, lambda: self.set_busy(True, f"Downloading {mtype} engine..."))
-                try:
-                    from huggingface_hub import snapshot_download
-                    snapshot_download(repo_id=repo_id, local_dir=p)
-                except ImportError:
-                    raise Exception("huggingface_hub library missing.")
-                except Exception as e:
-                    raise Exception(f"Download failed: {e}")
+    def _load_engine_from_disk(self, mtype):
+        """Download (if needed) and load one engine. Used as the residency manager's loader."""
+        p = MODEL_CUSTOM if mtype == "custom" else (MODEL_DESIGN if mtype == "design" else MODEL_BASE)
+        repo_id = MODEL_REPOS.get(mtype)
+        
+        if self.cancel_signal.is_set(): raise Exception("Cancelled by user.")
+        
+        # 2. Check and Download if missing
+        if not os.path.exists(os.path.join(p, "config.json")):
+            print(f"Engine files missing at {p}. Downloading from {repo_id}...")
+            self.root.after(0, lambda: self.set_busy(True, f"Downloading {mtype} engine..."))
+            try:
+                from huggingface_hub import snapshot_download
+                snapshot_download(repo_id=repo_id, local_dir=p)
+            except ImportError:
+                raise Exception("huggingface_hub library missing.")
+            except Exception as e:
+                raise Exception(f"Download failed: {e}")
 
-            print(f"Loading {mtype} engine into VRAM...")
-            
+        print(f"Loading {mtype} engine into VRAM...")
+        
     # 3. Robust Loading with Hardware Fallback (V4.0 Universal)
-            try:
-                if Qwen3TTSModel:
-                    # Attempt GPU loading with your specific settings
-                    self.model = Qwen3TTSModel.from_pretrained(
-                        p, 
-                        device_map="auto", 
-                        torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32
-                    )
-                else:
-                    time.sleep(1)
-            except RuntimeError as e:
-                # Catch "no kernel image" errors for your girlfriend's 8GB rig
-                if "kernel image" in str(e).lower() or "cuda" in str(e).lower():
-                    print(f"CUDA Hardware Mismatch: {e}. Falling back to CPU...")
-                    self.model = Qwen3TTSModel.from_pretrained(
-                        p,
-                        device_map={"": "cpu"},
-                        torch_dtype=torch.float32
+        model = None
+        try:
+            if Qwen3TTSModel:
+                # Attempt GPU loading with your specific settings
+                model = Qwen3TTSModel.from_pretrained(
+                    p, 
+                    device_map="auto", 
+                    torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32
+                )
+            else:
+                time.sleep(1)
+        except RuntimeError as e:
+            # Catch "no kernel image" errors for your girlfriend's 8GB rig
+            if "kernel image" in str(e).lower() or "cuda" in str(e).lower():
+                print(f"CUDA Hardware Mismatch: {e}. Falling back to CPU...")
+                model = Qwen3TTSModel.from_pretrained(
+                    p,
+                    device_map={"": "cpu"},
+                    torch_dtype=torch.float32
+                )
+                self.root.after(0, lambda: messagebox.showwarning(
+                    "Hardware Notice", "GPU mismatch detected. Running in CPU mode for stability."))
+            else:
+                raise e
+        return model
+
+    def _init_engine_stack(self):
+        """Import the engine stack and create the objects that depend on it (runs on the load thread)."""
+        if not _import_engine_stack():
+            raise Exception(f"Engine stack unavailable: {ENGINE_STACK_ERROR}")
+        with self._engine_stack_lock:
+            if self.voice_prompt_cache is None:
+                self.voice_prompt_cache = VoicePromptCache(os.path.join(APP_DATA_ROOT, "voice_prompt_cache"))
+            if self.render_cache is None:
+                cache_gb = self.app_config.get("render_cache_gb", 2)
+                if cache_gb:
+                    self.render_cache = RenderCache(
+                        os.path.join(APP_DATA_ROOT, "render_cache"), max_bytes=int(cache_gb * (1 << 30))
                     )
-                    self.root.after(0, lambda: messagebox.showwarning(
-                        "Hardware Notice", "GPU mismatch detected. Running in CPU mode for stability."))
-                else:
-                    raise e
+            if self.engines is None:
+                ram_gb = self.app_config.get("engine_ram_budget_gb")
+                vram_gb = self.app_config.get("engine_vram_budget_gb")
+                idle_min = self.app_config.get("engine_idle_minutes", 15)
+                self.engines = EngineResidencyManager(
+                    loader=self._load_engine_from_disk,
+                    ram_budget_bytes=int(ram_gb * (1 << 30)) if ram_gb is not None else None,
+                    vram_budget_bytes=int(vram_gb * (1 << 30)) if vram_gb is not None else None,
+                    idle_timeout_s=idle_min * 60 if idle_min else None,
+                )
+
+    def _log_generation_metrics(self, metrics):
+        """Metrics hook enabled by the `log_generation_metrics` setting: per-stage timings go to debug.log."""
+        logging.info("Generation metrics: %s", metrics.summary())
+
+    def _load_model_thread(self, mtype, on_success=None):
+        try:
+            self._init_engine_stack()
+            if self.engines is not None:
+                # 1. The residency manager parks the current engine in host RAM (or drops it when it
+                # does not fit the budget) and either restores the requested one with a device copy
+                # or loads it from disk. The shared speech tokenizer stays resident throughout.
+                self.model = None
+                if self.engines.is_parked(mtype):
+                    print(f"Restoring parked {mtype} engine...")
+                    self.root.after(0, lambda: self.set_busy(True, f"Restoring {mtype} engine..."))
+                self.model = self.engines.acquire(mtype)
+                self.flush_vram()
+            else:
+                # 1. Aggressive Cleanup
+                # Always run — even when model is None a worker thread may have severed it
+                # without draining VRAM, so we must synchronize before loading anything new.
+                if getattr(self, 'model', None) is not None:
+                    print("Unloading previous engine...")
+                    try:
+                        if hasattr(self.model, 'model'):
+                            del self.model.model      # destroy the heavy HF model first
+                    except Exception:
+                        pass
+                    try:
+                        if hasattr(self.model, 'processor'):
+                            del self.model.processor
+                    except Exception:
+                        pass
+                    del self.model
+                    self.model = None
+                self.flush_vram()                     # synchronize + empty_cache always runs
+                if torch.cuda.is_available():
+                    torch.cuda.synchronize()
+                time.sleep(2)                         # give the CUDA driver time to reclaim pages
+                self.model = self._load_engine_from_disk(mtype)
             
+            if self.model is not None:
+                self.model.set_voice_prompt_cache(self.voice_prompt_cache)
+                self.model.set_render_cache(self.render_cache)
+                if self.app_config.get("log_generation_metrics", False):
+                    self.model.add_metrics_hook(self._log_generation_metrics)
             self.current_model_type = mtype
             self._model_load_event.set()  # Signal waiting threads that the model is ready
             self.root.after(0, lambda: self.on_model_loaded(on_success))
@@ -3987,6 +4133,11 @@ class QwenTTSApp:
                     pass
                 del self.model
                 self.model = None
+            # A full reset also drops parked engines and rebuilds the shared speech tokenizer
+            if self.engines is not None:
+                self.engines.release_all()
+            if release_shared_speech_tokenizers:
+                release_shared_speech_tokenizers()
             self.flush_vram()
 
             # Delay reload — give the CUDA driver time to reclaim pages before
@@ -4257,6 +4408,7 @@ class QwenTTSApp:
         
         def _task():
             try:
+                WhisperModel = _load_whisper_model_class()
                 device = "cuda" if torch.cuda.is_available() else "cpu"
                 compute_type = "float16" if device == "cuda" else "int8"
                 model = WhisperModel("small", device=device, compute_type=compute_type)
@@ -4466,6 +4618,9 @@ def launch_studio():
 
         logging.info("Tk window created — entering mainloop")
         app = QwenTTSApp(root)
+        root.after_idle(lambda: logging.info(
+            "Window ready %.2fs after launch (torch imported: %s)",
+            time.perf_counter() - _PROCESS_T0, is_imported("torch")))
 
         def _on_closing():
             app._app_alive = False
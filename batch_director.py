@@ -10,15 +10,20 @@ import os
 import time
 import json
 import shutil
-import torch
 import difflib
 import tempfile
 
+from qwen_tts.lazy_imports import LazyModule, is_imported
+from qwen_tts.inference.scene_render import (
+    PRESET_SPEAKERS, audio_filename, block_engine, design_instruct, normalize_language, order_by_engine,
+    resolve_seed,
+)
+
+# Imported on first use so loading the Batch Director does not pull in the engine stack
+torch = LazyModule("torch")
+
 # --- CONSTANTS ---
-PRESETS = [
-    "Vivian", "Serena", "Ryan", "Aiden", "Eric", 
-    "Dylan", "Uncle_Fu", "Ono_Anna", "Sohee"
-]
+PRESETS = list(PRESET_SPEAKERS)
 SUPPORTED_LANGUAGES = [
     "English", "Chinese", "Japanese", "Korean", "Cantonese", 
     "German", "French", "Russian", "Portuguese", "Spanish", 
@@ -59,6 +64,13 @@ def _deep_destroy_model(app):
         except Exception:
             pass
         app.model = None
+    # Parked engines and the shared speech tokenizer may be in the same broken state; rebuild them on the next load
+    if getattr(app, 'engines', None) is not None:
+        app.engines.release_all()
+    # Nothing to release if no engine was ever loaded (the tokenizer module is imported with the engine stack)
+    if is_imported("qwen_tts.inference.qwen3_tts_tokenizer"):
+        from qwen_tts.inference.qwen3_tts_tokenizer import release_shared_speech_tokenizers
+        release_shared_speech_tokenizers()
     app.flush_vram()
 
 
@@ -746,14 +758,13 @@ class BatchDirector(tk.Frame):
                     has_audio = True
 
                 # Format: 001_SpeakerName.wav
-                spk_clean = "".join(x for x in block_data["speaker"] if x.isalnum())
-                audio_filename = f"{i+1:03d}_{spk_clean}.wav"
-                full_audio_path = os.path.join(audio_dir_path, audio_filename)
+                audio_name = audio_filename(i, block_data["speaker"])
+                full_audio_path = os.path.join(audio_dir_path, audio_name)
 
                 try:
                     sf.write(full_audio_path, b.generated_audio, b.sample_rate)
                     # Store RELATIVE path so the folder and JSON can be moved together
-                    block_data["audio_file"] = os.path.join(audio_dir_name, audio_filename).replace("\\", "/")
+                    block_data["audio_file"] = os.path.join(audio_dir_name, audio_name).replace("\\", "/")
                 except Exception as e:
                     print(f"Failed to save audio for block {i+1}: {e}")
 
@@ -886,30 +897,14 @@ class BatchDirector(tk.Frame):
                 self.play_scene()
             return
 
-        # 2. Sort Queue for Optimized Switching
-        custom_tasks = []
-        design_tasks = []
-        clone_tasks = []
-        
-        for b in pending_blocks:
-            if b.block_type == "clone":
-                clone_tasks.append(b)
-            elif b.speaker_var.get() in PRESETS:
-                custom_tasks.append(b)
-            else:
-                design_tasks.append(b) # Assumes design profile
-
-        # Sort Clone tasks by speaker for prompt caching efficiency
-        clone_tasks.sort(key=lambda x: x.speaker_var.get())
-
-        # Determine Order based on current engine
-        current = self.app.current_model_type
-        if current == "base":
-            final_queue = clone_tasks + custom_tasks + design_tasks
-        elif current == "design":
-            final_queue = design_tasks + custom_tasks + clone_tasks
-        else: # custom or None
-            final_queue = custom_tasks + design_tasks + clone_tasks
+        # 2. Sort Queue for Optimized Switching: current engine first, clone tasks by speaker
+        # for prompt caching efficiency (same rules as the headless SceneRenderer)
+        final_queue = order_by_engine(
+            pending_blocks,
+            mode_of=lambda b: block_engine(b.block_type, b.speaker_var.get()),
+            speaker_of=lambda b: b.speaker_var.get(),
+            current_mode=self.app.current_model_type,
+        )
 
         # Pre-read all Tkinter widget values on the main thread (Tkinter is not thread-safe)
         block_data_map = {}
@@ -927,7 +922,12 @@ class BatchDirector(tk.Frame):
         self.app.set_busy(True, "Directing Scene...")
         self.btn_run.config(state=tk.DISABLED)
 
-        threading.Thread(target=self._generation_worker, args=(final_queue, block_data_map), daemon=True).start()
+        threading.Thread(
+            target=self._generation_worker,
+            args=(final_queue, block_data_map),
+            kwargs={"journal_scope": f"batch_director:{self.script_name_var.get()}"},
+            daemon=True
+        ).start()
 
     def generate_single_block(self, block):
         """Generate audio for one specific block without touching others."""
@@ -1013,9 +1013,7 @@ class BatchDirector(tk.Frame):
             return
 
         speaker_selection = mt_data["speaker"]
-        lang = mt_data["lang"]
-        if not lang or lang == "Auto":
-            lang = "English"
+        lang = normalize_language(mt_data["lang"])
 
         style_name = mt_data["style"]
         temp = mt_data["temp"]
@@ -1023,12 +1021,7 @@ class BatchDirector(tk.Frame):
         instruction = self.app.app_config.get("style_instructions", {}).get(style_name, "")
 
         # --- Step A: Determine required engine ---
-        if block.block_type == "clone":
-            required_mode = "base"
-        elif speaker_selection in PRESETS:
-            required_mode = "custom"
-        else:
-            required_mode = "design"
+        required_mode = block_engine(block.block_type, speaker_selection)
 
         if self.app.current_model_type != required_mode:
             should_switch = self.auto_switch_var.get()
@@ -1097,7 +1090,7 @@ class BatchDirector(tk.Frame):
         # --- Pre-resolve clone prompt and design profile (once, outside loop) ---
         cached_prompt = None
         design_desc = ""
-        design_instruct = instruction
+        take_instruct = instruction
 
         if required_mode == "base":
             try:
@@ -1125,8 +1118,7 @@ class BatchDirector(tk.Frame):
                 self.app.root.after(0, lambda: _fail(f"Profile '{speaker_selection}' not found."))
                 return
             design_desc = profile.get("desc", "")
-            prof_instruct = profile.get("instruct", "")
-            design_instruct = f"{instruction}. {prof_instruct}" if instruction else prof_instruct
+            take_instruct = design_instruct(profile, instruction)
 
         # --- Step B: Generation loop ---
         takes = []
@@ -1152,7 +1144,7 @@ class BatchDirector(tk.Frame):
                 elif required_mode == "design":
                     wavs, sr = self.app.model.generate_voice_design(
                         text=text, voice_description=design_desc,
-                        instruct=design_instruct, language=lang,
+                        instruct=take_instruct, language=lang,
                         temperature=temp, top_p=top_p, seed=current_seed)
 
                 elif required_mode == "base":
@@ -1239,7 +1231,17 @@ class BatchDirector(tk.Frame):
         # Deprecated: functionality moved to main run button
         self.start_scene_generation()
 
-    def _generation_worker(self, queue, block_data_map=None, play_on_complete=True):
+    def _voice_signature(self, mode, speaker):
+        """What a design / clone voice is made of beyond its name, so an edited voice is not resumed."""
+        if mode == "design":
+            profile = self.app.design_profiles.get(speaker) or getattr(self.app, "voice_recipes", {}).get(speaker)
+            return (profile or {}).get("instruct", "")
+        if mode == "base":
+            profile = self.app.voice_configs.get(speaker) or {}
+            return [profile.get("audio_path"), profile.get("transcript")]
+        return None
+
+    def _generation_worker(self, queue, block_data_map=None, play_on_complete=True, journal_scope=None):
         total = len(queue)
 
         # Sanity-check: detect meta-tensor state before processing any blocks.
@@ -1276,6 +1278,12 @@ class BatchDirector(tk.Frame):
         # Tracks engine mode when a meta-tensor abort breaks the loop (for auto-recovery)
         _meta_abort_mtype = None
 
+        # Blocks finished by an interrupted run of this scene are restored from the job journal
+        journal = None
+        if journal_scope and getattr(self.app, "job_journal", None) is not None:
+            journal = self.app.job_journal.begin(journal_scope)
+        failures = 0
+
         for i, block in enumerate(queue):
             if self.app.cancel_signal.is_set(): break
             
@@ -1286,21 +1294,49 @@ class BatchDirector(tk.Frame):
 
             # Guard: empty / "Auto" language can cause meta-tensor crashes in some
             # model builds. Fall back to "English" if blank.
-            if not lang or lang == "Auto":
-                lang = "English"
+            lang = normalize_language(lang)
 
             if not text:
+                failures += 1
                 self.app.root.after(0, lambda b=block: b.set_status("failed"))
                 continue
 
+            required_mode = block_engine(block.block_type, speaker_selection)
+
+            style_name = bdata.get("style", block.style_var.get())
+            temp = bdata.get("temp", block.temp_var.get())
+            top_p = bdata.get("top_p", block.top_p_var.get())
+            instruction = self.app.app_config.get("style_instructions", {}).get(style_name, "")
+
+            # Resolve seed: use stored value or generate a fresh random one.
+            # If random, write it back into the block's entry so it's saved with the script.
+            block_seed, seed_is_new = resolve_seed(bdata.get("seed", block.seed_var.get().strip()))
+
+            # --- RESUME: a block this scene already finished before a crash / abort ---
+            journal_params = {
+                "mode": required_mode, "text": text, "speaker": speaker_selection,
+                "voice": self._voice_signature(required_mode, speaker_selection), "language": lang,
+                "instruct": instruction, "temperature": temp, "top_p": top_p,
+            }
+            entry = journal.lookup(journal_params, None if seed_is_new else block_seed) if journal else None
+            if entry is not None:
+                try:
+                    audio, sr = sf.read(entry.audio_file, dtype="float32")
+                    block.generated_audio = audio
+                    block.sample_rate = sr
+                    self.app.root.after(0, lambda s=entry.seed, b=block: b.seed_var.set(str(s)))
+                    self.app.root.after(0, lambda b=block: b.set_status("review"))
+                    self.app.root.after(0, lambda idx=i+1: self.lbl_progress.config(
+                        text=f"Restored block {idx}/{total} from the job journal"))
+                    continue
+                except Exception as e:
+                    print(f"Failed to restore block from the job journal: {e}")
+
+            if seed_is_new:
+                self.app.root.after(0, lambda s=block_seed, b=block: b.seed_var.set(str(s)))
+
             # --- SMART SWITCHING LOGIC ---
-            if block.block_type == "clone":
-                required_mode = "base"
-            elif speaker_selection in PRESETS:
-                required_mode = "custom"
-            else:
-                required_mode = "design"
-            
+
             if self.app.current_model_type != required_mode:
                 # 1. Determine if we should switch
                 should_switch = self.auto_switch_var.get()
@@ -1355,22 +1391,6 @@ class BatchDirector(tk.Frame):
             # Update UI from thread
             self.app.root.after(0, lambda b=block: b.set_status("busy"))
             self.app.root.after(0, lambda idx=i+1: self.lbl_progress.config(text=f"Generating block {idx}/{total}..."))
-            
-            style_name = bdata.get("style", block.style_var.get())
-            temp = bdata.get("temp", block.temp_var.get())
-            top_p = bdata.get("top_p", block.top_p_var.get())
-            instruction = self.app.app_config.get("style_instructions", {}).get(style_name, "")
-
-            # Resolve seed: use stored value or generate a fresh random one.
-            # If random, write it back into the block's entry so it's saved with the script.
-            try:
-                raw_seed = bdata.get("seed", block.seed_var.get().strip())
-                block_seed = int(raw_seed)
-                if block_seed < 0:
-                    raise ValueError
-            except (ValueError, AttributeError):
-                block_seed = random.randint(0, 0xFFFFFFFF)
-                self.app.root.after(0, lambda s=block_seed, b=block: b.seed_var.set(str(s)))
 
             try:
                 wavs = None
@@ -1398,11 +1418,7 @@ class BatchDirector(tk.Frame):
                         raise Exception(f"Profile '{speaker_selection}' not found")
 
                     desc = profile.get("desc", "")
-                    prof_instruct = profile.get("instruct", "")
-
-                    final_instruct = prof_instruct
-                    if instruction:
-                        final_instruct = f"{instruction}. {prof_instruct}"
+                    final_instruct = design_instruct(profile, instruction)
 
                     wavs, sr = self.app.model.generate_voice_design(
                         text=text,
@@ -1457,6 +1473,8 @@ class BatchDirector(tk.Frame):
                         path = os.path.join(self.app.temp_dir, fname)
                         
                         sf.write(path, wavs[0], sr)
+                        if journal is not None:
+                            journal.record(journal_params, block_seed, path, sr)
                         
                         # Refresh Main History UI
                         if hasattr(self.app, 'refresh_history_list'):
@@ -1476,8 +1494,13 @@ class BatchDirector(tk.Frame):
                     _deep_destroy_model(self.app)
                     self.app.root.after(0, lambda b=block: b.set_status("failed"))
                     break
+                failures += 1
                 print(f"Block failed: {e}")
                 self.app.root.after(0, lambda b=block: b.set_status("failed"))
+        else:
+            # every block was attempted (no cancel / abort); close the journal once nothing is left to resume
+            if journal is not None and not failures:
+                journal.finish()
         
         def on_complete():
             self.app.set_busy(False)
@@ -1688,27 +1711,39 @@ class BatchDirector(tk.Frame):
             if not messagebox.askyesno("Render Review", "\n".join(lines)):
                 return
 
-        # Build audio
-        audio_segments = []
-        valid_sr = 24000
-        for b in include:
-            audio_segments.append(b.generated_audio)
-            valid_sr = b.sample_rate
-            silence = np.zeros(int(valid_sr * 0.2))
-            audio_segments.append(silence)
-
-        full_audio = np.concatenate(audio_segments)
+        valid_sr = include[-1].sample_rate or 24000
 
         dst = filedialog.asksaveasfilename(defaultextension=".wav", title="Save Full Scene")
         if dst:
-            sf.write(dst, full_audio, valid_sr)
+            # Stream blocks straight to disk instead of concatenating the whole scene in RAM
+            try:
+                from qwen_tts.inference.audio_io import StreamingAudioWriter
+            except Exception:
+                StreamingAudioWriter = None
+            def write_scene(path):
+                if StreamingAudioWriter is not None:
+                    with StreamingAudioWriter(path, valid_sr) as writer:
+                        for b in include:
+                            writer.write(b.generated_audio)
+                            writer.write_silence(0.2)
+                else:
+                    audio_segments = []
+                    for b in include:
+                        audio_segments.append(b.generated_audio)
+                        audio_segments.append(np.zeros(int(valid_sr * 0.2)))
+                    sf.write(path, np.concatenate(audio_segments), valid_sr)
+
+            write_scene(dst)
 
-            # Auto-Save copy to Session History
+            # Auto-Save copy to Session History (always WAV; any other format is written again)
             try:
                 ts = time.strftime("%Y%m%d-%H%M%S")
                 fname = f"{ts}_Full_Scene_Render.wav"
                 hist_path = os.path.join(self.app.temp_dir, fname)
-                sf.write(hist_path, full_audio, valid_sr)
+                if os.path.splitext(dst)[1].lower() == ".wav":
+                    shutil.copyfile(dst, hist_path)
+                else:
+                    write_scene(hist_path)
                 if hasattr(self.app, 'refresh_history_list'):
                     self.app.refresh_history_list()
             except Exception as e:
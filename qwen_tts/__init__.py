@@ -16,9 +16,35 @@
 
 """
 qwen_tts: Qwen-TTS package.
+
+The public classes are resolved on first access, so `import qwen_tts` does not import torch / transformers.
 """
 
-from .inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
-from .inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+import importlib
+
+_LAZY_EXPORTS = {
+    "AsyncQwen3TTS": ".inference.async_engine",
+    "BatchPlan": ".inference.batch_planner",
+    "GenerationMetrics": ".inference.metrics",
+    "MetricsAggregator": ".inference.metrics",
+    "Qwen3TTSModel": ".inference.qwen3_tts_model",
+    "VoiceClonePromptItem": ".inference.qwen3_tts_model",
+    "Qwen3TTSTokenizer": ".inference.qwen3_tts_tokenizer",
+    "VoicePromptCache": ".inference.voice_prompt_cache",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
-__all__ = ["__version__"]
\ No newline at end of file
+__all__ = ["__version__"]
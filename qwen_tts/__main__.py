@@ -18,6 +18,12 @@ def main():
         "qwen_tts package.\n"
         "Use CLI entrypoints:\n"
         "  - qwen-tts-demo\n"
+        "  - qwen-tts-importtime\n"
+        "  - qwen-tts-bench\n"
+        "  - qwen-tts-parity\n"
+        "  - qwen-tts-serve\n"
+        "  - qwen-tts-render\n"
+        "  - qwen-tts-render-worker\n"
     )
 
 if __name__ == "__main__":
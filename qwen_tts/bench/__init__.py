@@ -0,0 +1,52 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+CPU-runnable benchmarks on tiny, randomly initialized models (no checkpoint download needed).
+
+    qwen-tts-bench --batch-sizes 1 4 --seq-lens 16 64 --output bench.json
+    qwen-tts-bench --baseline bench.json --tolerance 0.15
+    qwen-tts-parity --target generate chunked_decode
+"""
+from .configs import (
+    build_tiny_tokenizer_12hz,
+    build_tiny_tokenizer_25hz,
+    build_tiny_tts_model,
+    tiny_input_ids,
+    tiny_tokenizer_12hz_config,
+    tiny_tokenizer_25hz_config,
+    tiny_tts_config,
+)
+from .parity import InferencePath, ParityReport, TARGETS, VARIANTS, reference_path, run_parity
+from .suite import BENCHMARKS, compare, run_suite
+
+__all__ = [
+    "BENCHMARKS",
+    "InferencePath",
+    "ParityReport",
+    "TARGETS",
+    "VARIANTS",
+    "build_tiny_tokenizer_12hz",
+    "build_tiny_tokenizer_25hz",
+    "build_tiny_tts_model",
+    "compare",
+    "reference_path",
+    "run_parity",
+    "run_suite",
+    "tiny_input_ids",
+    "tiny_tokenizer_12hz_config",
+    "tiny_tokenizer_25hz_config",
+    "tiny_tts_config",
+]
@@ -0,0 +1,258 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Scaled-down configs for the talker, the 12Hz (V2) and the 25Hz (V1) speech tokenizers, and random-weight models
+built from them.
+
+The architectures are the real ones, only narrower and shallower, so every code path (KV cache, code predictor,
+chunked decode, DiT + BigVGAN, Whisper-VQ encoder) runs on a plain CPU in seconds. Special token ids are remapped
+into the small vocabularies: codec specials sit in the top 1024 ids of the talker vocabulary (the range
+`Qwen3TTSForConditionalGeneration.generate` suppresses), so sampled codes always fall inside the codebook.
+"""
+from typing import List, Optional
+
+import torch
+
+from ..core import (
+    Qwen3TTSTokenizerV1Config,
+    Qwen3TTSTokenizerV1Model,
+    Qwen3TTSTokenizerV2Config,
+    Qwen3TTSTokenizerV2Model,
+)
+from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration
+
+CODEBOOK_SIZE = 64
+NUM_CODE_GROUPS = 8
+TEXT_VOCAB_SIZE = 1024
+
+# codec special ids, all inside the suppressed top-1024 range of the talker vocabulary
+_CODEC_SPECIALS = dict(
+    codec_pad_id=CODEBOOK_SIZE + 0,
+    codec_bos_id=CODEBOOK_SIZE + 1,
+    codec_eos_token_id=CODEBOOK_SIZE + 2,
+    codec_think_id=CODEBOOK_SIZE + 3,
+    codec_nothink_id=CODEBOOK_SIZE + 4,
+    codec_think_bos_id=CODEBOOK_SIZE + 5,
+    codec_think_eos_id=CODEBOOK_SIZE + 6,
+)
+BENCH_SPEAKER = "bench"
+# A suppressed id that is not the configured eos: passing it as `eos_token_id` makes every run decode exactly
+# `max_new_tokens` frames.
+NEVER_EOS_ID = CODEBOOK_SIZE + 1023
+
+
+def tiny_tts_config(
+    hidden_size: int = 64,
+    num_hidden_layers: int = 2,
+    code_predictor_layers: int = 1,
+    num_code_groups: int = NUM_CODE_GROUPS,
+) -> Qwen3TTSConfig:
+    """
+    A CustomVoice `Qwen3TTSConfig` with a `hidden_size`-wide talker and code predictor.
+    """
+    head_dim = 16
+    half = head_dim // 2
+    mrope_section = [half - 2 * (half // 3), half // 3, half // 3]
+    return Qwen3TTSConfig(
+        talker_config=dict(
+            code_predictor_config=dict(
+                vocab_size=CODEBOOK_SIZE,
+                hidden_size=hidden_size,
+                intermediate_size=2 * hidden_size,
+                num_hidden_layers=code_predictor_layers,
+                num_attention_heads=hidden_size // head_dim,
+                num_key_value_heads=1,
+                head_dim=head_dim,
+                num_code_groups=num_code_groups,
+            ),
+            vocab_size=CODEBOOK_SIZE + 1024,
+            hidden_size=hidden_size,
+            intermediate_size=2 * hidden_size,
+            num_hidden_layers=num_hidden_layers,
+            num_attention_heads=hidden_size // head_dim,
+            num_key_value_heads=1,
+            head_dim=head_dim,
+            rope_scaling=dict(rope_type="default", mrope_section=mrope_section, interleaved=True),
+            num_code_groups=num_code_groups,
+            text_hidden_size=hidden_size,
+            text_vocab_size=TEXT_VOCAB_SIZE,
+            spk_id={BENCH_SPEAKER: CODEBOOK_SIZE + 7},
+            spk_is_dialect={BENCH_SPEAKER: False},
+            codec_language_id={"english": CODEBOOK_SIZE + 8},
+            **_CODEC_SPECIALS,
+        ),
+        speaker_encoder_config=dict(
+            enc_dim=hidden_size, enc_channels=[16, 16, 16, 16, 48], enc_attention_channels=8, enc_se_channels=8
+        ),
+        tokenizer_type="qwen3_tts_tokenizer_12hz",
+        tts_model_size="bench",
+        tts_model_type="custom_voice",
+        im_start_token_id=TEXT_VOCAB_SIZE - 5,
+        im_end_token_id=TEXT_VOCAB_SIZE - 4,
+        tts_pad_token_id=TEXT_VOCAB_SIZE - 3,
+        tts_bos_token_id=TEXT_VOCAB_SIZE - 2,
+        tts_eos_token_id=TEXT_VOCAB_SIZE - 1,
+    )
+
+
+def tiny_tokenizer_12hz_config(hidden_size: int = 32, num_quantizers: int = NUM_CODE_GROUPS) -> Qwen3TTSTokenizerV2Config:
+    """
+    A `Qwen3TTSTokenizerV2Config` (12.5 Hz codes, 24 kHz audio) with narrow Mimi encoder and decoder stacks.
+    """
+    return Qwen3TTSTokenizerV2Config(
+        encoder_config=dict(
+            hidden_size=hidden_size,
+            num_filters=4,
+            num_hidden_layers=2,
+            num_attention_heads=2,
+            num_key_value_heads=2,
+            head_dim=hidden_size // 2,
+            intermediate_size=2 * hidden_size,
+            codebook_size=CODEBOOK_SIZE,
+            codebook_dim=hidden_size,
+            num_quantizers=num_quantizers,
+            sliding_window=20,
+            use_causal_conv=True,
+            upsample_groups=hidden_size,
+            vector_quantization_hidden_dimension=hidden_size,
+        ),
+        decoder_config=dict(
+            hidden_size=hidden_size,
+            latent_dim=hidden_size,
+            num_attention_heads=2,
+            num_key_value_heads=2,
+            intermediate_size=2 * hidden_size,
+            num_hidden_layers=1,
+            num_quantizers=num_quantizers,
+            codebook_size=CODEBOOK_SIZE,
+            codebook_dim=hidden_size,
+            decoder_dim=hidden_size,
+            sliding_window=8,
+        ),
+        encoder_valid_num_quantizers=num_quantizers,
+    )
+
+
+def tiny_tokenizer_25hz_config(hidden_size: int = 32) -> Qwen3TTSTokenizerV1Config:
+    """
+    A `Qwen3TTSTokenizerV1Config` (25 Hz codes; 16 kHz in, 24 kHz out) with a small Whisper-VQ encoder and
+    DiT + BigVGAN decoder.
+    """
+    return Qwen3TTSTokenizerV1Config(
+        encoder_config=dict(
+            n_mels=128,
+            n_state=hidden_size,
+            n_head=2,
+            n_layer=2,
+            output_dim=hidden_size,
+            audio_vq_layers=1,
+            audio_vq_codebook_size=CODEBOOK_SIZE,
+            audio_vq_codebook_dim=hidden_size,
+            audio_vq_ds_rate=2,
+        ),
+        decoder_config=dict(
+            dit_config=dict(
+                hidden_size=hidden_size,
+                num_hidden_layers=2,
+                num_attention_heads=2,
+                head_dim=hidden_size // 2,
+                emb_dim=16,
+                look_ahead_layers=[1],
+                look_backward_layers=[0],
+                repeats=2,
+                num_embeds=CODEBOOK_SIZE + 1,
+                mel_dim=80,
+                enc_emb_dim=hidden_size,
+                enc_dim=16,
+                enc_channels=[16, 16, 16, 16, 48],
+                enc_attention_channels=8,
+                enc_se_channels=8,
+            ),
+            bigvgan_config=dict(
+                mel_dim=80,
+                upsample_initial_channel=128,
+                upsample_rates=[5, 4, 3, 2, 2, 2],
+                upsample_kernel_sizes=[11, 8, 7, 4, 4, 4],
+            ),
+        ),
+        input_sample_rate=16000,
+        output_sample_rate=24000,
+        decode_upsample_rate=960,
+        encode_downsample_rate=640,
+    )
+
+
+def _build(model_cls, config, device, dtype, seed):
+    torch.manual_seed(seed)
+    return model_cls(config).to(device=device, dtype=dtype).eval()
+
+
+def build_tiny_tts_model(
+    device: str = "cpu", dtype: torch.dtype = torch.float32, seed: int = 0, **config_kwargs
+) -> Qwen3TTSForConditionalGeneration:
+    """
+    Random-weight talker + code predictor (no speech tokenizer attached); `config_kwargs` go to `tiny_tts_config`.
+    """
+    model = _build(Qwen3TTSForConditionalGeneration, tiny_tts_config(**config_kwargs), device, dtype, seed)
+    model.talker.generation_config.pad_token_id = model.config.talker_config.codec_pad_id
+    return model
+
+
+def build_tiny_tokenizer_12hz(device: str = "cpu", dtype: torch.dtype = torch.float32, seed: int = 0) -> Qwen3TTSTokenizerV2Model:
+    """
+    Random-weight 12Hz tokenizer. The codebooks start out all-zero (they are EMA sums filled in by training), which
+    would decode every code to silence, so they are filled with random entries here.
+    """
+    model = _build(Qwen3TTSTokenizerV2Model, tiny_tokenizer_12hz_config(), device, dtype, seed)
+    with torch.no_grad():
+        for name, param in model.named_parameters():
+            if name.endswith("_codebook.embedding_sum"):
+                param.normal_()
+    return model
+
+
+def build_tiny_tokenizer_25hz(device: str = "cpu", dtype: torch.dtype = torch.float32, seed: int = 0) -> Qwen3TTSTokenizerV1Model:
+    """
+    Random-weight 25Hz tokenizer. The x-vector extractor (an ONNX model shipped with real checkpoints) is not
+    attached, so use `model.encoder.quantize_speech` for encoding and pass x-vectors / reference mels to `decode`.
+    """
+    return _build(Qwen3TTSTokenizerV1Model, tiny_tokenizer_25hz_config(), device, dtype, seed)
+
+
+def tiny_input_ids(
+    batch_size: int, num_text_tokens: int, device: str = "cpu", generator: Optional[torch.Generator] = None
+) -> List[torch.Tensor]:
+    """
+    Random assistant-turn ids in the layout `Qwen3TTSForConditionalGeneration.generate` expects: a 3-token role
+    prefix, `num_text_tokens` text ids and a 5-token suffix. Returns one `(1, len)` tensor per batch item.
+    """
+    ids = torch.randint(0, TEXT_VOCAB_SIZE - 8, (batch_size, num_text_tokens + 8), generator=generator)
+    return [row.unsqueeze(0).to(device) for row in ids]
+
+
+__all__ = [
+    "BENCH_SPEAKER",
+    "CODEBOOK_SIZE",
+    "NEVER_EOS_ID",
+    "NUM_CODE_GROUPS",
+    "build_tiny_tokenizer_12hz",
+    "build_tiny_tokenizer_25hz",
+    "build_tiny_tts_model",
+    "tiny_input_ids",
+    "tiny_tokenizer_12hz_config",
+    "tiny_tokenizer_25hz_config",
+    "tiny_tts_config",
+]
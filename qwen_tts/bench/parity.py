@@ -0,0 +1,418 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Numerical parity between a reference inference path and a candidate (optimized) one.
+
+Both paths run the same tiny random-weight model (the candidate usually a transformed second copy built from the
+same seed) on the same inputs and seeds. Three targets are covered:
+
+  - `generate`: `Qwen3TTSForConditionalGeneration.generate`; talker codes must match exactly.
+  - `chunked_decode`: `Qwen3TTSTokenizerV2Decoder.chunked_decode`; waveforms must match.
+  - `decode_25hz`: `Qwen3TTSTokenizerV1Decoder` (DiT + BigVGAN); waveforms must match.
+
+Waveforms match when the largest sample difference is within `atol` and the signal-to-difference ratio is at least
+`min_snr_db`. Random weights decode to very quiet audio, so the scale-free SNR bound is the one that usually bites.
+
+A path is an `InferencePath`: a model plus, optionally, its own entry point with the reference call's signature, so
+a candidate can swap in a different method (a fused loop, a streaming decoder) as well as different weights or
+kernels. Every check also reports the per-stage wall time of both paths and the speedup.
+
+By default only the candidates expected to pass the default tolerances run (`DEFAULT_CANDIDATES`). Lower-precision
+candidates are opt-in and their waveforms are held to their own bounds (`CANDIDATE_TOLERANCES`); their talker codes
+are not expected to match exactly.
+"""
+import statistics
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import torch
+from torch import nn
+from transformers import PretrainedConfig
+
+from ..inference.metrics import stage_timing
+from .configs import (
+    BENCH_SPEAKER,
+    CODEBOOK_SIZE,
+    NEVER_EOS_ID,
+    build_tiny_tokenizer_12hz,
+    build_tiny_tokenizer_25hz,
+    build_tiny_tts_model,
+    tiny_input_ids,
+)
+
+TARGETS = ("generate", "chunked_decode", "decode_25hz")
+
+
+@dataclass
+class InferencePath:
+    """
+    A named way of running one target. `run(model, **inputs)` defaults to the target's reference call.
+    """
+
+    name: str
+    model: nn.Module
+    run: Optional[Callable] = None
+
+
+@dataclass
+class ParityReport:
+    """
+    Outcome of one reference-vs-candidate check. Stage times are medians over the timed repeats, in seconds.
+    """
+
+    target: str
+    reference: str
+    candidate: str
+    passed: bool
+    codes_equal: Optional[bool] = None
+    first_mismatch: Optional[str] = None
+    max_abs_diff: Optional[float] = None
+    snr_db: Optional[float] = None
+    atol: Optional[float] = None
+    min_snr_db: Optional[float] = None
+    reference_stages: Dict[str, float] = field(default_factory=dict)
+    candidate_stages: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> Dict[str, Optional[float]]:
+        return {
+            stage: (ref / self.candidate_stages[stage] if self.candidate_stages.get(stage) else None)
+            for stage, ref in self.reference_stages.items()
+        }
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), speedup=self.speedup)
+
+    def format(self) -> str:
+        verdict = "PASS" if self.passed else "FAIL"
+        lines = [f"[{verdict}] {self.target}: {self.candidate} vs {self.reference}"]
+        if self.codes_equal is not None:
+            lines.append(f"  codes equal: {self.codes_equal}" + (f" ({self.first_mismatch})" if self.first_mismatch else ""))
+        elif self.first_mismatch:
+            lines.append(f"  mismatch: {self.first_mismatch}")
+        if self.max_abs_diff is not None:
+            snr = f"{self.snr_db:.1f} dB" if self.snr_db is not None else "exact"
+            lines.append(
+                f"  max |diff| {self.max_abs_diff:.3e} (atol {self.atol:.1e}), SNR {snr} (min {self.min_snr_db:.0f} dB)"
+            )
+        lines.append(f"  {'stage':<16}{'reference ms':>14}{'candidate ms':>14}{'speedup':>10}")
+        for stage, ref in self.reference_stages.items():
+            cand = self.candidate_stages.get(stage, 0.0)
+            speed = self.speedup.get(stage)
+            lines.append(f"  {stage:<16}{1000 * ref:>14.2f}{1000 * cand:>14.2f}{(f'{speed:.2f}x' if speed else '-'):>10}")
+        return "\n".join(lines)
+
+
+def set_attn_implementation(model: nn.Module, implementation: str) -> nn.Module:
+    """
+    Switch every sub-config of `model` to `implementation` ("eager", "sdpa", ...); attention reads it per call.
+    """
+    for module in model.modules():
+        config = getattr(module, "config", None)
+        if isinstance(config, PretrainedConfig):
+            config._attn_implementation = implementation
+    return model
+
+
+def _timed_runs(path: InferencePath, default_run: Callable, inputs: Dict, seed: int, repeats: int, device):
+    run = path.run or default_run
+    outputs, stage_runs = None, []
+    # one untimed warm-up run, so that one-off costs (allocator growth, kernel selection) are not charged to a path
+    for i in range(max(repeats, 1) + 1):
+        torch.manual_seed(seed)
+        with stage_timing(device) as timer:
+            start = timer._now()
+            outputs = run(path.model, **inputs)
+            total = timer._now() - start
+        stages = {k: v for k, v in timer.seconds.items() if v > 0}
+        if stages:
+            stages["other"] = max(total - sum(stages.values()), 0.0)
+        stages["total"] = total
+        if i > 0:
+            stage_runs.append(stages)
+    names = list(dict.fromkeys(k for s in stage_runs for k in s))
+    return outputs, {k: statistics.median(s.get(k, 0.0) for s in stage_runs) for k in names}
+
+
+def _compare_waveforms(reference: List[torch.Tensor], candidate: List[torch.Tensor], atol: float, min_snr_db: float):
+    max_diff, signal, noise = 0.0, 0.0, 0.0
+    for i, (a, b) in enumerate(zip(reference, candidate)):
+        if a.shape != b.shape:
+            return False, f"item {i}: shape {tuple(b.shape)} != {tuple(a.shape)}", None, None
+        a, b = a.detach().float().cpu(), b.detach().float().cpu()
+        max_diff = max(max_diff, float((a - b).abs().max()) if a.numel() else 0.0)
+        signal += float(a.pow(2).sum())
+        noise += float((a - b).pow(2).sum())
+    if len(reference) != len(candidate):
+        return False, f"{len(candidate)} outputs != {len(reference)}", None, None
+    snr = 10.0 * torch.log10(torch.tensor(signal / noise)).item() if noise > 0 and signal > 0 else None
+    ok = max_diff <= atol and (snr is None or snr >= min_snr_db)
+    return ok, None, max_diff, snr
+
+
+# generate
+
+def _run_generate(model, **inputs):
+    with torch.inference_mode():
+        codes, _ = model.generate(**inputs)
+    return codes
+
+
+def generate_inputs(batch_size: int = 2, seq_len: int = 16, new_frames: int = 24, device="cpu", do_sample: bool = False) -> Dict:
+    """
+    Greedy by default: random weights give nearly flat logits, so greedy argmax picks up small numerical drift that
+    seeded sampling would mostly hide.
+    """
+    generator = torch.Generator().manual_seed(seq_len)
+    return dict(
+        input_ids=tiny_input_ids(batch_size, seq_len, device=device, generator=generator),
+        languages=["english"] * batch_size,
+        speakers=[BENCH_SPEAKER] * batch_size,
+        max_new_tokens=new_frames,
+        eos_token_id=NEVER_EOS_ID,
+        do_sample=do_sample,
+        subtalker_dosample=do_sample,
+    )
+
+
+def check_generate(
+    reference: InferencePath, candidate: InferencePath, inputs: Optional[Dict] = None, seed: int = 0, repeats: int = 1
+) -> ParityReport:
+    """
+    Run `generate` on both paths with the same inputs and seed; the talker codes must be identical.
+    """
+    inputs = inputs or generate_inputs(device=reference.model.device)
+    ref_codes, ref_stages = _timed_runs(reference, _run_generate, inputs, seed, repeats, reference.model.device)
+    cand_inputs = dict(inputs, input_ids=[t.to(candidate.model.device) for t in inputs["input_ids"]])
+    cand_codes, cand_stages = _timed_runs(candidate, _run_generate, cand_inputs, seed, repeats, candidate.model.device)
+
+    mismatch = None
+    if len(ref_codes) != len(cand_codes):
+        mismatch = f"{len(cand_codes)} sequences != {len(ref_codes)}"
+    for i, (a, b) in enumerate(zip(ref_codes, cand_codes)):
+        if mismatch:
+            break
+        a, b = a.cpu(), b.cpu()
+        if a.shape != b.shape:
+            mismatch = f"item {i}: {b.shape[0]} frames != {a.shape[0]}"
+        elif not torch.equal(a, b):
+            frame, group = (a != b).nonzero()[0].tolist()
+            mismatch = f"item {i}: first difference at frame {frame}, code group {group}"
+    return ParityReport(
+        target="generate",
+        reference=reference.name,
+        candidate=candidate.name,
+        passed=mismatch is None,
+        codes_equal=mismatch is None,
+        first_mismatch=mismatch,
+        reference_stages=ref_stages,
+        candidate_stages=cand_stages,
+    )
+
+
+# 12Hz chunked decode
+
+def _run_chunked_decode(decoder, codes):
+    with torch.inference_mode():
+        return list(decoder.chunked_decode(codes).squeeze(1))
+
+
+def chunked_decode_inputs(decoder, batch_size: int = 2, num_frames: int = 120, device="cpu") -> Dict:
+    generator = torch.Generator().manual_seed(num_frames)
+    num_q = decoder.config.num_quantizers
+    return dict(codes=torch.randint(0, CODEBOOK_SIZE, (batch_size, num_q, num_frames), generator=generator).to(device))
+
+
+def check_chunked_decode(
+    reference: InferencePath,
+    candidate: InferencePath,
+    inputs: Optional[Dict] = None,
+    seed: int = 0,
+    repeats: int = 1,
+    atol: float = 1e-4,
+    min_snr_db: float = 60.0,
+) -> ParityReport:
+    """
+    Decode the same `(batch, num_quantizers, frames)` codes on both paths; waveforms must agree within `atol` and `min_snr_db`.
+    """
+    device = reference.model.device
+    inputs = inputs or chunked_decode_inputs(reference.model, device=device)
+    return _check_waveforms("chunked_decode", reference, candidate, _run_chunked_decode, inputs, seed, repeats, atol, min_snr_db)
+
+
+# 25Hz decoder
+
+def _run_decode_25hz(decoder, code, conditioning, reference_mel):
+    with torch.inference_mode():
+        return list(decoder(code=code, conditioning=conditioning, reference_mel=reference_mel))
+
+
+def decode_25hz_inputs(decoder, batch_size: int = 2, num_frames: int = 40, device="cpu") -> Dict:
+    generator = torch.Generator().manual_seed(num_frames)
+    dit = decoder.config.dit_config
+    dtype = next(decoder.parameters()).dtype
+    return dict(
+        code=torch.randint(1, CODEBOOK_SIZE, (batch_size, num_frames), generator=generator).to(device),
+        conditioning=torch.randn(batch_size, dit.enc_emb_dim, generator=generator).to(device, dtype),
+        reference_mel=torch.randn(batch_size, 4 * dit.repeats * 25, dit.mel_dim, generator=generator).to(device, dtype),
+    )
+
+
+def check_decode_25hz(
+    reference: InferencePath,
+    candidate: InferencePath,
+    inputs: Optional[Dict] = None,
+    seed: int = 0,
+    repeats: int = 1,
+    atol: float = 1e-4,
+    min_snr_db: float = 60.0,
+) -> ParityReport:
+    """
+    Run the 25Hz decoder (DiT flow matching + BigVGAN) on both paths with the same seed (the ODE starts from seeded
+    noise); waveforms must agree within `atol` and `min_snr_db`.
+    """
+    device = next(reference.model.parameters()).device
+    inputs = inputs or decode_25hz_inputs(reference.model, device=device)
+    return _check_waveforms("decode_25hz", reference, candidate, _run_decode_25hz, inputs, seed, repeats, atol, min_snr_db)
+
+
+def _check_waveforms(target, reference, candidate, default_run, inputs, seed, repeats, atol, min_snr_db) -> ParityReport:
+    ref_device = next(reference.model.parameters()).device
+    cand_device = next(candidate.model.parameters()).device
+    cand_dtype = next(candidate.model.parameters()).dtype
+    cand_inputs = {
+        k: v.to(cand_device, cand_dtype if v.is_floating_point() else v.dtype) for k, v in inputs.items()
+    }
+    ref_wavs, ref_stages = _timed_runs(reference, default_run, inputs, seed, repeats, ref_device)
+    cand_wavs, cand_stages = _timed_runs(candidate, default_run, cand_inputs, seed, repeats, cand_device)
+    ok, mismatch, max_diff, snr = _compare_waveforms(ref_wavs, cand_wavs, atol, min_snr_db)
+    return ParityReport(
+        target=target,
+        reference=reference.name,
+        candidate=candidate.name,
+        passed=ok,
+        first_mismatch=mismatch,
+        max_abs_diff=max_diff,
+        snr_db=snr,
+        atol=atol,
+        min_snr_db=min_snr_db,
+        reference_stages=ref_stages,
+        candidate_stages=cand_stages,
+    )
+
+
+# built-in candidates
+
+def _variant(transform: Callable[[nn.Module], nn.Module], run: Optional[Callable] = None):
+    def make(model: nn.Module, name: str) -> InferencePath:
+        return InferencePath(name=name, model=transform(model), run=run)
+    return make
+
+
+VARIANTS: Dict[str, Dict[str, Callable]] = {
+    "generate": {
+        "sdpa": _variant(lambda m: set_attn_implementation(m, "sdpa")),
+        "bfloat16": _variant(lambda m: m.to(torch.bfloat16)),
+    },
+    "chunked_decode": {
+        "sdpa": _variant(lambda m: set_attn_implementation(m, "sdpa")),
+        "bfloat16": _variant(lambda m: m.to(torch.bfloat16)),
+    },
+    "decode_25hz": {
+        "bfloat16": _variant(lambda m: m.to(torch.bfloat16)),
+    },
+}
+
+# candidates `run_parity` checks when none are named
+DEFAULT_CANDIDATES: Dict[str, Sequence[str]] = {
+    "generate": ("sdpa",),
+    "chunked_decode": ("sdpa",),
+    "decode_25hz": (),
+}
+
+# waveform tolerances of candidates that cannot meet the fp32 defaults (bfloat16 keeps ~8 mantissa bits)
+CANDIDATE_TOLERANCES: Dict[str, Dict[str, float]] = {
+    "bfloat16": dict(atol=1e-2, min_snr_db=30.0),
+}
+
+
+def reference_path(target: str, device: str = "cpu", seed: int = 0) -> InferencePath:
+    """
+    The fp32 reference for `target`, built from the tiny configs: eager attention, except for the 25Hz decoder,
+    which only supports sdpa.
+    """
+    implementation = "eager"
+    if target == "generate":
+        model = build_tiny_tts_model(device=device, seed=seed)
+    elif target == "chunked_decode":
+        model = build_tiny_tokenizer_12hz(device=device, seed=seed).decoder
+    elif target == "decode_25hz":
+        model = build_tiny_tokenizer_25hz(device=device, seed=seed).decoder
+        implementation = "sdpa"
+    else:
+        raise ValueError(f"Unknown target {target!r}; choose from {list(TARGETS)}")
+    return InferencePath(name=implementation, model=set_attn_implementation(model, implementation))
+
+
+_CHECKS = {"generate": check_generate, "chunked_decode": check_chunked_decode, "decode_25hz": check_decode_25hz}
+
+
+def run_parity(
+    target: str,
+    candidates: Optional[List[str]] = None,
+    device: str = "cpu",
+    seed: int = 0,
+    repeats: int = 1,
+    **check_kwargs,
+) -> List[ParityReport]:
+    """
+    Check the built-in `candidates` (`DEFAULT_CANDIDATES[target]` by default) against the eager reference.
+
+    Waveform targets use `check_kwargs` tolerances when given, else the candidate's `CANDIDATE_TOLERANCES` entry,
+    else the check's defaults.
+    """
+    reference = reference_path(target, device=device, seed=seed)
+    names = candidates if candidates is not None else list(DEFAULT_CANDIDATES[target])
+    reports = []
+    for name in names:
+        if name not in VARIANTS[target]:
+            raise ValueError(f"No candidate {name!r} for {target}; choose from {list(VARIANTS[target])}")
+        # a fresh build with the same seed has the reference weights (the models do not deep-copy cleanly)
+        candidate = VARIANTS[target][name](reference_path(target, device=device, seed=seed).model, name)
+        kwargs = {k: v for k, v in check_kwargs.items() if v is not None}
+        if target != "generate":
+            kwargs = dict(CANDIDATE_TOLERANCES.get(name, {}), **kwargs)
+        reports.append(_CHECKS[target](reference, candidate, seed=seed, repeats=repeats, **kwargs))
+    return reports
+
+
+__all__ = [
+    "CANDIDATE_TOLERANCES",
+    "DEFAULT_CANDIDATES",
+    "InferencePath",
+    "ParityReport",
+    "TARGETS",
+    "VARIANTS",
+    "check_chunked_decode",
+    "check_decode_25hz",
+    "check_generate",
+    "chunked_decode_inputs",
+    "decode_25hz_inputs",
+    "generate_inputs",
+    "reference_path",
+    "run_parity",
+    "set_attn_implementation",
+]
@@ -0,0 +1,322 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmarks over the tiny random-weight models from `configs`.
+
+Each benchmark runs `warmup` untimed and `repeats` timed iterations for one (batch size, sequence length) point
+and returns a flat record: median / min wall time, derived throughput figures and the peak RSS of the timed
+iterations. "Sequence length" is the prompt text length for `generate`, the number of codec frames for the decoders
+and the audio length, in codec frames, for the encoders.
+"""
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+
+from ..inference.metrics import stage_timing
+from .configs import (
+    BENCH_SPEAKER,
+    CODEBOOK_SIZE,
+    NEVER_EOS_ID,
+    build_tiny_tokenizer_12hz,
+    build_tiny_tokenizer_25hz,
+    build_tiny_tts_model,
+    tiny_input_ids,
+)
+
+BENCHMARKS = ("generate", "decode_12hz", "decode_25hz", "encode_12hz", "encode_25hz")
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the kernel's peak-RSS counter for this process (Linux only). Returns False where unsupported.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except (ImportError, OSError):
+        return None
+
+
+def _sync(device: torch.device) -> None:
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def _measure(fn: Callable[[], object], device: torch.device, repeats: int, warmup: int) -> Dict:
+    for _ in range(warmup):
+        fn()
+    reset_peak_rss()
+    if device.type == "cuda":
+        torch.cuda.reset_peak_memory_stats(device)
+    times, last = [], None
+    for _ in range(max(repeats, 1)):
+        _sync(device)
+        start = time.perf_counter()
+        last = fn()
+        _sync(device)
+        times.append(time.perf_counter() - start)
+    return dict(
+        median_s=statistics.median(times),
+        min_s=min(times),
+        peak_rss_bytes=peak_rss_bytes(),
+        peak_device_memory_bytes=int(torch.cuda.max_memory_allocated(device)) if device.type == "cuda" else None,
+        result=last,
+    )
+
+
+@torch.inference_mode()
+def bench_generate(model, batch_size: int, seq_len: int, new_frames: int, repeats: int, warmup: int) -> Dict:
+    """
+    Talker + code predictor: prefill latency, frames/sec and code-predictor steps/sec from stage timing.
+    """
+    device = model.device
+    generator = torch.Generator().manual_seed(seq_len)
+    input_ids = tiny_input_ids(batch_size, seq_len, device=device, generator=generator)
+    kwargs = dict(
+        input_ids=input_ids,
+        languages=["english"] * batch_size,
+        speakers=[BENCH_SPEAKER] * batch_size,
+        max_new_tokens=new_frames,
+        eos_token_id=NEVER_EOS_ID,
+    )
+    for _ in range(warmup):
+        model.generate(**kwargs)
+
+    stage_runs = []
+
+    def run():
+        torch.manual_seed(0)
+        with stage_timing(device) as timer:
+            model.generate(**kwargs)
+        stage_runs.append(timer)
+
+    out = _measure(run, device, repeats, warmup=0)
+    out.pop("result")
+    groups = model.config.talker_config.num_code_groups - 1
+    prefill = statistics.median(t.seconds["prefill"] for t in stage_runs)
+    talker = statistics.median(t.seconds["talker"] for t in stage_runs)
+    predictor = statistics.median(t.seconds["code_predictor"] for t in stage_runs)
+    steps = stage_runs[-1].calls["code_predictor"]
+    return dict(
+        out,
+        new_frames=new_frames,
+        decode_steps=steps,
+        prefill_ms=1000.0 * prefill,
+        talker_ms_per_step=1000.0 * talker / max(steps, 1),
+        code_predictor_ms_per_step=1000.0 * predictor / max(steps, 1),
+        frames_per_s=batch_size * steps / max(prefill + talker + predictor, 1e-9),
+        code_predictor_steps_per_s=steps * groups / max(predictor, 1e-9),
+    )
+
+
+@torch.inference_mode()
+def bench_decode_12hz(tokenizer, batch_size: int, seq_len: int, repeats: int, warmup: int) -> Dict:
+    generator = torch.Generator().manual_seed(seq_len)
+    num_q = tokenizer.config.decoder_config.num_quantizers
+    codes = torch.randint(1, CODEBOOK_SIZE, (batch_size, seq_len, num_q), generator=generator).to(tokenizer.device)
+    out = _measure(lambda: tokenizer.decode(codes, return_dict=True).audio_values, tokenizer.device, repeats, warmup)
+    audio_s = sum(int(w.shape[-1]) for w in out.pop("result")) / tokenizer.get_output_sample_rate()
+    return dict(out, audio_seconds=audio_s, rtf=out["median_s"] / audio_s)
+
+
+@torch.inference_mode()
+def bench_decode_25hz(tokenizer, batch_size: int, seq_len: int, repeats: int, warmup: int) -> Dict:
+    generator = torch.Generator().manual_seed(seq_len)
+    dit = tokenizer.config.decoder_config.dit_config
+    device, dtype = tokenizer.device, tokenizer.dtype
+    codes = torch.randint(1, CODEBOOK_SIZE, (batch_size, seq_len), generator=generator).to(device)
+    xvectors = torch.randn(batch_size, dit.enc_emb_dim, generator=generator).to(device, dtype)
+    ref_mels = torch.randn(batch_size, 2 * dit.repeats * 25, dit.mel_dim, generator=generator).to(device, dtype)
+    out = _measure(lambda: tokenizer.decode(codes, xvectors, ref_mels, return_dict=True).audio_values, device, repeats, warmup)
+    audio_s = sum(int(w.shape[-1]) for w in out.pop("result")) / tokenizer.get_output_sample_rate()
+    return dict(out, audio_seconds=audio_s, rtf=out["median_s"] / audio_s)
+
+
+@torch.inference_mode()
+def bench_encode_12hz(tokenizer, batch_size: int, seq_len: int, repeats: int, warmup: int) -> Dict:
+    generator = torch.Generator().manual_seed(seq_len)
+    samples = seq_len * tokenizer.get_encode_downsample_rate()
+    wavs = (0.1 * torch.randn(batch_size, samples, generator=generator)).to(tokenizer.device, tokenizer.dtype)
+    mask = torch.ones(batch_size, samples, dtype=torch.long, device=tokenizer.device)
+    out = _measure(lambda: tokenizer.encode(wavs, mask, return_dict=True), tokenizer.device, repeats, warmup)
+    out.pop("result")
+    audio_s = batch_size * samples / tokenizer.get_input_sample_rate()
+    return dict(out, audio_seconds=audio_s, audio_s_per_s=audio_s / out["median_s"],
+                frames_per_s=batch_size * seq_len / out["median_s"])
+
+
+@torch.inference_mode()
+def bench_encode_25hz(tokenizer, batch_size: int, seq_len: int, repeats: int, warmup: int) -> Dict:
+    """
+    Whisper-VQ code extraction only: real checkpoints also run an ONNX x-vector extractor, which is not modelled.
+    """
+    generator = torch.Generator().manual_seed(seq_len)
+    samples = seq_len * tokenizer.get_encode_downsample_rate()
+    wavs = [(0.1 * torch.randn(samples, generator=generator)).to(tokenizer.device) for _ in range(batch_size)]
+    out = _measure(lambda: tokenizer.encoder.quantize_speech(wavs), tokenizer.device, repeats, warmup)
+    out.pop("result")
+    audio_s = batch_size * samples / tokenizer.get_input_sample_rate()
+    return dict(out, audio_seconds=audio_s, audio_s_per_s=audio_s / out["median_s"],
+                frames_per_s=batch_size * seq_len / out["median_s"])
+
+
+def environment() -> Dict:
+    info = dict(
+        python=platform.python_version(),
+        platform=platform.platform(),
+        machine=platform.machine(),
+        torch=torch.__version__,
+        numpy=np.__version__,
+        torch_threads=torch.get_num_threads(),
+        cpu_count=os.cpu_count(),
+    )
+    if torch.cuda.is_available():
+        info["cuda_device"] = torch.cuda.get_device_name(0)
+    return info
+
+
+def run_suite(
+    benchmarks: Sequence[str] = BENCHMARKS,
+    batch_sizes: Sequence[int] = (1, 4),
+    seq_lens: Sequence[int] = (16, 64),
+    new_frames: int = 32,
+    repeats: int = 3,
+    warmup: int = 1,
+    device: str = "cpu",
+    dtype: torch.dtype = torch.float32,
+    log: Optional[Callable[[str], None]] = print,
+) -> Dict:
+    """
+    Run `benchmarks` over every (batch size, sequence length) pair and return the JSON-ready report:
+    `{"environment", "settings", "results": [record, ...]}`.
+    """
+    unknown = [b for b in benchmarks if b not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks {unknown}; choose from {list(BENCHMARKS)}")
+    builders = {"generate": build_tiny_tts_model, "12hz": build_tiny_tokenizer_12hz, "25hz": build_tiny_tokenizer_25hz}
+    models = {}
+
+    def model_for(name):
+        kind = name if name == "generate" else name.split("_")[1]  # the two 12hz / 25hz benches share a model
+        if kind not in models:
+            models[kind] = builders[kind](device=device, dtype=dtype)
+        return models[kind]
+
+    results: List[Dict] = []
+    for name in benchmarks:
+        model = model_for(name)
+        for batch_size in batch_sizes:
+            for seq_len in seq_lens:
+                if name == "generate":
+                    record = bench_generate(model, batch_size, seq_len, new_frames, repeats, warmup)
+                else:
+                    record = globals()[f"bench_{name}"](model, batch_size, seq_len, repeats, warmup)
+                record = dict(bench=name, batch_size=batch_size, seq_len=seq_len, **record)
+                results.append(record)
+                if log is not None:
+                    log(format_record(record))
+    return dict(
+        environment=environment(),
+        settings=dict(
+            benchmarks=list(benchmarks), batch_sizes=list(batch_sizes), seq_lens=list(seq_lens),
+            new_frames=new_frames, repeats=repeats, warmup=warmup, device=device, dtype=str(dtype),
+        ),
+        results=results,
+    )
+
+
+def format_record(record: Dict) -> str:
+    head = f"{record['bench']:<12} b={record['batch_size']:<3} n={record['seq_len']:<5} {1000 * record['median_s']:9.1f} ms"
+    if record["bench"] == "generate":
+        tail = (f"prefill {record['prefill_ms']:.1f} ms, {record['frames_per_s']:.1f} frames/s, "
+                f"predictor {record['code_predictor_steps_per_s']:.0f} steps/s")
+    elif record["bench"].startswith("decode"):
+        tail = f"RTF {record['rtf']:.4f}"
+    else:
+        tail = f"{record['audio_s_per_s']:.1f} audio-s/s, {record['frames_per_s']:.0f} frames/s"
+    rss = record.get("peak_rss_bytes")
+    return f"{head}  {tail}" + (f", peak RSS {rss / (1 << 20):.0f} MiB" if rss else "")
+
+
+# Higher is better for these keys; for the time-like keys (median_s, prefill_ms, rtf, ...) lower is better.
+_HIGHER_IS_BETTER = ("frames_per_s", "code_predictor_steps_per_s", "audio_s_per_s")
+_COMPARED = ("median_s", "prefill_ms", "talker_ms_per_step", "code_predictor_ms_per_step", "rtf") + _HIGHER_IS_BETTER
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float = 0.10) -> List[Dict]:
+    """
+    Match records of two reports by (bench, batch size, sequence length) and list every compared metric that got
+    worse by more than `tolerance` (relative).
+    """
+    def key(r):
+        return r["bench"], r["batch_size"], r["seq_len"]
+
+    base = {key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for record in current.get("results", []):
+        old = base.get(key(record))
+        if old is None:
+            continue
+        for metric in _COMPARED:
+            a, b = old.get(metric), record.get(metric)
+            if not a or b is None:
+                continue
+            change = (a - b) / a if metric in _HIGHER_IS_BETTER else (b - a) / a
+            if change > tolerance:
+                regressions.append(dict(bench=record["bench"], batch_size=record["batch_size"],
+                                        seq_len=record["seq_len"], metric=metric, baseline=a, current=b,
+                                        change=change))
+    return regressions
+
+
+__all__ = [
+    "BENCHMARKS",
+    "bench_decode_12hz",
+    "bench_decode_25hz",
+    "bench_encode_12hz",
+    "bench_encode_25hz",
+    "bench_generate",
+    "compare",
+    "environment",
+    "format_record",
+    "peak_rss_bytes",
+    "reset_peak_rss",
+    "run_suite",
+]
@@ -0,0 +1,87 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark runner for the tiny random-weight models in `qwen_tts.bench`, with JSON output and regression checks:
+
+    qwen-tts-bench --output bench.json
+    qwen-tts-bench --bench generate decode_12hz --batch-sizes 1 8 --seq-lens 32 --baseline bench.json
+"""
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from ..bench.suite import BENCHMARKS
+
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-bench",
+        description="Benchmark prefill, talker / code-predictor decoding, 12Hz / 25Hz decode and encode on tiny "
+                    "randomly initialized models.",
+    )
+    parser.add_argument("--bench", nargs="*", default=list(BENCHMARKS), choices=BENCHMARKS,
+                        help="Benchmarks to run (default: all).")
+    parser.add_argument("--batch-sizes", nargs="*", type=int, default=[1, 4])
+    parser.add_argument("--seq-lens", nargs="*", type=int, default=[16, 64],
+                        help="Prompt tokens for generate; codec frames for decode / encode.")
+    parser.add_argument("--new-frames", type=int, default=32, help="Frames decoded per generate run (default: 32).")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--dtype", default="float32", choices=["float32", "float16", "bfloat16"])
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads for stable CPU numbers.")
+    parser.add_argument("--output", default=None, help="Write the JSON report here.")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative slowdown vs. --baseline that counts as a regression (default: 0.10).")
+    args = parser.parse_args(argv)
+
+    import torch
+
+    from ..bench.suite import compare, run_suite
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    report = run_suite(
+        benchmarks=args.bench,
+        batch_sizes=args.batch_sizes,
+        seq_lens=args.seq_lens,
+        new_frames=args.new_frames,
+        repeats=args.repeats,
+        warmup=args.warmup,
+        device=args.device,
+        dtype=getattr(torch, args.dtype),
+    )
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, tolerance=args.tolerance)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION: {r['bench']} b={r['batch_size']} n={r['seq_len']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} ({100 * r['change']:+.1f}%)")
+        failed = bool(regressions)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,7 @@ import numpy as np
 import torch
 
 from .. import Qwen3TTSModel, VoiceClonePromptItem
+from ..inference.async_engine import BatchingDispatcher
 
 
 def _title_case_display(s: str) -> str:
@@ -134,6 +135,26 @@ def build_parser() -> argparse.ArgumentParser:
         help="Gradio queue concurrency (default: 16).",
     )
 
+    # Request batching args
+    parser.add_argument(
+        "--batching",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Batch concurrent requests into one generate call (default: enabled).",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=8,
+        help="Max requests per batched generate call (default: 8).",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=20.0,
+        help="How long a request waits for others to share its batch (default: 20).",
+    )
+
     # HTTPS args
     parser.add_argument(
         "--ssl-certfile",
@@ -251,8 +272,15 @@ def _detect_model_kind(ckpt: str, tts: Qwen3TTSModel) -> str:
         raise ValueError(f"Unknown Qwen-TTS model type: {mt}")
 
 
-def build_demo(tts: Qwen3TTSModel, ckpt: str, gen_kwargs_default: Dict[str, Any]) -> gr.Blocks:
+def build_demo(
+    tts: Qwen3TTSModel,
+    ckpt: str,
+    gen_kwargs_default: Dict[str, Any],
+    dispatcher: Optional[BatchingDispatcher] = None,
+) -> gr.Blocks:
     model_kind = _detect_model_kind(ckpt, tts)
+    # generation goes through the dispatcher when given, so concurrent users share batched generate calls
+    engine = dispatcher if dispatcher is not None else tts
 
     supported_langs_raw = None
     if callable(getattr(tts.model, "get_supported_languages", None)):
@@ -323,7 +351,7 @@ def build_demo(tts: Qwen3TTSModel, ckpt: str, gen_kwargs_default: Dict[str, Any]
                     language = lang_map.get(lang_disp, "Auto")
                     speaker = spk_map.get(spk_disp, spk_disp)
                     kwargs = _gen_common_kwargs()
-                    wavs, sr = tts.generate_custom_voice(
+                    wavs, sr = engine.generate_custom_voice(
                         text=text.strip(),
                         language=language,
                         speaker=speaker,
@@ -369,7 +397,7 @@ def build_demo(tts: Qwen3TTSModel, ckpt: str, gen_kwargs_default: Dict[str, Any]
                         return None, "Voice design instruction is required (必须填写音色描述)."
                     language = lang_map.get(lang_disp, "Auto")
                     kwargs = _gen_common_kwargs()
-                    wavs, sr = tts.generate_voice_design(
+                    wavs, sr = engine.generate_voice_design(
                         text=text.strip(),
                         language=language,
                         instruct=design.strip(),
@@ -431,7 +459,7 @@ def build_demo(tts: Qwen3TTSModel, ckpt: str, gen_kwargs_default: Dict[str, Any]
                                 )
                             language = lang_map.get(lang_disp, "Auto")
                             kwargs = _gen_common_kwargs()
-                            wavs, sr = tts.generate_voice_clone(
+                            wavs, sr = engine.generate_voice_clone(
                                 text=text.strip(),
                                 language=language,
                                 ref_audio=at,
@@ -508,7 +536,7 @@ Upload a previously saved voice file, then synthesize new text.
                                     "Reference text is required when use x-vector only is NOT enabled.\n"
                                     "(未勾选 use x-vector only 时，必须提供参考音频文本；否则请勾选 use x-vector only，但效果会变差.)"
                                 )
-                            items = tts.create_voice_clone_prompt(
+                            items = engine.create_voice_clone_prompt(
                                 ref_audio=at,
                                 ref_text=(ref_txt.strip() if ref_txt else None),
                                 x_vector_only_mode=bool(use_xvec),
@@ -564,7 +592,7 @@ Upload a previously saved voice file, then synthesize new text.
 
                             language = lang_map.get(lang_disp, "Auto")
                             kwargs = _gen_common_kwargs()
-                            wavs, sr = tts.generate_voice_clone(
+                            wavs, sr = engine.generate_voice_clone(
                                 text=text.strip(),
                                 language=language,
                                 voice_clone_prompt=items,
@@ -613,7 +641,13 @@ def main(argv=None) -> int:
     )
 
     gen_kwargs_default = _collect_gen_kwargs(args)
-    demo = build_demo(tts, ckpt, gen_kwargs_default)
+    dispatcher = None
+    concurrency = int(args.concurrency)
+    if args.batching:
+        dispatcher = BatchingDispatcher(tts, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+        # a batch can only fill up if that many callbacks are waiting at once
+        concurrency = max(concurrency, int(args.max_batch_size))
+    demo = build_demo(tts, ckpt, gen_kwargs_default, dispatcher=dispatcher)
 
     launch_kwargs: Dict[str, Any] = dict(
         server_name=args.ip,
@@ -626,7 +660,11 @@ def main(argv=None) -> int:
     if args.ssl_keyfile is not None:
         launch_kwargs["ssl_keyfile"] = args.ssl_keyfile
 
-    demo.queue(default_concurrency_limit=int(args.concurrency)).launch(**launch_kwargs)
+    try:
+        demo.queue(default_concurrency_limit=concurrency).launch(**launch_kwargs)
+    finally:
+        if dispatcher is not None:
+            dispatcher.close()
     return 0
 
 
@@ -0,0 +1,136 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Import-time report (a summary of `python -X importtime`) used to keep cold start in check.
+
+Each target is imported in a fresh interpreter. The report lists the total import time, the most expensive
+top-level packages and the slowest individual modules, and can fail on a time budget or on forbidden imports:
+
+    qwen-tts-importtime qwen_tts --forbid torch transformers librosa
+    qwen-tts-importtime qwen_tts.inference.qwen3_tts_model --budget-ms 4000 --json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+
+def measure_import(module: str, python: Optional[str] = None) -> List[Dict]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime` and return one record per imported module:
+    `{"module", "self_us", "cumulative_us", "depth"}` in import order.
+    """
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"`import {module}` failed:\n{tail}")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        name = fields[2].rstrip()
+        records.append(
+            dict(
+                module=name.strip(),
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(name.lstrip())) // 2,
+            )
+        )
+    return records
+
+
+def summarize(module: str, records: Sequence[Dict], top: int = 10) -> Dict:
+    """
+    Reduce `measure_import` records to the report: total, per top-level package and slowest modules (ms).
+    """
+    per_package = defaultdict(int)
+    for r in records:
+        per_package[r["module"].split(".")[0]] += r["self_us"]
+    packages = sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)
+    slowest = sorted(records, key=lambda r: r["self_us"], reverse=True)
+    return dict(
+        target=module,
+        total_ms=round(sum(r["self_us"] for r in records) / 1000.0, 1),
+        num_modules=len(records),
+        packages=[dict(package=p, ms=round(us / 1000.0, 1)) for p, us in packages[:top]],
+        slowest_modules=[dict(module=r["module"], ms=round(r["self_us"] / 1000.0, 1)) for r in slowest[:top]],
+        imported=sorted(per_package),
+    )
+
+
+def _print_report(report: Dict) -> None:
+    print(f"import {report['target']}: {report['total_ms']:.1f} ms over {report['num_modules']} modules")
+    print("  top-level packages:")
+    for p in report["packages"]:
+        print(f"    {p['ms']:9.1f} ms  {p['package']}")
+    print("  slowest modules:")
+    for m in report["slowest_modules"]:
+        print(f"    {m['ms']:9.1f} ms  {m['module']}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-importtime",
+        description="Summarize `python -X importtime` for one or more modules and enforce a startup budget.",
+    )
+    parser.add_argument("modules", nargs="*", default=["qwen_tts"], help="Modules to import (default: qwen_tts).")
+    parser.add_argument("--top", type=int, default=10, help="Rows per table (default: 10).")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if any target takes longer than this.")
+    parser.add_argument(
+        "--forbid", nargs="*", default=[], help="Top-level packages that must not be imported by the targets."
+    )
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON.")
+    parser.add_argument("--python", default=None, help="Interpreter to measure (default: this one).")
+    args = parser.parse_args(argv)
+
+    reports, failures = [], []
+    for module in args.modules:
+        try:
+            records = measure_import(module, python=args.python)
+        except RuntimeError as e:
+            failures.append(str(e))
+            continue
+        report = summarize(module, records, top=args.top)
+        reports.append(report)
+        if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+            failures.append(f"import {module} took {report['total_ms']:.1f} ms (budget {args.budget_ms:.1f} ms)")
+        for pkg in args.forbid:
+            if pkg in report["imported"]:
+                failures.append(f"import {module} pulled in forbidden package '{pkg}'")
+
+    if args.json:
+        print(json.dumps(dict(reports=reports, failures=failures), indent=2))
+    else:
+        for report in reports:
+            _print_report(report)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Parity check of optimized inference paths against the reference one, on tiny random-weight models:
+
+    qwen-tts-parity
+    qwen-tts-parity --target chunked_decode --candidate sdpa --repeats 3 --output parity.json
+"""
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from ..bench.parity import TARGETS, VARIANTS
+
+    candidates = sorted({name for variants in VARIANTS.values() for name in variants})
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-parity",
+        description="Compare candidate inference paths with the reference: talker codes must be identical, decoded "
+                    "waveforms must match within tolerance. Exits non-zero on any mismatch.",
+    )
+    parser.add_argument("--target", nargs="*", default=list(TARGETS), choices=TARGETS,
+                        help="Targets to check (default: all).")
+    parser.add_argument("--candidate", nargs="*", default=None, choices=candidates,
+                        help="Candidates to check (default: those expected to pass at fp32 tolerances, e.g. sdpa; "
+                             "bfloat16 is opt-in and checked against its own, looser waveform tolerances).")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed runs per path; stage times are medians.")
+    parser.add_argument("--atol", type=float, default=None,
+                        help="Max absolute sample difference (default: 1e-4; 1e-2 for bfloat16).")
+    parser.add_argument("--min-snr-db", type=float, default=None,
+                        help="Min signal-to-difference ratio of decoded audio (default: 60 dB; 30 dB for bfloat16).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads for stable CPU numbers.")
+    parser.add_argument("--output", default=None, help="Write the JSON report here.")
+    args = parser.parse_args(argv)
+
+    import torch
+
+    from ..bench.parity import run_parity
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    reports = []
+    for target in args.target:
+        names = [c for c in args.candidate if c in VARIANTS[target]] if args.candidate is not None else None
+        if names == []:
+            continue
+        kwargs = {} if target == "generate" else dict(atol=args.atol, min_snr_db=args.min_snr_db)
+        for report in run_parity(target, names, device=args.device, seed=args.seed, repeats=args.repeats, **kwargs):
+            print(report.format())
+            reports.append(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([r.to_dict() for r in reports], f, indent=2)
+        print(f"Wrote {args.output}")
+    failed = [r for r in reports if not r.passed]
+    if failed:
+        print(f"{len(failed)} of {len(reports)} candidates failed parity.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
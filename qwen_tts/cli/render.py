@@ -0,0 +1,150 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Headless Batch Director renderer:
+
+    qwen-tts-render scene.json --config app_config.json
+    qwen-tts-render scene.json --output render/scene.json --max-batch-size 16 --report render/throughput.json
+    qwen-tts-render scene.json --workers cuda:0 cuda:1
+    qwen-tts-render scene.json --workers auto          # one worker per GPU, or per NUMA node on CPU hosts
+    qwen-tts-render book.json --listen 0.0.0.0:8765    # render on qwen-tts-render-worker hosts
+"""
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    """Checkpoint and loading options shared with qwen-tts-render-worker."""
+    parser.add_argument("--custom-model", default=None, help="CustomVoice checkpoint (default: the 1.7B HF repo).")
+    parser.add_argument("--design-model", default=None, help="VoiceDesign checkpoint (default: the 1.7B HF repo).")
+    parser.add_argument("--base-model", default=None, help="Base (clone) checkpoint (default: the 1.7B HF repo).")
+    parser.add_argument("--device", default="cuda:0", help="device_map for loading (default: cuda:0).")
+    parser.add_argument("--dtype", default="bfloat16", choices=["bfloat16", "float16", "float32"])
+    parser.add_argument("--flash-attn", default=True, action=argparse.BooleanOptionalAction,
+                        help="Use FlashAttention-2 (default: enabled).")
+    parser.add_argument("--prompt-cache", default=None,
+                        help="Directory of a persistent voice-clone prompt cache to reuse across renders.")
+    parser.add_argument("--render-cache", default=None,
+                        help="Directory of a generated-audio cache: blocks rendered before with the same engine, "
+                             "inputs and seed are read back instead of generated.")
+    parser.add_argument("--render-cache-gb", type=float, default=2.0,
+                        help="Size bound of --render-cache in GiB; least recently used entries go first (default: 2).")
+
+
+def build_loader(args: argparse.Namespace):
+    """`PretrainedLoader` for the checkpoints selected by `add_engine_arguments`."""
+    from ..inference.render_farm import PretrainedLoader
+    from ..inference.scene_render import DEFAULT_ENGINE_REPOS
+
+    checkpoints = dict(DEFAULT_ENGINE_REPOS)
+    checkpoints.update({
+        mode: path for mode, path in
+        (("custom", args.custom_model), ("design", args.design_model), ("base", args.base_model)) if path
+    })
+    return PretrainedLoader(
+        checkpoints,
+        dtype=args.dtype,
+        attn_implementation="flash_attention_2" if args.flash_attn else None,
+        prompt_cache_dir=args.prompt_cache,
+        render_cache_dir=args.render_cache,
+        render_cache_gb=args.render_cache_gb,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-render",
+        description="Render a Batch Director script (saved .json) with batched generation and write its _audio "
+                    "companion folder.",
+    )
+    parser.add_argument("script", help="Script saved by the Batch Director.")
+    parser.add_argument("--output", default=None,
+                        help="Write the rendered script (and <name>_audio/) here instead of updating the input.")
+    parser.add_argument("--config", default=None,
+                        help="Studio app_config.json with the clone voices, design profiles and style instructions "
+                             "the script uses.")
+    add_engine_arguments(parser)
+    parser.add_argument("--max-batch-size", type=int, default=8, help="Blocks per generate call (default: 8).")
+    parser.add_argument("--workers", nargs="*", default=None, metavar="SPEC",
+                        help="Render in one process per SPEC: cuda:N, cpu, or cpu:<cpulist> (e.g. cpu:0-15). "
+                             "'auto' (or no SPEC) starts one per GPU, or one per NUMA node without GPUs. "
+                             "Overrides --device.")
+    parser.add_argument("--listen", default=None, metavar="HOST:PORT",
+                        help="Coordinate networked qwen-tts-render-worker processes on this address instead of "
+                             "rendering locally.")
+    parser.add_argument("--lease-timeout", type=float, default=60.0,
+                        help="With --listen: seconds without a heartbeat before a worker's batch goes to another "
+                             "worker (default: 60).")
+    parser.add_argument("--retry", action="store_true", help="Re-render blocks already marked success / review.")
+    parser.add_argument("--report", default=None, help="Write the throughput report as JSON here.")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final report.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from ..inference.render_cluster import RenderCoordinator
+    from ..inference.render_farm import RenderFarm, WorkerSpec
+    from ..inference.residency import EngineResidencyManager
+    from ..inference.scene_render import SceneRenderer, VoiceLibrary
+
+    loader = build_loader(args)
+    library = VoiceLibrary.from_app_config(args.config) if args.config else VoiceLibrary()
+    log = None if args.quiet else print
+
+    if args.listen is not None:
+        host, _, port = args.listen.rpartition(":")
+        coordinator = RenderCoordinator(
+            library, host=host or "127.0.0.1", port=int(port), max_batch_size=args.max_batch_size,
+            lease_timeout_s=args.lease_timeout, log=log,
+        ).start()
+        print(f"qwen-tts-render: waiting for workers on {coordinator.url}")
+        try:
+            report = coordinator.render_file(args.script, output_path=args.output, retry=args.retry)
+        finally:
+            coordinator.close()
+    elif args.workers is not None:
+        specs = [WorkerSpec.parse(s) for s in args.workers if s != "auto"] or None
+        farm = RenderFarm(loader, specs, library, max_batch_size=args.max_batch_size, log=log)
+        if log:
+            log(f"Render farm: {', '.join(spec.name for spec in farm.workers)}")
+        report = farm.render_file(args.script, output_path=args.output, retry=args.retry)
+    else:
+        def load(mode):
+            if log:
+                log(f"Loading {mode} engine from {loader.checkpoints[mode]}...")
+            return loader(mode, args.device)
+
+        # engines are used one group at a time, so nothing needs to stay parked
+        engines = EngineResidencyManager(load, ram_budget_bytes=0, idle_timeout_s=None)
+        renderer = SceneRenderer(engines.acquire, library, max_batch_size=args.max_batch_size, log=log)
+        try:
+            report = renderer.render_file(args.script, output_path=args.output, retry=args.retry)
+        finally:
+            engines.close()
+
+    print(report.summary())
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
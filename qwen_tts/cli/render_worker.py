@@ -0,0 +1,86 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Networked render worker for `qwen-tts-render --listen`:
+
+    qwen-tts-render book.json --listen 0.0.0.0:8765                         # on the coordinator host
+    qwen-tts-render-worker http://coordinator:8765 --device cuda:0          # one per GPU, on any host
+"""
+import argparse
+import sys
+from typing import Optional, Sequence
+
+from .render import add_engine_arguments, build_loader
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-render-worker",
+        description="Render Batch Director batches handed out by a qwen-tts-render --listen coordinator.",
+    )
+    parser.add_argument("coordinator", help="Coordinator URL, e.g. http://10.0.0.5:8765.")
+    add_engine_arguments(parser)
+    parser.add_argument("--name", default=None, help="Worker id (default: <hostname>-<pid>).")
+    parser.add_argument("--max-batch-size", type=int, default=8,
+                        help="Largest batch this worker takes without splitting, advertised to the coordinator "
+                             "(default: 8).")
+    parser.add_argument("--park-engines", default=True, action=argparse.BooleanOptionalAction,
+                        help="Keep switched-out engines parked in host memory (default: enabled).")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls while idle.")
+    parser.add_argument("--give-up-after", type=float, default=60.0,
+                        help="Stop when the coordinator is unreachable for this many seconds (default: 60).")
+    parser.add_argument("--quiet", action="store_true")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from ..inference.render_cluster import RenderWorker
+    from ..inference.residency import EngineResidencyManager
+
+    loader = build_loader(args)
+    log = None if args.quiet else print
+
+    def load(mode):
+        if log:
+            log(f"Loading {mode} engine from {loader.checkpoints[mode]}...")
+        return loader(mode, args.device)
+
+    engines = EngineResidencyManager(load, ram_budget_bytes=None if args.park_engines else 0, idle_timeout_s=None)
+    worker = RenderWorker(
+        args.coordinator,
+        engines.acquire,
+        resident=engines.resident,
+        name=args.name,
+        max_batch_size=args.max_batch_size,
+        poll_interval_s=args.poll_interval,
+        retry_s=args.give_up_after,
+        log=log,
+    )
+    print(f"qwen-tts-render-worker {worker.name}: polling {worker.coordinator}")
+    try:
+        rendered = worker.run()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        engines.close()
+    print(f"qwen-tts-render-worker {worker.name}: {rendered} batches rendered")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Headless OpenAI-style speech server:
+
+    qwen-tts-serve Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice --port 8000
+    curl -N localhost:8000/v1/audio/speech -d '{"input": "Hello.", "voice": "ryan", "response_format": "pcm"}' > out.pcm
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-serve",
+        description="Serve /v1/audio/speech (chunked PCM / WAV / Opus streaming with request batching) and /metrics "
+                    "for one Qwen3 TTS checkpoint.",
+    )
+    parser.add_argument("checkpoint", help="Model checkpoint path or HuggingFace repo id.")
+    parser.add_argument("--device", default="cuda:0", help="device_map for loading (default: cuda:0).")
+    parser.add_argument("--dtype", default="bfloat16", choices=["bfloat16", "float16", "float32"])
+    parser.add_argument("--flash-attn", default=True, action=argparse.BooleanOptionalAction,
+                        help="Use FlashAttention-2 (default: enabled).")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=8, help="Requests per generate call (default: 8).")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0,
+                        help="How long a request waits for batch company (default: 10).")
+    parser.add_argument("--max-segment-chars", type=int, default=300,
+                        help="Streaming segment size; smaller reaches the first audio sooner (default: 300).")
+    parser.add_argument("--voices", default=None,
+                        help='JSON file of voice clone prompts to register at start (Base engines): '
+                             '{"id": {"audio": "ref.wav", "ref_text": "...", "x_vector_only_mode": false}}.')
+    parser.add_argument("--voice-audio-dir", dest="voice_audio_dirs", action="append", default=[], metavar="DIR",
+                        help="Let POST /v1/voices name reference files inside DIR in `audio_url` (repeatable). "
+                             "Without it clients can only upload base64 `audio`.")
+    parser.add_argument("--allow-audio-urls", action="store_true",
+                        help="Let POST /v1/voices pass an http(s) `audio_url` for the server to download.")
+    parser.add_argument("--stage-metrics", action="store_true",
+                        help="Export per-stage generation times on /metrics (adds CUDA syncs).")
+    parser.add_argument("--no-access-log", dest="access_log", action="store_false")
+    parser.add_argument("--max-new-tokens", type=int, default=None)
+    parser.add_argument("--temperature", type=float, default=None)
+    parser.add_argument("--top-k", type=int, default=None)
+    parser.add_argument("--top-p", type=float, default=None)
+    parser.add_argument("--repetition-penalty", type=float, default=None)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    import torch
+
+    from ..inference.qwen3_tts_model import Qwen3TTSModel
+    from ..inference.speech_server import SpeechServer
+
+    tts = Qwen3TTSModel.from_pretrained(
+        args.checkpoint,
+        device_map=args.device,
+        dtype=getattr(torch, args.dtype),
+        attn_implementation="flash_attention_2" if args.flash_attn else None,
+    )
+    defaults: Dict[str, Any] = {
+        k: v for k, v in dict(
+            max_new_tokens=args.max_new_tokens,
+            temperature=args.temperature,
+            top_k=args.top_k,
+            top_p=args.top_p,
+            repetition_penalty=args.repetition_penalty,
+        ).items() if v is not None
+    }
+    server = SpeechServer(
+        tts,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_segment_chars=args.max_segment_chars,
+        generate_defaults=defaults,
+        stage_metrics=args.stage_metrics,
+        model_name=args.checkpoint,
+        access_log=args.access_log,
+        voice_audio_dirs=args.voice_audio_dirs,
+        allow_audio_urls=args.allow_audio_urls,
+    )
+    if args.voices:
+        with open(args.voices, "r", encoding="utf-8") as f:
+            for voice_id, spec in json.load(f).items():
+                server.register_voice(
+                    spec["audio"],
+                    ref_text=spec.get("ref_text"),
+                    x_vector_only_mode=bool(spec.get("x_vector_only_mode", False)),
+                    voice_id=voice_id,
+                )
+                print(f"Registered voice {voice_id!r}")
+
+    host, port = server.address
+    print(f"qwen-tts-serve: {tts.model.tts_model_type} engine on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Fast `from_pretrained` for local safetensors checkpoints placed on a single device.
+
+The model is built with its parameters on the meta device (buffers are built normally), then every tensor is read
+from the memory-mapped shards straight onto the target device. A thread pool reads the shards, and splits a large
+shard into key ranges, so reads and host-to-device copies overlap. No full state dict is ever held in host memory.
+
+`load_pretrained_fast` returns `None` for anything it does not handle: remote repos, `.bin` checkpoints, device
+maps that span devices or offload, quantization, or key mismatches. Callers then fall back to the regular
+`from_pretrained`.
+
+`transformers` flips process-global switches (default dtype, weight-init hooks) while it builds a model. All model
+construction here, and every regular `from_pretrained` that may run concurrently with it, therefore happens under
+`hf_load_lock`. Only the weight reads run in parallel.
+"""
+import json
+import os
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import torch
+from accelerate import init_empty_weights
+from accelerate.utils import set_module_tensor_to_device
+from safetensors import safe_open
+from transformers import GenerationConfig
+from transformers.modeling_utils import no_init_weights
+
+SAFE_WEIGHTS_NAME = "model.safetensors"
+SAFE_WEIGHTS_INDEX_NAME = "model.safetensors.index.json"
+
+# Serializes model construction; see the module docstring.
+hf_load_lock = threading.RLock()
+
+_SAFETENSORS_ITEMSIZE = {
+    "BOOL": 1, "U8": 1, "I8": 1, "F8_E4M3": 1, "F8_E5M2": 1,
+    "I16": 2, "U16": 2, "F16": 2, "BF16": 2,
+    "I32": 4, "U32": 4, "F32": 4,
+    "I64": 8, "U64": 8, "F64": 8,
+}
+_FLOAT_DTYPES = {"F16", "BF16", "F32", "F64"}
+
+# kwargs that only matter for hub resolution or are implied by this loader
+_IGNORED_KWARGS = {
+    "cache_dir", "force_download", "local_files_only", "proxies", "resume_download", "revision", "subfolder",
+    "token", "use_auth_token", "trust_remote_code", "low_cpu_mem_usage", "weights_only", "use_safetensors",
+}
+
+
+def _read_safetensors_header(path: str) -> Dict[str, Tuple[str, List[int]]]:
+    with open(path, "rb") as f:
+        (n,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(n))
+    header.pop("__metadata__", None)
+    return {k: (v["dtype"], v["shape"]) for k, v in header.items()}
+
+
+def _checkpoint_shards(model_dir: str) -> Optional[List[str]]:
+    index = os.path.join(model_dir, SAFE_WEIGHTS_INDEX_NAME)
+    if os.path.isfile(index):
+        with open(index, "r", encoding="utf-8") as f:
+            weight_map = json.load(f)["weight_map"]
+        return sorted({os.path.join(model_dir, v) for v in weight_map.values()})
+    single = os.path.join(model_dir, SAFE_WEIGHTS_NAME)
+    return [single] if os.path.isfile(single) else None
+
+
+def _resolve_dtype(dtype, config) -> Optional[torch.dtype]:
+    if dtype is None:
+        return torch.float32  # transformers' default when no dtype is requested
+    if dtype == "auto":
+        dtype = getattr(config, "dtype", None)
+        if dtype is None:
+            return None
+    if isinstance(dtype, str):
+        dtype = getattr(torch, dtype, None)
+    return dtype if isinstance(dtype, torch.dtype) else None
+
+
+def resolve_single_device(device_map, nbytes: int) -> Optional[torch.device]:
+    """
+    The one device `device_map` places a model of `nbytes` on, or `None` if it may split / offload the model.
+    """
+    if isinstance(device_map, dict):
+        if set(device_map.keys()) != {""}:
+            return None
+        device_map = device_map[""]
+    if device_map is None:
+        return torch.device("cpu")
+    if isinstance(device_map, int):
+        return torch.device("cuda", device_map)
+    if isinstance(device_map, torch.device):
+        device = device_map
+    elif device_map == "auto":
+        if not torch.cuda.is_available():
+            return torch.device("cpu")
+        if torch.cuda.device_count() > 1:
+            return None
+        free, _ = torch.cuda.mem_get_info(0)
+        # leave headroom; if the weights barely fit, accelerate's planner (and offloading) should decide
+        return torch.device("cuda", 0) if nbytes * 1.1 < free else None
+    elif device_map in ("balanced", "balanced_low_0", "sequential"):
+        return None
+    else:
+        device = torch.device(device_map)
+    if device.type == "cuda" and device.index is None:
+        device = torch.device("cuda", torch.cuda.current_device())
+    return device
+
+
+def _split_work(headers: Dict[str, Dict[str, Tuple[str, List[int]]]], num_workers: int) -> List[Tuple[str, List[str]]]:
+    """
+    Split every shard into contiguous key ranges of roughly `total / (2 * num_workers)` bytes.
+    """
+    def nbytes(entry):
+        dtype, shape = entry
+        n = _SAFETENSORS_ITEMSIZE.get(dtype, 4)
+        for s in shape:
+            n *= s
+        return n
+
+    total = sum(nbytes(e) for h in headers.values() for e in h.values())
+    target = max(total // max(2 * num_workers, 1), 1)
+    work = []
+    for path, header in headers.items():
+        group, size = [], 0
+        for key in sorted(header):
+            group.append(key)
+            size += nbytes(header[key])
+            if size >= target:
+                work.append((path, group))
+                group, size = [], 0
+        if group:
+            work.append((path, group))
+    return work
+
+
+def load_pretrained_fast(
+    model_cls,
+    pretrained_model_name_or_path: str,
+    config=None,
+    device_map: Optional[Union[str, int, Dict, torch.device]] = None,
+    dtype=None,
+    torch_dtype=None,
+    attn_implementation: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    **kwargs,
+):
+    """
+    Meta-initialized, memory-mapped `model_cls.from_pretrained` for a local safetensors checkpoint.
+
+    Args:
+        model_cls: `PreTrainedModel` subclass to build.
+        pretrained_model_name_or_path (str): Local checkpoint directory.
+        config: Model config; read from the directory when omitted.
+        device_map: A single device (`"cuda:0"`, `{"": "cpu"}`, ...) or `"auto"` (one GPU that fits the weights).
+        dtype / torch_dtype: Parameter dtype, as for `from_pretrained`.
+        attn_implementation (Optional[str]): As for `from_pretrained`.
+        max_workers (Optional[int]): Reader threads; defaults to `min(8, cpu_count)`.
+
+    Returns:
+        The loaded model in eval mode, or `None` if this checkpoint / configuration needs the regular loader.
+    """
+    if any(k not in _IGNORED_KWARGS and not k.startswith("_") for k in kwargs):
+        return None
+    if not os.path.isdir(pretrained_model_name_or_path):
+        return None
+    shards = _checkpoint_shards(pretrained_model_name_or_path)
+    if not shards:
+        return None
+    headers = {path: _read_safetensors_header(path) for path in shards}
+
+    if config is None:
+        config = model_cls.config_class.from_pretrained(pretrained_model_name_or_path)
+    dtype = _resolve_dtype(dtype if dtype is not None else torch_dtype, config)
+    if dtype is None or getattr(model_cls, "_keep_in_fp32_modules", None):
+        return None
+    nbytes = 0
+    for header in headers.values():
+        for st_dtype, shape in header.values():
+            n = dtype.itemsize if st_dtype in _FLOAT_DTYPES else _SAFETENSORS_ITEMSIZE.get(st_dtype, 4)
+            for s in shape:
+                n *= s
+            nbytes += n
+    device = resolve_single_device(device_map, nbytes)
+    if device is None:
+        return None
+
+    if attn_implementation is not None:
+        config._attn_implementation = attn_implementation
+    with hf_load_lock:
+        default_dtype = torch.get_default_dtype()
+        if dtype.is_floating_point:
+            torch.set_default_dtype(dtype)
+        try:
+            with no_init_weights(), init_empty_weights(include_buffers=False):
+                model = model_cls(config)
+        finally:
+            torch.set_default_dtype(default_dtype)
+
+    expected = set(model.state_dict().keys())
+    checkpoint_keys = set().union(*headers.values())
+    ignore = [re.compile(p) for p in (getattr(model, "_keys_to_ignore_on_load_unexpected", None) or [])]
+    unexpected = {k for k in checkpoint_keys - expected if not any(p.search(k) for p in ignore)}
+    params = {n for n, _ in model.named_parameters(remove_duplicate=False)}
+    tied = tuple(getattr(model, "_tied_weights_keys", None) or [])
+    missing = {k for k in params - checkpoint_keys if not (tied and k.endswith(tied))}
+    if unexpected or missing:
+        return None
+
+    read_device = device.index if device.type == "cuda" else str(device)
+
+    def _load(item):
+        path, keys = item
+        with safe_open(path, framework="pt", device=read_device) as f:
+            for key in keys:
+                if key in expected:
+                    set_module_tensor_to_device(model, key, device, value=f.get_tensor(key), clear_cache=False)
+
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    work = _split_work(headers, max_workers)
+    if len(work) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qwen-tts-load") as pool:
+            list(pool.map(_load, work))
+    else:
+        for item in work:
+            _load(item)
+
+    for name, buf in list(model.named_buffers()):
+        if buf.device != device:
+            set_module_tensor_to_device(model, name, device, clear_cache=False)
+    model.tie_weights()
+    if any(p.is_meta for p in model.parameters()):
+        return None
+    model.eval()
+
+    if model.can_generate():
+        try:
+            model.generation_config = GenerationConfig.from_pretrained(pretrained_model_name_or_path)
+        except (OSError, ValueError, TypeError):
+            pass
+    return model
+
+
+__all__ = ["load_pretrained_fast", "resolve_single_device", "hf_load_lock"]
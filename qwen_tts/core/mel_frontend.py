@@ -0,0 +1,283 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Shared mel front-end for the Qwen3 TTS models and speech tokenizers.
+
+Mel filterbanks and STFT windows are cached per (params, device, dtype) so
+repeated calls do not rebuild them, and STFTs run once over a padded batch of
+waveforms. Reflect padding is applied per item before batching, so every valid
+frame is bit-identical to the single-utterance computation; frames past an
+item's length are reported through `frame_lengths` / `frame_mask`.
+"""
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+WaveformBatch = Union[torch.Tensor, np.ndarray, Sequence[Union[torch.Tensor, np.ndarray]]]
+
+
+@lru_cache(maxsize=None)
+def _cached_mel_basis(sampling_rate, n_fft, num_mels, fmin, fmax, device, dtype):
+    from librosa.filters import mel as librosa_mel_fn  # deferred: librosa is slow to import and only needed here
+
+    mel = librosa_mel_fn(sr=sampling_rate, n_fft=n_fft, n_mels=num_mels, fmin=fmin, fmax=fmax)
+    return torch.from_numpy(mel).to(device=device, dtype=dtype)
+
+
+@lru_cache(maxsize=None)
+def _cached_hann_window(win_size, device, dtype):
+    return torch.hann_window(win_size, dtype=dtype).to(device)
+
+
+def get_mel_basis(
+    sampling_rate: int,
+    n_fft: int,
+    num_mels: int,
+    fmin: float = 0,
+    fmax: Optional[float] = None,
+    device: Optional[Union[str, torch.device]] = None,
+    dtype: torch.dtype = torch.float32,
+) -> torch.Tensor:
+    """
+    Return the (slaney-normalized) librosa mel filterbank of shape `(num_mels, n_fft // 2 + 1)`.
+
+    The tensor is built once per argument combination and shared afterwards; treat it as read-only.
+    """
+    device = torch.device(device if device is not None else "cpu")
+    return _cached_mel_basis(sampling_rate, n_fft, num_mels, fmin, fmax, device, dtype)
+
+
+def get_hann_window(
+    win_size: int,
+    device: Optional[Union[str, torch.device]] = None,
+    dtype: torch.dtype = torch.float32,
+) -> torch.Tensor:
+    """
+    Return a cached periodic Hann window. Treat it as read-only.
+    """
+    device = torch.device(device if device is not None else "cpu")
+    return _cached_hann_window(win_size, device, dtype)
+
+
+def clear_mel_cache() -> None:
+    """
+    Drop every cached filterbank and window (e.g. before releasing a device).
+    """
+    _cached_mel_basis.cache_clear()
+    _cached_hann_window.cache_clear()
+
+
+def _as_waveform_list(
+    wavs: WaveformBatch,
+    lengths: Optional[Sequence[int]] = None,
+    device: Optional[Union[str, torch.device]] = None,
+) -> List[torch.Tensor]:
+    if isinstance(wavs, (torch.Tensor, np.ndarray)) and wavs.ndim == 1:
+        wavs = [wavs]
+    if isinstance(wavs, (torch.Tensor, np.ndarray)) and lengths is not None:
+        wavs = [w[: int(l)] for w, l in zip(wavs, lengths)]
+    out = []
+    for w in wavs:
+        if not torch.is_tensor(w):
+            w = torch.from_numpy(np.asarray(w))
+        if device is not None:
+            w = w.to(device)
+        out.append(w)
+    return out
+
+
+def batched_stft_magnitude(
+    wavs: WaveformBatch,
+    n_fft: int,
+    hop_size: int,
+    win_size: int,
+    pad_left: int,
+    pad_right: int,
+    power: float = 1.0,
+    lengths: Optional[Sequence[int]] = None,
+    device: Optional[Union[str, torch.device]] = None,
+    center: bool = False,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Magnitude STFT of a batch of variable-length waveforms in a single `torch.stft` call.
+
+    Args:
+        wavs (WaveformBatch):
+            A 1-D waveform, a list of 1-D waveforms, or a padded `(batch, samples)` tensor together with `lengths`.
+        n_fft (int): FFT size.
+        hop_size (int): Hop size.
+        win_size (int): Hann window size.
+        pad_left (int): Reflect padding applied to the left of every item.
+        pad_right (int): Reflect padding applied to the right of every item.
+        power (float):
+            `1.0` returns `sqrt(re^2 + im^2 + 1e-9)` (BigVGAN style), `2.0` returns `|X|^2` (Whisper style).
+        lengths (Optional[Sequence[int]]): Valid sample counts when `wavs` is a padded tensor.
+        device (Optional[Union[str, torch.device]]): Move the inputs to this device before the STFT.
+        center (bool):
+            Also apply `torch.stft(center=True)` padding (`n_fft // 2` reflect on both sides, after `pad_left` /
+            `pad_right`).
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]:
+            - magnitudes of shape `(batch, n_fft // 2 + 1, frames)`
+            - frame_lengths: LongTensor `(batch,)` with the number of valid frames per item
+    """
+    wav_list = _as_waveform_list(wavs, lengths=lengths, device=device)
+    padded = [
+        F.pad(w.unsqueeze(0).unsqueeze(0), (pad_left, pad_right), mode="reflect").reshape(-1)
+        for w in wav_list
+    ]
+    if center:
+        # per item rather than through torch.stft, so short items reflect their own samples and not the batch padding
+        padded = [
+            F.pad(p.view(1, 1, -1), (n_fft // 2, n_fft // 2), mode="reflect").reshape(-1)
+            for p in padded
+        ]
+    frame_lengths = torch.tensor(
+        [1 + (p.shape[0] - n_fft) // hop_size for p in padded],
+        dtype=torch.long,
+        device=padded[0].device,
+    )
+    batch = torch.nn.utils.rnn.pad_sequence(padded, batch_first=True, padding_value=0.0)
+
+    window = get_hann_window(win_size, device=batch.device, dtype=batch.dtype)
+    spec = torch.stft(
+        batch,
+        n_fft,
+        hop_length=hop_size,
+        win_length=win_size,
+        window=window,
+        center=False,
+        normalized=False,
+        onesided=True,
+        return_complex=True,
+    )
+    if power == 2.0:
+        spec = spec.abs() ** 2
+    elif power == 1.0:
+        spec = torch.sqrt(torch.view_as_real(spec).pow(2).sum(-1) + 1e-9)
+    else:
+        raise ValueError(f"Unsupported power: {power}")
+    return spec, frame_lengths
+
+
+def frame_mask(frame_lengths: torch.Tensor, max_frames: int) -> torch.Tensor:
+    """
+    Boolean `(batch, max_frames)` mask that is True on valid frames.
+    """
+    return torch.arange(max_frames, device=frame_lengths.device)[None, :] < frame_lengths[:, None]
+
+
+def batched_mel_spectrogram(
+    wavs: WaveformBatch,
+    n_fft: int,
+    num_mels: int,
+    sampling_rate: int,
+    hop_size: int,
+    win_size: int,
+    fmin: float,
+    fmax: Optional[float] = None,
+    lengths: Optional[Sequence[int]] = None,
+    device: Optional[Union[str, torch.device]] = None,
+    clip_val: float = 1e-5,
+    center: bool = False,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    BigVGAN-style log-mel spectrogram (slaney mel, Hann window, `(n_fft - hop) // 2` reflect padding)
+    of a batch of waveforms. `center=True` adds the `torch.stft(center=True)` padding on top.
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]:
+            - log-mel of shape `(batch, num_mels, frames)`; frames past `frame_lengths` are padding
+            - frame_lengths: LongTensor `(batch,)`
+    """
+    padding = (n_fft - hop_size) // 2
+    spec, frame_lengths = batched_stft_magnitude(
+        wavs,
+        n_fft=n_fft,
+        hop_size=hop_size,
+        win_size=win_size,
+        pad_left=padding,
+        pad_right=padding,
+        power=1.0,
+        lengths=lengths,
+        device=device,
+        center=center,
+    )
+    mel_basis = get_mel_basis(sampling_rate, n_fft, num_mels, fmin, fmax, device=spec.device, dtype=torch.float32)
+    mel_spec = torch.matmul(mel_basis, spec)
+    mel_spec = torch.log(torch.clamp(mel_spec, min=clip_val))
+    return mel_spec, frame_lengths
+
+
+def batched_whisper_log_mel(
+    wavs: WaveformBatch,
+    filters: torch.Tensor,
+    n_fft: int,
+    hop_size: int,
+    paddings: Optional[Sequence[int]] = None,
+    device: Optional[Union[str, torch.device]] = None,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Whisper-style normalized log10-mel spectrogram of a batch of waveforms.
+
+    Each item is zero-padded on the right by `paddings[i]` samples, then STFT'd with centered reflect padding.
+    The dynamic-range floor (`max - 8`) is taken per item over its valid frames only.
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]:
+            - log-mel of shape `(batch, n_mels, frames)`
+            - frame_lengths: LongTensor `(batch,)`
+    """
+    wav_list = _as_waveform_list(wavs, device=device)
+    if paddings is not None:
+        wav_list = [F.pad(w, (0, int(p))) if p > 0 else w for w, p in zip(wav_list, paddings)]
+
+    magnitudes, frame_lengths = batched_stft_magnitude(
+        wav_list,
+        n_fft=n_fft,
+        hop_size=hop_size,
+        win_size=n_fft,
+        pad_left=n_fft // 2,
+        pad_right=n_fft // 2,
+        power=2.0,
+    )
+    # torch.stft(center=True) yields one frame past the signal end that Whisper drops.
+    frame_lengths = frame_lengths - 1
+    magnitudes = magnitudes[..., :-1]
+
+    mel_spec = filters.to(magnitudes.device) @ magnitudes
+    log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+
+    mask = frame_mask(frame_lengths, log_spec.shape[-1])
+    item_max = log_spec.masked_fill(~mask[:, None, :], float("-inf")).amax(dim=(1, 2), keepdim=True)
+    log_spec = torch.maximum(log_spec, item_max - 8.0)
+    log_spec = (log_spec + 4.0) / 4.0
+    return log_spec, frame_lengths
+
+
+__all__ = [
+    "get_mel_basis",
+    "get_hann_window",
+    "clear_mel_cache",
+    "batched_stft_magnitude",
+    "frame_mask",
+    "batched_mel_spectrogram",
+    "batched_whisper_log_mel",
+]
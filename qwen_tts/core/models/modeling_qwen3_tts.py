@@ -16,13 +16,13 @@
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Callable, Optional
 
 import huggingface_hub
 import torch
 from huggingface_hub import snapshot_download
-from librosa.filters import mel as librosa_mel_fn
 from torch import nn
 from torch.nn import functional as F
 from transformers.activations import ACT2FN
@@ -43,7 +43,10 @@ from transformers.processing_utils import Unpack
 from transformers.utils import can_return_tuple, logging
 from transformers.utils.hub import cached_file
 
+from ...inference.metrics import current_stage_timer, timed
 from ...inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+from ..fast_loading import hf_load_lock, load_pretrained_fast
+from ..mel_frontend import batched_mel_spectrogram
 from .configuration_qwen3_tts import (Qwen3TTSConfig,
                                       Qwen3TTSSpeakerEncoderConfig,
                                       Qwen3TTSTalkerCodePredictorConfig,
@@ -51,6 +54,9 @@ from .configuration_qwen3_tts import (Qwen3TTSConfig,
 
 logger = logging.get_logger(__name__)
 
+# hub-resolution kwargs consumed by `Qwen3TTSForConditionalGeneration.from_pretrained` itself
+_HUB_KWARGS = ("subfolder", "cache_dir", "force_download", "proxies", "resume_download", "local_files_only", "use_auth_token", "revision")
+
 
 def download_weights_from_hf_specific(
     model_name_or_path: str,
@@ -393,9 +399,6 @@ class Qwen3TTSSpeakerEncoder(torch.nn.Module):
         return hidden_states
 
 
-def dynamic_range_compression_torch(x, C=1, clip_val=1e-5):
-    return torch.log(torch.clamp(x, min=clip_val) * C)
-
 def mel_spectrogram(
     y: torch.Tensor,
     n_fft: int,
@@ -410,6 +413,7 @@ def mel_spectrogram(
     """
     Calculate the mel spectrogram of an input signal.
     This function uses slaney norm for the librosa mel filterbank (using librosa.filters.mel) and uses Hann window for STFT (using torch.stft).
+    Filterbanks and windows are cached per device by `qwen_tts.core.mel_frontend`.
 
     Args:
         y (torch.Tensor): Input signal.
@@ -430,36 +434,19 @@ def mel_spectrogram(
     if torch.max(y) > 1.0:
         print(f"[WARNING] Max value of input waveform signal is {torch.max(y)}")
 
-    device = y.device
-
-    mel = librosa_mel_fn(
-        sr=sampling_rate, n_fft=n_fft, n_mels=num_mels, fmin=fmin, fmax=fmax
-    )
-
-    mel_basis = torch.from_numpy(mel).float().to(device)
-    hann_window = torch.hann_window(win_size).to(device)
-
-    padding = (n_fft - hop_size) // 2
-    y = torch.nn.functional.pad(
-        y.unsqueeze(1), (padding, padding), mode="reflect"
-    ).squeeze(1)
-
-    spec = torch.stft(
-        y,
-        n_fft,
-        hop_length=hop_size,
-        win_length=win_size,
-        window=hann_window,
+    if y.dim() == 1:
+        y = y.unsqueeze(0)
+    mel_spec, _ = batched_mel_spectrogram(
+        list(y),
+        n_fft=n_fft,
+        num_mels=num_mels,
+        sampling_rate=sampling_rate,
+        hop_size=hop_size,
+        win_size=win_size,
+        fmin=fmin,
+        fmax=fmax,
         center=center,
-        pad_mode="reflect",
-        normalized=False,
-        onesided=True,
-        return_complex=True,
     )
-    spec = torch.sqrt(torch.view_as_real(spec).pow(2).sum(-1) + 1e-9)
-
-    mel_spec = torch.matmul(mel_basis, spec)
-    mel_spec = dynamic_range_compression_torch(mel_spec)
 
     return mel_spec
 
@@ -1661,13 +1648,18 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             config.vocab_size]` or -100 (see `input_ids` docstring). Tokens with indices set to `-100` are ignored
             (masked), the loss is only computed for the tokens with labels in `[0, ..., config.vocab_size]`.
         ```"""
+        timer = current_stage_timer()
         # Prefill
         if inputs_embeds is not None and inputs_embeds.shape[1] > 1:
             generation_step = -1
             codec_ids = None
+            if timer is not None:
+                timer.begin("prefill")
         # Generate
         else:
             last_id_hidden = self.get_input_embeddings()(input_ids)
+            if timer is not None:
+                timer.begin("code_predictor")
             predictor_result = self.code_predictor.generate(
                 inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
                 max_new_tokens=self.config.num_code_groups - 1,
@@ -1678,6 +1670,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
                 output_hidden_states=True,
                 return_dict_in_generate=True,
             )
+            if timer is not None:
+                timer.end()
             codec_ids = torch.cat((input_ids, predictor_result.sequences), dim=-1)
             codec_hiddens = torch.cat(
                 [last_id_hidden]
@@ -1730,6 +1724,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         if labels is not None:
             loss = self.loss_function(logits=logits, labels=labels, vocab_size=self.config.vocab_size, **kwargs)
 
+        if timer is not None and generation_step == -1:
+            timer.end()  # prefill
 
         return Qwen3TTSTalkerOutputWithPast(
             loss=loss,
@@ -1872,22 +1868,11 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         requested_attn_implementation = kwargs.pop("attn_implementation", None)
         if requested_attn_implementation is None and config and config._attn_implementation:
             requested_attn_implementation = config._attn_implementation
+        # Engines shipping identical speech tokenizers reuse one resident instance (see `from_pretrained_shared`)
+        share_speech_tokenizer = kwargs.pop("share_speech_tokenizer", True)
+        # Meta-initialized, memory-mapped loading for local safetensors checkpoints (see `load_pretrained_fast`)
+        fast_load = kwargs.pop("fast_load", True)
 
-        model = super().from_pretrained(
-            pretrained_model_name_or_path,
-            *model_args,
-            config=config,
-            cache_dir=cache_dir,
-            ignore_mismatched_sizes=ignore_mismatched_sizes,
-            force_download=force_download,
-            local_files_only=local_files_only,
-            token=token,
-            revision=revision,
-            use_safetensors=use_safetensors,
-            weights_only=weights_only,
-            attn_implementation=requested_attn_implementation,
-            **kwargs,
-        )
         if not local_files_only and not os.path.isdir(pretrained_model_name_or_path):
             download_cache_dir = kwargs.get("cache_dir", cache_dir)
             download_revision = kwargs.get("revision", revision)
@@ -1897,40 +1882,71 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 allow_patterns=["speech_tokenizer/*"],
                 revision=download_revision,
             )
-        speech_tokenizer_path = cached_file(
-            pretrained_model_name_or_path,
-            "speech_tokenizer/config.json",
-            subfolder=kwargs.pop("subfolder", None),
-            cache_dir=kwargs.pop("cache_dir", None),
-            force_download=kwargs.pop("force_download", False),
-            proxies=kwargs.pop("proxies", None),
-            resume_download=kwargs.pop("resume_download", None),
-            local_files_only=kwargs.pop("local_files_only", False),
-            token=kwargs.pop("use_auth_token", None),
-            revision=kwargs.pop("revision", None),
-        )
+
+        def _resolve(filename):
+            return cached_file(
+                pretrained_model_name_or_path,
+                filename,
+                subfolder=kwargs.get("subfolder", None),
+                cache_dir=kwargs.get("cache_dir", None),
+                force_download=kwargs.get("force_download", False),
+                proxies=kwargs.get("proxies", None),
+                resume_download=kwargs.get("resume_download", None),
+                local_files_only=kwargs.get("local_files_only", False),
+                token=kwargs.get("use_auth_token", None),
+                revision=kwargs.get("revision", None),
+            )
+
+        speech_tokenizer_path = _resolve("speech_tokenizer/config.json")
         if speech_tokenizer_path is None:
             raise ValueError(f"""{pretrained_model_name_or_path}/{speech_tokenizer_path} not exists""")
         speech_tokenizer_dir = os.path.dirname(speech_tokenizer_path)
-        speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
-            speech_tokenizer_dir,
-            *model_args,
-            **kwargs,
+        load_speech_tokenizer = (
+            Qwen3TTSTokenizer.from_pretrained_shared if share_speech_tokenizer else Qwen3TTSTokenizer.from_pretrained
         )
+        tokenizer_kwargs = {k: v for k, v in kwargs.items() if k not in _HUB_KWARGS}
+        tokenizer_kwargs["fast_load"] = fast_load
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwen-tts-speech-tokenizer") as pool:
+            # the speech tokenizer only depends on its own folder, so it loads while the talker does
+            speech_tokenizer_future = (
+                pool.submit(load_speech_tokenizer, speech_tokenizer_dir, *model_args, **tokenizer_kwargs)
+                if fast_load
+                else None
+            )
+            model = None
+            if fast_load and not model_args:
+                model = load_pretrained_fast(
+                    cls,
+                    pretrained_model_name_or_path,
+                    config=config,
+                    attn_implementation=requested_attn_implementation,
+                    **kwargs,
+                )
+            if model is None:
+                with hf_load_lock:
+                    model = super().from_pretrained(
+                        pretrained_model_name_or_path,
+                        *model_args,
+                        config=config,
+                        cache_dir=cache_dir,
+                        ignore_mismatched_sizes=ignore_mismatched_sizes,
+                        force_download=force_download,
+                        local_files_only=local_files_only,
+                        token=token,
+                        revision=revision,
+                        use_safetensors=use_safetensors,
+                        weights_only=weights_only,
+                        attn_implementation=requested_attn_implementation,
+                        **kwargs,
+                    )
+            if speech_tokenizer_future is not None:
+                speech_tokenizer = speech_tokenizer_future.result()
+            else:
+                speech_tokenizer = load_speech_tokenizer(speech_tokenizer_dir, *model_args, **tokenizer_kwargs)
         model.load_speech_tokenizer(speech_tokenizer)
 
-        generate_config_path = cached_file(
-            pretrained_model_name_or_path,
-            "generation_config.json",
-            subfolder=kwargs.pop("subfolder", None),
-            cache_dir=kwargs.pop("cache_dir", None),
-            force_download=kwargs.pop("force_download", False),
-            proxies=kwargs.pop("proxies", None),
-            resume_download=kwargs.pop("resume_download", None),
-            local_files_only=kwargs.pop("local_files_only", False),
-            token=kwargs.pop("use_auth_token", None),
-            revision=kwargs.pop("revision", None),
-        )
+        generate_config_path = _resolve("generation_config.json")
         with open(generate_config_path, "r", encoding="utf-8") as f:
             generate_config = json.load(f)
         model.load_generate_config(generate_config)
@@ -2268,14 +2284,15 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         padded_hiddens[padding_mask] = pad_embedding_vector
         trailing_text_hiddens = padded_hiddens
 
-        # forward
-        talker_result = self.talker.generate(
-            inputs_embeds=talker_input_embeds,
-            attention_mask=talker_attention_mask,
-            trailing_text_hidden=trailing_text_hiddens,
-            tts_pad_embed=tts_pad_embed,
-            **talker_kwargs,
-        )
+        # forward; with metrics on, the talker stage is the decode loop minus prefill and code-predictor time
+        with timed("talker"):
+            talker_result = self.talker.generate(
+                inputs_embeds=talker_input_embeds,
+                attention_mask=talker_attention_mask,
+                trailing_text_hidden=trailing_text_hiddens,
+                tts_pad_embed=tts_pad_embed,
+                **talker_kwargs,
+            )
 
         talker_codes = torch.stack([hid[-1] for hid in talker_result.hidden_states if hid[-1] is not None], dim=1)
         talker_hidden_states = torch.cat([hid[0][-1][:, -1:] for hid in talker_result.hidden_states], dim=1)[:, :-1]
@@ -2285,6 +2302,9 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         stop_indices = torch.argmax(is_stop_token.int(), dim=1)
         has_stop_token = is_stop_token.any(dim=1)
         effective_lengths = torch.where(has_stop_token, stop_indices, talker_codes.shape[1])
+        timer = current_stage_timer()
+        if timer is not None:
+            timer.frames += int(effective_lengths.sum())
         
         talker_codes_list = [talker_codes[i, :length, ] for i, length in enumerate(effective_lengths)]
         talker_hidden_states_list = [talker_hidden_states[i, :length, :] for i, length in enumerate(effective_lengths)]
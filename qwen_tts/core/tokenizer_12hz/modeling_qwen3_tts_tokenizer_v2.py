@@ -963,11 +963,45 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
     def get_decode_upsample_rate(self):
         return self.decode_upsample_rate
     
+    def chunked_encode(self, input_values: torch.Tensor, chunk_size: int) -> torch.Tensor:
+        """
+        Streaming encode of a `(batch_size, sequence_length)` waveform batch in fixed-size chunks.
+
+        The Mimi encoder is causal: its convolution padding cache and sliding-window attention cache are carried
+        from chunk to chunk, so no overlap has to be re-encoded and every full frame gets the same code as a one-shot
+        encode. Device memory stays bounded by `chunk_size` regardless of input length; `input_values` may stay on
+        the host and only the current chunk is moved to the model device. The tail is zero-padded to a whole frame.
+
+        Returns:
+            `torch.LongTensor` of shape `(batch_size, num_quantizers, codes_length)`.
+        """
+        chunk_size = max(int(chunk_size) // self.encode_downsample_rate, 1) * self.encode_downsample_rate
+        past_key_values = DynamicCache(config=self.encoder.config)
+        padding_cache = None
+        codes = []
+        for start in range(0, input_values.shape[-1], chunk_size):
+            chunk = input_values[..., start : start + chunk_size]
+            tail = -chunk.shape[-1] % self.encode_downsample_rate
+            if tail:
+                chunk = F.pad(chunk, (0, tail))
+            encoded_frames = self.encoder.encode(
+                input_values=chunk.unsqueeze(1).to(device=self.device, dtype=self.dtype),
+                encoder_past_key_values=past_key_values,
+                padding_cache=padding_cache,
+                use_streaming=True,
+                return_dict=True,
+            )
+            past_key_values = encoded_frames.encoder_past_key_values
+            padding_cache = encoded_frames.padding_cache
+            codes.append(encoded_frames.audio_codes)
+        return torch.cat(codes, dim=-1)
+
     def encode(
         self,
         input_values: torch.Tensor,
         padding_mask: Optional[torch.Tensor] = None,
         return_dict: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
     ) -> Union[tuple[torch.Tensor, Optional[torch.Tensor]], Qwen3TTSTokenizerV2EncoderOutput]:
         """
         Encodes the input audio waveform into discrete codes.
@@ -980,13 +1014,24 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
                 for *masked*.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
+            chunk_size (`int`, *optional*):
+                If set, encode in streaming chunks of this many samples (rounded down to a multiple of
+                `encode_downsample_rate`) with bounded memory, see `chunked_encode`.
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
-        encoded_frames = self.encoder.encode(input_values=input_values.unsqueeze(1),
-                                             return_dict=True)
-        audio_codes = encoded_frames.audio_codes[:, :self.encoder_valid_num_quantizers]
-        audio_codes = [code[..., :-(-mask.sum() // self.encode_downsample_rate)].transpose(0, 1) for code, mask in zip(audio_codes, padding_mask)]
+        if chunk_size is None:
+            audio_codes = self.encoder.encode(input_values=input_values.unsqueeze(1),
+                                              return_dict=True).audio_codes
+        else:
+            audio_codes = self.chunked_encode(input_values, chunk_size)
+        audio_codes = audio_codes[:, :self.encoder_valid_num_quantizers]
+
+        if padding_mask is None:
+            code_lengths = [audio_codes.shape[-1]] * audio_codes.shape[0]
+        else:
+            code_lengths = (-(-padding_mask.sum(-1) // self.encode_downsample_rate)).tolist()
+        audio_codes = [code[..., :length].transpose(0, 1) for code, length in zip(audio_codes, code_lengths)]
 
         if not return_dict:
             return (
@@ -234,6 +234,10 @@ class Qwen3TTSTokenizerV1EncoderConfig(PretrainedConfig):
             Whether to use positional encoding (or position embeddings) inside the VQ module.
         audio_vq_ds_rate (`int`, *optional*, defaults to 2):
             Downsampling rate applied before VQ (e.g., temporal downsample factor).
+        audio_vq_quantize_chunk_size (`int`, *optional*, defaults to 2048):
+            Number of frames scored against the codebook at once in the nearest-codebook search. Bounds the transient
+            distance matrix to `audio_vq_quantize_chunk_size x audio_vq_codebook_size`; `None` or `0` disables chunking.
+            Does not change the resulting codes.
     """
 
     model_type = "qwen3_tts_tokenizer_v1_encoder"
@@ -256,6 +260,7 @@ class Qwen3TTSTokenizerV1EncoderConfig(PretrainedConfig):
         audio_vq_codebook_dim=1280,
         audio_vq_pe=True,
         audio_vq_ds_rate=2,
+        audio_vq_quantize_chunk_size=2048,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -275,6 +280,7 @@ class Qwen3TTSTokenizerV1EncoderConfig(PretrainedConfig):
         self.audio_vq_codebook_dim = audio_vq_codebook_dim
         self.audio_vq_pe = audio_vq_pe
         self.audio_vq_ds_rate = audio_vq_ds_rate
+        self.audio_vq_quantize_chunk_size = audio_vq_quantize_chunk_size
 
 
 class Qwen3TTSTokenizerV1Config(PretrainedConfig):
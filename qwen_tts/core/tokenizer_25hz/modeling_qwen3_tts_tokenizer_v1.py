@@ -35,7 +35,7 @@ from transformers.utils.hub import cached_file
 
 from torch.nn.utils.rnn import pad_sequence
 
-from .vq.whisper_encoder import get_mel_audio, get_T_after_cnn
+from .vq.whisper_encoder import get_mel_audio_batch, get_T_after_cnn
 from .vq.speech_vq import WhisperEncoderVQ, XVectorExtractor
 
 from .configuration_qwen3_tts_tokenizer_v1 import (
@@ -1307,19 +1307,22 @@ class Qwen3TTSTokenizerV1Encoder(Qwen3TTSTokenizerV1EncoderPreTrainedModel):
             audio_vq_codebook_dim=config.audio_vq_codebook_dim,
             audio_vq_pe=config.audio_vq_pe,
             audio_vq_ds_rate=config.audio_vq_ds_rate,
+            audio_vq_quantize_chunk_size=getattr(config, "audio_vq_quantize_chunk_size", 2048),
         )
 
         self.padding = True
         self.audio_vq_ds_rate = self.tokenizer.audio_vq_ds_rate
 
     def speech2mel(self, speechs):
-        mels = [
-            get_mel_audio(
-                speech, padding = self.padding, audio_vq_ds_rate = self.audio_vq_ds_rate
-            ).to(speech.dtype).to(self.tokenizer.conv1.weight.device)
-            for speech in speechs
+        if len(speechs) == 0:
+            return []
+        mels = get_mel_audio_batch(
+            speechs, padding = self.padding, audio_vq_ds_rate = self.audio_vq_ds_rate
+        )
+        return [
+            mel.to(speech.dtype).to(self.tokenizer.conv1.weight.device)
+            for mel, speech in zip(mels, speechs)
         ]
-        return mels
 
     def mel2code(self, mels):
         audio_mellens = [mel.size(-1) for mel in mels]
@@ -124,6 +124,10 @@ class EuclideanCodebook(nn.Module):
         threshold_ema_dead_code (int): Threshold for dead code expiration. Replace any codes
             that have an exponential moving average cluster size less than the specified threshold with
             randomly selected vector from the current batch.
+        quantize_chunk_size (int): Number of input vectors scored against the codebook at once in the
+            nearest-neighbour search, bounding the transient distance matrix to chunk x codebook_size.
+            None or <= 0 scores all vectors at once.
+        cache_embed_norm (bool): Reuse `embed.pow(2).sum` across calls while the codebook is unchanged.
     """
 
     def __init__(
@@ -135,6 +139,8 @@ class EuclideanCodebook(nn.Module):
             decay: float = 0.99,
             epsilon: float = 1e-5,
             threshold_ema_dead_code: float = 2.0,
+            quantize_chunk_size: tp.Optional[int] = 2048,
+            cache_embed_norm: bool = True,
     ):
         super().__init__()
         self.decay = decay
@@ -142,6 +148,8 @@ class EuclideanCodebook(nn.Module):
         self.kmeans_iters = kmeans_iters
         self.epsilon = epsilon
         self.threshold_ema_dead_code = threshold_ema_dead_code
+        self.quantize_chunk_size = quantize_chunk_size
+        self.cache_embed_norm = cache_embed_norm
 
         self.inited = None
         self.cluster_size = None
@@ -149,6 +157,9 @@ class EuclideanCodebook(nn.Module):
         self.embed_avg = None
         self.training = True
 
+        self._embed_norm = None
+        self._embed_norm_key = None
+
     def init_embed_(self, data):
         if self.inited:
             return
@@ -158,6 +169,7 @@ class EuclideanCodebook(nn.Module):
         self.embed_avg.data.copy_(embed.clone())
         self.cluster_size.data.copy_(cluster_size)
         self.inited.data.copy_(torch.Tensor([True]))
+        self.clear_embed_norm_cache()
         # Make sure all buffers across workers are in sync after initialization
         # distrib.broadcast_tensors([self.embed, self.embed_avg, self.cluster_size, self.inited])
 
@@ -166,6 +178,7 @@ class EuclideanCodebook(nn.Module):
             mask[..., None], sample_vectors(samples, self.codebook_size), self.embed
         )
         self.embed.data.copy_(modified_codebook)
+        self.clear_embed_norm_cache()
 
     def expire_codes_(self, batch_samples):
         if self.threshold_ema_dead_code == 0:
@@ -183,12 +196,36 @@ class EuclideanCodebook(nn.Module):
         # sync buffers outside for efficiency
         # distrib.broadcast_tensors(self.buffers())
 
+    def clear_embed_norm_cache(self):
+        self._embed_norm = None
+        self._embed_norm_key = None
+
+    def embed_norm(self, embed):
+        """`embed.pow(2).sum(0, keepdim=True)` for the transposed codebook, cached while it is unchanged."""
+        if not self.cache_embed_norm or self.training:
+            return embed.pow(2).sum(0, keepdim=True)
+        key = (self.embed.data_ptr(), self.embed._version, self.embed.device, self.embed.dtype, tuple(self.embed.shape))
+        if self._embed_norm is None or self._embed_norm_key != key:
+            self._embed_norm = embed.pow(2).sum(0, keepdim=True)
+            self._embed_norm_key = key
+        return self._embed_norm
+
     def quantize(self, x):
         embed = self.embed.t()
+        embed_norm = self.embed_norm(embed)
+        chunk_size = self.quantize_chunk_size
+        if chunk_size is None or chunk_size <= 0 or x.shape[0] <= chunk_size:
+            return self._quantize_chunk(x, embed, embed_norm)
+        embed_ind = torch.empty(x.shape[0], dtype=torch.long, device=x.device)
+        for start in range(0, x.shape[0], chunk_size):
+            embed_ind[start:start + chunk_size] = self._quantize_chunk(x[start:start + chunk_size], embed, embed_norm)
+        return embed_ind
+
+    def _quantize_chunk(self, x, embed, embed_norm):
         dist = -(
             x.pow(2).sum(1, keepdim=True)
             - 2 * x @ embed
-            + embed.pow(2).sum(0, keepdim=True)
+            + embed_norm
         )
         embed_ind = dist.max(dim=-1).indices
         return embed_ind
@@ -242,6 +279,7 @@ class EuclideanCodebook(nn.Module):
             )
             embed_normalized = self.embed_avg / cluster_size.unsqueeze(1)
             self.embed.data.copy_(embed_normalized)
+            self.clear_embed_norm_cache()
             # Note: after ema update, there is a very small difference between codebooks on GPUs.
             # The impact can be very small, ignore it.
 
@@ -263,6 +301,8 @@ class VectorQuantization(nn.Module):
             that have an exponential moving average cluster size less than the specified threshold with
             randomly selected vector from the current batch.
         commitment_weight (float): Weight for commitment loss.
+        quantize_chunk_size (int): Input vectors per nearest-codebook search chunk, see `EuclideanCodebook`.
+        cache_embed_norm (bool): Cache the codebook squared norms between calls, see `EuclideanCodebook`.
     """
     def __init__(
             self,
@@ -275,6 +315,8 @@ class VectorQuantization(nn.Module):
             kmeans_iters: int = 50,
             threshold_ema_dead_code: float = 2.0,
             commitment_weight: float = 1.,
+            quantize_chunk_size: tp.Optional[int] = 2048,
+            cache_embed_norm: bool = True,
     ):
         super().__init__()
         _codebook_dim: int = default(codebook_dim, dim)
@@ -289,7 +331,9 @@ class VectorQuantization(nn.Module):
         self._codebook = EuclideanCodebook(dim=_codebook_dim, codebook_size=codebook_size,
                                            kmeans_init=kmeans_init, kmeans_iters=kmeans_iters,
                                            decay=decay, epsilon=epsilon,
-                                           threshold_ema_dead_code=threshold_ema_dead_code)
+                                           threshold_ema_dead_code=threshold_ema_dead_code,
+                                           quantize_chunk_size=quantize_chunk_size,
+                                           cache_embed_norm=cache_embed_norm)
         self.codebook_size = codebook_size
         self.training = True
 
@@ -22,22 +22,15 @@ import torch.nn as nn
 import torch.nn.functional as F
 import torchaudio.compliance.kaldi as kaldi
 
-from librosa.filters import mel as librosa_mel_fn
 from itertools import accumulate
 from typing import List
 from torch import Tensor
 
 from .core_vq import DistributedGroupResidualVectorQuantization
 from .whisper_encoder import WhisperEncoder, Conv1d, ConvTranspose1d
+from ...mel_frontend import batched_mel_spectrogram
 
 
-def dynamic_range_compression_torch(x, C=1, clip_val=1e-5):
-    return torch.log(torch.clamp(x, min=clip_val) * C)
-
-def spectral_normalize_torch(magnitudes):
-    output = dynamic_range_compression_torch(magnitudes)
-    return output
-
 class MelSpectrogramFeatures(nn.Module):
     """
     Calculate the BigVGAN style mel spectrogram of an input signal.
@@ -80,8 +73,6 @@ class MelSpectrogramFeatures(nn.Module):
         self.mel_fmax = mel_fmax
         self.sampling_rate = sampling_rate
         self.sampling_rate_org = sampling_rate_org if sampling_rate_org is not None else sampling_rate
-        self.mel_basis = {}
-        self.hann_window = {}
 
     def forward(self, audio: torch.Tensor, **kwargs) -> torch.Tensor:
         with torch.no_grad():
@@ -94,22 +85,16 @@ class MelSpectrogramFeatures(nn.Module):
             audio = audio.squeeze(1) if audio.shape[1] == 1 else audio.squeeze(2)
         assert len(audio.shape) == 2
 
-        y = audio
-        if len(list(self.mel_basis.keys())) == 0:
-            mel = librosa_mel_fn(sr=self.sampling_rate, n_fft=self.filter_length, n_mels=self.n_mel_channels, fmin=self.mel_fmin, fmax=self.mel_fmax)
-            self.mel_basis[str(self.mel_fmax)+'_'+str(y.device)] = torch.from_numpy(mel).float().to(y.device)
-            self.hann_window[str(y.device)] = torch.hann_window(self.win_length).to(y.device)
-
-        y = torch.nn.functional.pad(y.unsqueeze(1), (int((self.filter_length-self.hop_length)/2), int((self.filter_length-self.hop_length)/2)), mode='reflect')
-        y = y.squeeze(1)
-
-        spec = torch.stft(y, self.filter_length, hop_length=self.hop_length, win_length=self.win_length, window=self.hann_window[str(y.device)],
-                          center=False, pad_mode='reflect', normalized=False, onesided=True, return_complex=True)
-        spec = torch.view_as_real(spec)
-        spec = torch.sqrt(spec.pow(2).sum(-1)+(1e-9))
-
-        spec = torch.matmul(self.mel_basis[str(self.mel_fmax)+'_'+str(y.device)], spec)
-        spec = spectral_normalize_torch(spec)
+        spec, _ = batched_mel_spectrogram(
+            list(audio),
+            n_fft=self.filter_length,
+            num_mels=self.n_mel_channels,
+            sampling_rate=self.sampling_rate,
+            hop_size=self.hop_length,
+            win_size=self.win_length,
+            fmin=self.mel_fmin,
+            fmax=self.mel_fmax,
+        )
     
         return spec
         
@@ -183,6 +168,7 @@ class WhisperEncoderVQ(WhisperEncoder):
             audio_vq_threshold_ema_dead_code: float = 0.1,
             audio_vq_codebook_dim: int = None,
             audio_vq_ds_rate: int = None,
+            audio_vq_quantize_chunk_size: int = 2048,
     ):
         super().__init__(n_mels, n_ctx, n_state, n_head, n_layer, n_window, output_dim, grad_checkpointing, enable_mp, audio_sequence_parallel)
 
@@ -219,7 +205,8 @@ class WhisperEncoderVQ(WhisperEncoder):
                 num_groups=1,
                 num_quantizers=1,
                 kmeans_init=False,
-                threshold_ema_dead_code = audio_vq_threshold_ema_dead_code
+                threshold_ema_dead_code = audio_vq_threshold_ema_dead_code,
+                quantize_chunk_size = audio_vq_quantize_chunk_size,
             )
         else:
             raise NotImplementedError(f"Unsupported audio_vq_type: {audio_vq_type}")
@@ -281,23 +268,9 @@ class WhisperEncoderVQ(WhisperEncoder):
             the mel spectrogram of the audio
         """
 
-        aftercnn_x_list = []
-        pe_for_vq_list = []
-        for each_x in x_list:
-            each_x_split_list = each_x.split(self.n_window * 2, dim=1)
-            for each_x_split in each_x_split_list:
-                each_x_split = F.gelu(self.conv1(each_x_split))
-                each_x_split = F.gelu(self.conv2(each_x_split))
-                each_x_split = each_x_split.permute(1, 0) # L,D
-
-                each_positional_embedding_split = self.positional_embedding[:each_x_split.shape[0]]
-                aftercnn_x_list.append(each_x_split+each_positional_embedding_split.to(each_x_split.dtype))
-
-                pe_for_vq_split = self.positional_embedding[:each_x_split.shape[0] // self.audio_vq_ds_rate]
-                pe_for_vq_list.append(pe_for_vq_split.to(each_x_split.dtype))
-
-        pe_for_vq = torch.cat(pe_for_vq_list, dim=0)
-        x = torch.cat(aftercnn_x_list, dim=0)
+        x, aftercnn_split_lens = self._conv_frontend(x_list)
+        pe_positions = self._packed_positions([l // self.audio_vq_ds_rate for l in aftercnn_split_lens], x.device)
+        pe_for_vq = self.positional_embedding[pe_positions].to(x.dtype)
         src_len = x.size(0)
 
         output_list = []
@@ -323,14 +296,7 @@ class WhisperEncoderVQ(WhisperEncoder):
                     return x, indices
 
         if self.avg_pooler:
-            x_list = x.split(audio_aftercnnlens, dim=0)
-            token_x_list = []
-            for x in x_list:
-                x = x.permute(1, 0)
-                x = self.avg_pooler(x)
-                x = x.permute(1, 0)
-                token_x_list.append(x)
-            x = torch.cat(token_x_list, dim=0)
+            x = self._avg_pool_packed(x, audio_aftercnnlens)
 
         x = self.ln_post(x)
 
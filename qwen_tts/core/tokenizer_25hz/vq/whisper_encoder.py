@@ -26,6 +26,8 @@ from typing import Optional, Union, List
 from torch import nn, Tensor
 from itertools import accumulate
 
+from ...mel_frontend import batched_whisper_log_mel, get_hann_window
+
 try:
     from flash_attn.flash_attn_interface import flash_attn_varlen_func as flash_attn_varlen_func
 except ImportError:
@@ -94,7 +96,7 @@ def log_mel_spectrogram(
         audio = audio.to(device)
     if padding > 0:
         audio = F.pad(audio, (0, padding))
-    window = torch.hann_window(N_FFT).to(audio.device)
+    window = get_hann_window(N_FFT, device=audio.device, dtype=audio.dtype)
     stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=window, return_complex=True)
     magnitudes = stft[..., :-1].abs() ** 2
 
@@ -126,6 +128,28 @@ def get_mel_audio(audio, padding=False, audio_vq_ds_rate = 1, n_mels = 128):
     return mel
 
 
+def get_mel_audio_batch(audios, padding=False, audio_vq_ds_rate = 1, n_mels = 128, device=None):
+    """
+    Batched `get_mel_audio`: one STFT over all utterances, returned as a list of [F,T_i] mels
+    identical to calling `get_mel_audio` on each item.
+    """
+    if len(audios) == 0:
+        return []
+    audio_pads = None
+    if padding:
+        reduction = 160 * 2 * audio_vq_ds_rate
+        audio_pads = [math.ceil(len(audio) / reduction) * reduction - len(audio) for audio in audios]
+    log_spec, frame_lengths = batched_whisper_log_mel(
+        audios,
+        filters=mel_filters(device if device is not None else audios[0].device, n_mels),
+        n_fft=N_FFT,
+        hop_size=HOP_LENGTH,
+        paddings=audio_pads,
+        device=device,
+    )
+    return [mel[:, :T] for mel, T in zip(log_spec, frame_lengths.tolist())]
+
+
 def sinusoids(length, channels, max_timescale=10000):
     """Returns sinusoids for positional embedding"""
     assert channels % 2 == 0
@@ -335,23 +359,54 @@ class WhisperEncoder(nn.Module):
             if not name.startswith("blocks"):
                 setattr(param, "audio_sync", True)
 
+    def _conv_frontend(self, x_list: List[Tensor]):
+        """
+        Run conv1/conv2 once over every `n_window * 2` mel split of every utterance.
+
+        Splits are zero-padded into one (n_splits, n_mels, L) batch; conv1 outputs past each split's
+        length are zeroed before conv2 so valid frames match the per-split computation.
+
+        Returns the packed (sum(L_i), D) features with positional embeddings added, and the per-split
+        frame counts after the CNN.
+        """
+        splits = [each_x_split for each_x in x_list for each_x_split in each_x.split(self.n_window * 2, dim=1)]
+        device = splits[0].device
+        mel_lens = torch.tensor([split.shape[1] for split in splits], device=device)
+        batch = nn.utils.rnn.pad_sequence([split.permute(1, 0) for split in splits], batch_first=True).permute(0, 2, 1)
+
+        x = F.gelu(self.conv1(batch))
+        mel_mask = torch.arange(x.shape[-1], device=device)[None, :] < mel_lens[:, None]
+        x = x * mel_mask.unsqueeze(1).to(x.dtype)
+        x = F.gelu(self.conv2(x))
+        x = x.permute(0, 2, 1) # B,L,D
+
+        aftercnn_lens = (mel_lens - 1) // 2 + 1
+        x = x + self.positional_embedding[:x.shape[1]].to(x.dtype).unsqueeze(0)
+        valid = torch.arange(x.shape[1], device=device)[None, :] < aftercnn_lens[:, None]
+        return x[valid], aftercnn_lens.tolist()
+
+    @staticmethod
+    def _packed_positions(lens: List[int], device) -> Tensor:
+        """Position of every packed frame inside its own segment, e.g. [2, 3] -> [0, 1, 0, 1, 2]."""
+        lens = torch.tensor(lens, device=device)
+        starts = torch.cumsum(lens, dim=0) - lens
+        return torch.arange(int(lens.sum()), device=device) - torch.repeat_interleave(starts, lens)
+
+    def _avg_pool_packed(self, x: Tensor, seq_lens: List[int]) -> Tensor:
+        """`avg_pooler` (kernel 2, stride 2) applied to each packed utterance, in one gather."""
+        lens = torch.tensor(seq_lens, device=x.device)
+        starts = torch.cumsum(lens, dim=0) - lens
+        pooled_lens = lens // 2
+        first = torch.repeat_interleave(starts, pooled_lens) + 2 * self._packed_positions(pooled_lens.tolist(), x.device)
+        return (x[first] + x[first + 1]) / 2
+
     def forward(self, x_list: List[Tensor], audio_mellens:List[int], audio_aftercnnlens:List[int], audio_seqlens:List[int]):
         """
         x : torch.Tensor, shape = (n_mels, n_ctx)
             the mel spectrogram of the audio
         """
 
-        aftercnn_x_list = []
-        for each_x in x_list:
-            each_x_split_list = each_x.split(self.n_window * 2, dim=1)
-            for each_x_split in each_x_split_list:
-                each_x_split = F.gelu(self.conv1(each_x_split))
-                each_x_split = F.gelu(self.conv2(each_x_split))
-                each_x_split = each_x_split.permute(1, 0) # L,D
-                each_positional_embedding_split = self.positional_embedding[:each_x_split.shape[0]]
-                aftercnn_x_list.append(each_x_split+each_positional_embedding_split.to(each_x_split.dtype))
-
-        x = torch.cat(aftercnn_x_list, dim=0)
+        x, _ = self._conv_frontend(x_list)
         src_len = x.size(0)
 
         output_list = []
@@ -370,14 +425,7 @@ class WhisperEncoder(nn.Module):
             x = block(x, cu_seqlens=cu_seqlens)
 
         if self.avg_pooler:
-            x_list = x.split(audio_aftercnnlens, dim=0)
-            token_x_list = []
-            for x in x_list:
-                x = x.permute(1, 0)
-                x = self.avg_pooler(x)
-                x = x.permute(1, 0)
-                token_x_list.append(x)
-            x = torch.cat(token_x_list, dim=0)
+            x = self._avg_pool_packed(x, audio_aftercnnlens)
 
         x = self.ln_post(x)
         x = self.proj(x)
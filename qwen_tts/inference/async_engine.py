@@ -0,0 +1,462 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+asyncio front-end for `Qwen3TTSModel` that micro-batches concurrent requests.
+
+Requests are queued, grouped with other requests that can share one `generate_*` call (same method, language,
+seed, sampling options) and executed on a single dedicated inference thread, so one loaded engine serves many
+concurrent clients at batch efficiency without blocking the event loop.
+
+`BatchingDispatcher` exposes the same batching to synchronous callers (Gradio callbacks, worker threads): each
+call blocks its own thread while the requests of all threads are batched together on one background event loop.
+"""
+import asyncio
+import concurrent.futures
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .qwen3_tts_model import AudioLike, Qwen3TTSModel, VoiceClonePromptItem
+
+_METHOD_MODEL_TYPES = {
+    "custom_voice": "custom_voice",
+    "voice_design": "voice_design",
+    "voice_clone": "base",
+}
+
+
+@dataclass
+class _Request:
+    method: str
+    text: str
+    language: str
+    voice: Dict[str, Any]
+    options: Dict[str, Any]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+    def batch_key(self) -> Tuple:
+        # everything that is applied per call rather than per item must match
+        return (self.method, self.language, tuple(sorted((k, repr(v)) for k, v in self.options.items())))
+
+
+class AsyncQwen3TTS:
+    """
+    Micro-batching asyncio wrapper around a loaded `Qwen3TTSModel`.
+
+    Usage:
+        engine = AsyncQwen3TTS(Qwen3TTSModel.from_pretrained(...), max_batch_size=8, max_wait_ms=15)
+        wav, sr = await engine.generate_custom_voice("Hello.", speaker="Ryan")
+        ...
+        await engine.close()
+
+    Each request resolves to `(wav, sample_rate)` for its own text. Awaiting callers can be cancelled at any time;
+    a cancelled request that has not started is dropped from its batch, one that is already running is discarded
+    when the batch finishes.
+
+    Args:
+        model (Qwen3TTSModel):
+            The loaded engine. Only methods matching its `tts_model_type` are accepted.
+        max_batch_size (int):
+            Upper bound on requests per `generate_*` call.
+        max_wait_ms (float):
+            How long the first request of a batch waits for compatible company before the batch is launched.
+    """
+
+    def __init__(self, model: Qwen3TTSModel, max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        self.model = model
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: List[_Request] = []
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: List[_Request] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwen-tts-infer")
+        self._closed = False
+
+    # public API
+    async def generate_custom_voice(
+        self,
+        text: str,
+        speaker: str,
+        language: Optional[str] = None,
+        instruct: Optional[str] = None,
+        **kwargs,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Awaitable single-text `Qwen3TTSModel.generate_custom_voice`. `kwargs` are sampling options / `seed`.
+        """
+        return await self._submit("custom_voice", text, language, dict(speaker=speaker, instruct=instruct or ""), kwargs)
+
+    async def generate_voice_design(
+        self,
+        text: str,
+        instruct: str,
+        language: Optional[str] = None,
+        **kwargs,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Awaitable single-text `Qwen3TTSModel.generate_voice_design`. `kwargs` are sampling options / `seed`.
+        """
+        return await self._submit("voice_design", text, language, dict(instruct=instruct or ""), kwargs)
+
+    async def generate_voice_clone(
+        self,
+        text: str,
+        language: Optional[str] = None,
+        voice_clone_prompt: Optional[VoiceClonePromptItem] = None,
+        ref_audio: Optional[AudioLike] = None,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+        **kwargs,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Awaitable single-text `Qwen3TTSModel.generate_voice_clone`.
+
+        Pass either a prebuilt `voice_clone_prompt` item or `ref_audio` (+ `ref_text`); the latter is turned into a
+        prompt on the inference thread, batched with the other requests and served from the model's
+        `voice_prompt_cache` when one is attached.
+        """
+        if isinstance(voice_clone_prompt, list):
+            if len(voice_clone_prompt) != 1:
+                raise ValueError("AsyncQwen3TTS.generate_voice_clone takes a single VoiceClonePromptItem.")
+            voice_clone_prompt = voice_clone_prompt[0]
+        if voice_clone_prompt is None and ref_audio is None:
+            raise ValueError("Either `voice_clone_prompt` or `ref_audio` is required.")
+        voice = dict(
+            voice_clone_prompt=voice_clone_prompt,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=bool(x_vector_only_mode),
+        )
+        return await self._submit("voice_clone", text, language, voice, kwargs)
+
+    async def create_voice_clone_prompt(
+        self,
+        ref_audio: AudioLike,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+    ) -> VoiceClonePromptItem:
+        """
+        Build one voice clone prompt on the inference thread (between batches), e.g. to register it once and pass
+        it to `generate_voice_clone` afterwards.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncQwen3TTS is closed.")
+        items = await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            lambda: self.model.create_voice_clone_prompt(
+                ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=bool(x_vector_only_mode)
+            ),
+        )
+        return items[0]
+
+    async def close(self) -> None:
+        """
+        Stop accepting requests, cancel everything still queued and release the inference thread.
+        """
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for req in self._inflight + self._drain():
+            if not req.future.done():
+                req.future.cancel()
+        self._inflight = []
+        # a batch already on the inference thread finishes in the background
+        self._executor.shutdown(wait=False)
+
+    # internals
+    async def _submit(self, method: str, text: str, language: Optional[str], voice: Dict[str, Any], options: Dict[str, Any]):
+        if self._closed:
+            raise RuntimeError("AsyncQwen3TTS is closed.")
+        expected = _METHOD_MODEL_TYPES[method]
+        if self.model.model.tts_model_type != expected:
+            raise ValueError(
+                f"Loaded engine is '{self.model.model.tts_model_type}', {method} requires a '{expected}' engine."
+            )
+        loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+        req = _Request(method, text, language or "Auto", voice, options, loop.create_future())
+        await self._queue.put(req)
+        return await req.future
+
+    def _drain(self) -> List[_Request]:
+        reqs, self._pending = self._pending, []
+        while self._queue is not None and not self._queue.empty():
+            reqs.append(self._queue.get_nowait())
+        return reqs
+
+    async def _next_batch(self) -> List[_Request]:
+        if not self._pending:
+            self._pending.append(await self._queue.get())
+
+        first = self._pending[0]
+        key = first.batch_key()
+        deadline = first.enqueued_at + self.max_wait
+        while sum(r.batch_key() == key for r in self._pending) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+
+        batch, rest = [], []
+        for req in self._pending:
+            if req.batch_key() == key and len(batch) < self.max_batch_size:
+                batch.append(req)
+            else:
+                rest.append(req)
+        self._pending = rest
+        return [req for req in batch if not req.future.cancelled()]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            self._inflight = batch
+            try:
+                wavs, sr = await loop.run_in_executor(self._executor, self._generate_batch, batch)
+            except Exception as e:
+                self._inflight = []
+                for req in batch:
+                    if not req.future.done():
+                        req.future.set_exception(e)
+                continue
+            self._inflight = []
+            for req, wav in zip(batch, wavs):
+                if not req.future.done():
+                    req.future.set_result((wav, sr))
+
+    def _generate_batch(self, batch: List[_Request]) -> Tuple[List[np.ndarray], int]:
+        method = batch[0].method
+        texts = [r.text for r in batch]
+        language = batch[0].language
+        options = dict(batch[0].options)
+
+        if method == "custom_voice":
+            return self.model.generate_custom_voice(
+                text=texts,
+                speaker=[r.voice["speaker"] for r in batch],
+                instruct=[r.voice["instruct"] for r in batch],
+                language=language,
+                **options,
+            )
+        if method == "voice_design":
+            return self.model.generate_voice_design(
+                text=texts,
+                instruct=[r.voice["instruct"] for r in batch],
+                language=language,
+                **options,
+            )
+
+        prompts: List[Optional[VoiceClonePromptItem]] = [r.voice["voice_clone_prompt"] for r in batch]
+        missing = [i for i, p in enumerate(prompts) if p is None]
+        if missing:
+            built = self.model.create_voice_clone_prompt(
+                ref_audio=[batch[i].voice["ref_audio"] for i in missing],
+                ref_text=[batch[i].voice["ref_text"] for i in missing],
+                x_vector_only_mode=[batch[i].voice["x_vector_only_mode"] for i in missing],
+            )
+            for i, item in zip(missing, built):
+                prompts[i] = item
+        return self.model.generate_voice_clone(
+            text=texts,
+            language=language,
+            voice_clone_prompt=prompts,
+            **options,
+        )
+
+
+def _per_item(value: Any, n: int, name: str) -> List[Any]:
+    # lists are per-item values, anything else (including `(wav, sr)` tuples) is shared by all items
+    if isinstance(value, list):
+        if len(value) == 1:
+            return value * n
+        if len(value) != n:
+            raise ValueError(f"Batch size mismatch: text={n}, {name}={len(value)}")
+        return list(value)
+    return [value] * n
+
+
+class BatchingDispatcher:
+    """
+    Blocking, thread-safe front-end to `AsyncQwen3TTS`, shaped like `Qwen3TTSModel`.
+
+    Many threads calling `generate_*` at once (e.g. a Gradio queue with `default_concurrency_limit` > 1) no longer
+    contend for the model one `generate` at a time: their requests are collected for up to `max_wait_ms`, run as
+    one batched `generate_*` call per compatible group and the results are handed back to each caller.
+
+    Usage:
+        dispatcher = BatchingDispatcher(tts, max_batch_size=8, max_wait_ms=20)
+        wavs, sr = dispatcher.generate_custom_voice(text="Hello.", speaker="Ryan")  # from any thread
+        ...
+        dispatcher.close()
+
+    The `generate_*` methods take the arguments of their `Qwen3TTSModel` counterparts and return `(wavs, sr)`.
+    A list of texts is submitted as separate requests (list-valued speaker / instruct / language / voice
+    arguments are matched per item), so they may be batched with other callers' requests.
+
+    Args:
+        model (Qwen3TTSModel):
+            The loaded engine.
+        max_batch_size (int):
+            Upper bound on requests per `generate_*` call.
+        max_wait_ms (float):
+            How long the first request of a batch waits for compatible company before the batch is launched.
+    """
+
+    def __init__(self, model: Qwen3TTSModel, max_batch_size: int = 8, max_wait_ms: float = 20.0):
+        self.model = model
+        self.engine = AsyncQwen3TTS(model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="qwen-tts-dispatch", daemon=True)
+        self._loop_thread.start()
+
+    # public API
+    def submit(self, method: str, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Queue one request for `AsyncQwen3TTS.<method>` without waiting; resolves to that method's result.
+        """
+        if not self._loop_thread.is_alive():
+            raise RuntimeError("BatchingDispatcher is closed.")
+        return asyncio.run_coroutine_threadsafe(getattr(self.engine, method)(*args, **kwargs), self._loop)
+
+    def generate_custom_voice(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Optional[Union[str, List[str]]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        texts = text if isinstance(text, list) else [text]
+        n = len(texts)
+        return self._gather([
+            self.submit("generate_custom_voice", t, speaker=s, language=l, instruct=i, **kwargs)
+            for t, s, l, i in zip(
+                texts,
+                _per_item(speaker, n, "speaker"),
+                _per_item(language, n, "language"),
+                _per_item(instruct, n, "instruct"),
+            )
+        ])
+
+    def generate_voice_design(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Optional[Union[str, List[str]]] = None,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        texts = text if isinstance(text, list) else [text]
+        n = len(texts)
+        return self._gather([
+            self.submit("generate_voice_design", t, instruct=i, language=l, **kwargs)
+            for t, i, l in zip(texts, _per_item(instruct, n, "instruct"), _per_item(language, n, "language"))
+        ])
+
+    def generate_voice_clone(
+        self,
+        text: Union[str, List[str]],
+        language: Optional[Union[str, List[str]]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[Union[VoiceClonePromptItem, List[VoiceClonePromptItem]]] = None,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        texts = text if isinstance(text, list) else [text]
+        n = len(texts)
+        return self._gather([
+            self.submit(
+                "generate_voice_clone",
+                t,
+                language=l,
+                voice_clone_prompt=p,
+                ref_audio=a,
+                ref_text=r,
+                x_vector_only_mode=x,
+                **kwargs,
+            )
+            for t, l, p, a, r, x in zip(
+                texts,
+                _per_item(language, n, "language"),
+                _per_item(voice_clone_prompt, n, "voice_clone_prompt"),
+                _per_item(ref_audio, n, "ref_audio"),
+                _per_item(ref_text, n, "ref_text"),
+                _per_item(x_vector_only_mode, n, "x_vector_only_mode"),
+            )
+        ])
+
+    def create_voice_clone_prompt(
+        self,
+        ref_audio: Union[AudioLike, List[AudioLike]],
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+    ) -> List[VoiceClonePromptItem]:
+        """
+        `Qwen3TTSModel.create_voice_clone_prompt`, run on the inference thread between batches.
+        """
+        audios = ref_audio if isinstance(ref_audio, list) else [ref_audio]
+        n = len(audios)
+        futures = [
+            self.submit("create_voice_clone_prompt", a, ref_text=r, x_vector_only_mode=x)
+            for a, r, x in zip(audios, _per_item(ref_text, n, "ref_text"), _per_item(x_vector_only_mode, n, "x_vector_only_mode"))
+        ]
+        return [f.result() for f in futures]
+
+    def close(self) -> None:
+        """
+        Cancel queued requests and stop the background loop. Blocked callers receive `CancelledError`.
+        """
+        if not self._loop_thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self.engine.close(), self._loop).result(timeout=30)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=30)
+
+    # internals
+    @staticmethod
+    def _gather(futures: List[concurrent.futures.Future]) -> Tuple[List[np.ndarray], int]:
+        try:
+            results = [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+        return [wav for wav, _ in results], results[0][1]
+
+
+__all__ = ["AsyncQwen3TTS", "BatchingDispatcher"]
@@ -0,0 +1,337 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Audio ingestion helpers shared by `Qwen3TTSModel` and `Qwen3TTSTokenizer`.
+
+Files are decoded with soundfile (librosa is only imported as a fallback for formats libsndfile cannot read),
+resampling goes through a resampler cached per `(orig_sr, target_sr)` that matches `librosa.resample`'s default
+`soxr_hq` output, decoded/resampled file contents are cached by `(path, mtime, size, target_sr)`, and many
+inputs can be loaded concurrently with `map_concurrently`.
+
+On the output side, `wavs_to_host` moves a batch of decoded waveforms to the host in one transfer (optionally as
+int16 / float16 PCM) and `StreamingAudioWriter` appends chunks to an audio file without concatenating them.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+import soundfile as sf
+import torch
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def to_mono_float32(audio: np.ndarray) -> np.ndarray:
+    if audio.ndim > 1:
+        audio = np.mean(audio, axis=-1)
+    return audio.astype(np.float32, copy=False)
+
+
+def decode_audio_file(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file to a mono float32 waveform at its native sampling rate.
+
+    Returns the same samples as `librosa.load(path, sr=None, mono=True)`.
+    """
+    try:
+        audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    except (sf.LibsndfileError, RuntimeError, TypeError):
+        import librosa  # audioread fallback for containers libsndfile cannot decode
+
+        audio, sr = librosa.load(path, sr=None, mono=True)
+    return to_mono_float32(audio), int(sr)
+
+
+@lru_cache(maxsize=None)
+def get_resampler(orig_sr: int, target_sr: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Return a cached 1-D resampler for `orig_sr -> target_sr`.
+
+    Uses soxr with the `soxr_hq` preset and librosa's output length (`ceil(n * target_sr / orig_sr)`), so
+    results equal `librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr)`. Falls back to a polyphase
+    `scipy.signal.resample_poly` filter if soxr is unavailable.
+    """
+    orig_sr, target_sr = int(orig_sr), int(target_sr)
+    if orig_sr <= 0 or target_sr <= 0:
+        raise ValueError(f"Invalid sampling rates: {orig_sr} -> {target_sr}")
+    ratio = float(target_sr) / orig_sr
+
+    try:
+        import soxr
+
+        def _resample(y: np.ndarray) -> np.ndarray:
+            return soxr.resample(y, orig_sr, target_sr, quality="soxr_hq")
+
+    except ImportError:
+        from math import gcd
+
+        from scipy.signal import resample_poly
+
+        g = gcd(orig_sr, target_sr)
+        up, down = target_sr // g, orig_sr // g
+
+        def _resample(y: np.ndarray) -> np.ndarray:
+            return resample_poly(y, up, down)
+
+    def resample_fn(y: np.ndarray) -> np.ndarray:
+        y = np.ascontiguousarray(y, dtype=np.float32)
+        n_out = int(np.ceil(y.shape[-1] * ratio))
+        y_hat = _resample(y)
+        if y_hat.shape[-1] > n_out:
+            y_hat = y_hat[:n_out]
+        elif y_hat.shape[-1] < n_out:
+            y_hat = np.pad(y_hat, (0, n_out - y_hat.shape[-1]))
+        return np.asarray(y_hat, dtype=np.float32)
+
+    return resample_fn
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample a 1-D waveform; a no-op (besides the float32 cast) when the rates match.
+    """
+    if int(orig_sr) == int(target_sr):
+        return audio.astype(np.float32, copy=False)
+    return get_resampler(int(orig_sr), int(target_sr))(audio)
+
+
+class _AudioFileCache:
+    """
+    Byte-bounded LRU of decoded (and optionally resampled) files keyed by `(path, mtime_ns, size, target_sr)`.
+    Cached arrays are read-only; editing a file changes its mtime and therefore its key.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[tuple, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Tuple[np.ndarray, int]]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                self._entries.move_to_end(key)
+            return hit
+
+    def put(self, key: tuple, value: Tuple[np.ndarray, int]) -> None:
+        nbytes = value[0].nbytes
+        if nbytes > self.max_bytes:
+            return
+        value[0].setflags(write=False)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[0].nbytes
+            self._entries[key] = value
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_file_cache = _AudioFileCache(max_bytes=int(os.environ.get("QWEN_TTS_AUDIO_CACHE_MB", "512")) * (1 << 20))
+
+
+def load_audio_file(path: str, target_sr: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """
+    Decode `path` (resampled to `target_sr` if given) through the process-wide file cache.
+
+    Returns:
+        Tuple[np.ndarray, int]: mono float32 waveform (a private copy of the cached array) and its sampling rate.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, None if target_sr is None else int(target_sr))
+    hit = _file_cache.get(key)
+    if hit is not None:
+        return hit[0].copy(), hit[1]
+
+    audio, sr = decode_audio_file(path)
+    if target_sr is not None and sr != int(target_sr):
+        audio, sr = resample(audio, sr, int(target_sr)), int(target_sr)
+    _file_cache.put(key, (audio.copy(), sr))
+    return audio, sr
+
+
+def clear_audio_cache() -> None:
+    """
+    Drop all cached decoded files and resamplers.
+    """
+    _file_cache.clear()
+    get_resampler.cache_clear()
+
+
+def map_concurrently(fn: Callable[[T], R], items: Sequence[T], max_workers: Optional[int] = None) -> List[R]:
+    """
+    `[fn(x) for x in items]`, run in a thread pool when there is more than one item. Decoding and soxr release
+    the GIL, so loading many reference files this way overlaps their I/O and DSP.
+    """
+    if len(items) <= 1:
+        return [fn(x) for x in items]
+    max_workers = max_workers or min(len(items), 8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fn, items))
+
+
+PCM_DTYPES = {
+    "float32": (torch.float32, np.float32),
+    "float16": (torch.float16, np.float16),
+    "int16": (torch.int16, np.int16),
+}
+
+
+class PinnedStagingBuffer:
+    """
+    Reusable page-locked host buffer for device-to-host copies. Grows on demand; one buffer per dtype.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def copy_to_host(self, src: torch.Tensor) -> np.ndarray:
+        """
+        Copy a 1-D device tensor to a new (pageable) numpy array through the pinned buffer.
+
+        The device-to-host transfer goes at pinned-memory speed; the result is then copied once more on the host,
+        since the buffer is reused by the next call.
+        """
+        n = src.numel()
+        with self._lock:
+            buf = self._buffers.get(src.dtype)
+            if buf is None or buf.numel() < n:
+                buf = torch.empty(max(n, 1), dtype=src.dtype, pin_memory=True)
+                self._buffers[src.dtype] = buf
+            buf[:n].copy_(src, non_blocking=True)
+            torch.cuda.current_stream(src.device).synchronize()
+            return buf[:n].numpy().copy()
+
+    def release(self) -> None:
+        with self._lock:
+            self._buffers.clear()
+
+
+def wavs_to_host(
+    wavs: Sequence[torch.Tensor],
+    dtype: str = "float32",
+    staging: Optional[PinnedStagingBuffer] = None,
+) -> List[np.ndarray]:
+    """
+    Convert a batch of 1-D waveforms to numpy with a single device-to-host transfer.
+
+    The conversion to `dtype` ("float32", "float16" or "int16" PCM, full scale = 32767) happens on the device, so
+    only the final sample format crosses the bus. CUDA tensors go through `staging` (a pinned buffer) when given,
+    at the cost of one host-side copy out of it. The returned arrays are views into one host array.
+    """
+    if dtype not in PCM_DTYPES:
+        raise ValueError(f"Unsupported output dtype: {dtype}. Choose from {list(PCM_DTYPES)}")
+    if len(wavs) == 0:
+        return []
+    torch_dtype, _ = PCM_DTYPES[dtype]
+    lengths = [int(w.numel()) for w in wavs]
+    flat = torch.cat([w.detach().reshape(-1) for w in wavs])
+    if dtype == "int16":
+        flat = (flat.float().clamp(-1.0, 1.0) * 32767.0).round().to(torch.int16)
+    else:
+        flat = flat.to(torch_dtype)
+
+    if flat.is_cuda and staging is not None:
+        host = staging.copy_to_host(flat)
+    else:
+        host = flat.cpu().numpy()
+    return np.split(host, np.cumsum(lengths)[:-1])
+
+
+class StreamingAudioWriter:
+    """
+    Append-only audio file writer: decoded chunks are written as they arrive instead of being concatenated first.
+
+    Usage:
+        with StreamingAudioWriter("scene.wav", 24000) as w:
+            for wav in chunks:
+                w.write(wav)
+                w.write_silence(0.2)
+
+    Args:
+        path (str): Output file. The container is taken from the extension unless `format` is given.
+        sample_rate (int): Sampling rate.
+        subtype (Optional[str]):
+            soundfile subtype; defaults to the container's default subtype, as `sf.write` does (PCM_16 for
+            WAV/FLAC, VORBIS for OGG, ...).
+        format (Optional[str]): soundfile container, e.g. "WAV", "FLAC" or "OGG".
+    """
+
+    def __init__(self, path: str, sample_rate: int, subtype: Optional[str] = None, format: Optional[str] = None):
+        self.sample_rate = int(sample_rate)
+        self.frames_written = 0
+        if format is None:
+            format = os.path.splitext(path)[1][1:].upper()
+        if subtype is None:
+            subtype = sf.default_subtype(format)
+        self._file = sf.SoundFile(
+            path, mode="w", samplerate=self.sample_rate, channels=1, subtype=subtype, format=format
+        )
+
+    def write(self, chunk: Union[np.ndarray, torch.Tensor]) -> None:
+        """
+        Append a mono chunk (float in [-1, 1], or int16 PCM).
+        """
+        if isinstance(chunk, torch.Tensor):
+            chunk = chunk.detach().cpu().numpy()
+        chunk = np.asarray(chunk).reshape(-1)
+        if chunk.dtype == np.float16 or chunk.dtype == np.float64:
+            chunk = chunk.astype(np.float32)
+        self._file.write(chunk)
+        self.frames_written += chunk.shape[0]
+
+    def write_silence(self, seconds: float) -> None:
+        n = int(self.sample_rate * seconds)
+        if n > 0:
+            self.write(np.zeros(n, dtype=np.float32))
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "StreamingAudioWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+__all__ = [
+    "decode_audio_file",
+    "get_resampler",
+    "resample",
+    "load_audio_file",
+    "clear_audio_cache",
+    "map_concurrently",
+    "to_mono_float32",
+    "PinnedStagingBuffer",
+    "wavs_to_host",
+    "StreamingAudioWriter",
+]
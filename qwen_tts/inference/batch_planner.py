@@ -0,0 +1,267 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Memory estimates for batched generation, and a planner that sizes batches to a memory budget.
+
+The estimate is analytic, from the configs alone:
+
+  - talker: per sequence and per position (prompt token or generated frame), the KV cache of every layer plus the
+    per-layer hidden states that `generate` keeps for every step (`output_hidden_states=True`);
+  - code predictor: per sequence, the KV cache and hidden states of one `num_code_groups`-step inner generate,
+    which is rebuilt for every frame;
+  - sampling: per sequence, a few float32 copies of the talker logits;
+  - prefill: per prompt token, the MLP / attention activations, plus the eager attention scores;
+  - speech decoder: per code frame, the widest upsampling activation times a working-set factor. The 12Hz decoder
+    runs in fixed windows (`chunked_decode`), the 25Hz one over the whole utterance.
+
+Generation and decoding do not overlap (the talker cache is released before decoding), so the peak is the larger
+of the two. The numbers are deliberately conservative; they only need to rank batch sizes, not predict the
+allocator to the byte.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import torch
+
+# live tensors per decoder stage: the stage input, the conv output and the activation temporaries
+_DECODER_WORKING_SET = 4
+# `Qwen3TTSTokenizerV2Decoder.chunked_decode` defaults: 300-frame chunks with 25 frames of left context
+_CHUNKED_DECODE_WINDOW = 300 + 25
+# float32 logits copies alive while sampling (logits, processed scores, probabilities)
+_LOGITS_COPIES = 3
+
+
+@dataclass
+class MemoryProfile:
+    """
+    Bytes needed per unit of work, as estimated by `estimate_memory_profile`. All figures are per sequence.
+    """
+
+    talker_bytes_per_token: int
+    code_predictor_bytes: int
+    sampling_bytes: int
+    prefill_bytes_per_token: int
+    prefill_attention_bytes: int
+    decoder_bytes_per_frame: int
+    decoder_window_frames: Optional[int] = None
+
+    def generation_bytes(self, batch_size: int, prompt_tokens: int, max_new_tokens: int) -> int:
+        """Peak bytes of one `generate` call (talker + code predictor), excluding weights."""
+        seq = prompt_tokens + max_new_tokens
+        steady = seq * self.talker_bytes_per_token + self.code_predictor_bytes + self.sampling_bytes
+        prefill = prompt_tokens * self.prefill_bytes_per_token + prompt_tokens ** 2 * self.prefill_attention_bytes
+        return batch_size * (steady + prefill)
+
+    def decode_bytes(self, batch_size: int, frames: int) -> int:
+        """Peak bytes of decoding `batch_size` utterances of `frames` codes each, excluding weights."""
+        window = min(frames, self.decoder_window_frames) if self.decoder_window_frames else frames
+        return batch_size * window * self.decoder_bytes_per_frame
+
+    def peak_bytes(self, batch_size: int, prompt_tokens: int, max_new_tokens: int) -> int:
+        return max(
+            self.generation_bytes(batch_size, prompt_tokens, max_new_tokens),
+            self.decode_bytes(batch_size, max_new_tokens),
+        )
+
+
+@dataclass
+class BatchPlan:
+    """
+    Result of `plan_batch`. `budget_bytes` is `None` when no budget applied (unknown free memory).
+    """
+
+    batch_size: int
+    max_new_tokens: int
+    peak_bytes: int
+    budget_bytes: Optional[int] = None
+
+    @property
+    def fits(self) -> bool:
+        return self.budget_bytes is None or self.peak_bytes <= self.budget_bytes
+
+
+def _dtype_bytes(module: torch.nn.Module) -> int:
+    try:
+        return next(module.parameters()).element_size()
+    except StopIteration:
+        return 4
+
+
+def _head_dim(config) -> int:
+    return getattr(config, "head_dim", None) or config.hidden_size // config.num_attention_heads
+
+
+def _decoder_profile(tokenizer_model: torch.nn.Module):
+    """
+    `(bytes per code frame, window frames)` of the speech decoder of a 12Hz or 25Hz tokenizer model.
+    """
+    config = tokenizer_model.config.decoder_config
+    nbytes = _dtype_bytes(tokenizer_model.decoder)
+    if tokenizer_model.get_model_type() == "qwen3_tts_tokenizer_12hz":
+        samples = math.prod(config.upsampling_ratios)
+        widest = max(config.decoder_dim, config.latent_dim) * samples
+        for i, rate in enumerate(config.upsample_rates):
+            samples *= rate
+            widest = max(widest, (config.decoder_dim // 2 ** (i + 1)) * samples)
+        return _DECODER_WORKING_SET * widest * nbytes, _CHUNKED_DECODE_WINDOW
+
+    # 25Hz: DiT over `repeats` mel frames per code (doubled for classifier-free guidance), then BigVGAN
+    dit, vocoder = config.dit_config, config.bigvgan_config
+    samples = dit.repeats
+    widest = max(2 * dit.hidden_size * samples, vocoder.upsample_initial_channel * samples)
+    for i, rate in enumerate(vocoder.upsample_rates):
+        samples *= rate
+        widest = max(widest, (vocoder.upsample_initial_channel // 2 ** (i + 1)) * samples)
+    return _DECODER_WORKING_SET * widest * nbytes, None
+
+
+def estimate_memory_profile(model: torch.nn.Module) -> MemoryProfile:
+    """
+    Estimate the per-sequence memory costs of a `Qwen3TTSForConditionalGeneration` from its configs.
+
+    Args:
+        model (Qwen3TTSForConditionalGeneration):
+            The model; its attached speech tokenizer (if any) supplies the decoder cost.
+
+    Returns:
+        MemoryProfile
+    """
+    talker = model.config.talker_config
+    predictor = talker.code_predictor_config
+    nbytes = _dtype_bytes(model.talker)
+
+    kv = 2 * talker.num_hidden_layers * talker.num_key_value_heads * _head_dim(talker)
+    kept_hidden = (talker.num_hidden_layers + 1) * talker.hidden_size
+    talker_bytes_per_token = (kv + kept_hidden) * nbytes
+
+    predictor_kv = 2 * predictor.num_hidden_layers * predictor.num_key_value_heads * _head_dim(predictor)
+    predictor_hidden = (predictor.num_hidden_layers + 1) * predictor.hidden_size
+    code_predictor_bytes = (talker.num_code_groups + 1) * (predictor_kv + predictor_hidden) * nbytes
+
+    sampling_bytes = _LOGITS_COPIES * 4 * (talker.vocab_size + predictor.vocab_size)
+    prefill_bytes_per_token = (2 * talker.intermediate_size + 4 * talker.hidden_size) * nbytes
+    prefill_attention_bytes = talker.num_attention_heads * nbytes
+
+    decoder_bytes_per_frame, window = 0, None
+    speech_tokenizer = getattr(model, "speech_tokenizer", None)
+    tokenizer_model = getattr(speech_tokenizer, "model", None)
+    if tokenizer_model is not None:
+        decoder_bytes_per_frame, window = _decoder_profile(tokenizer_model)
+
+    return MemoryProfile(
+        talker_bytes_per_token=talker_bytes_per_token,
+        code_predictor_bytes=code_predictor_bytes,
+        sampling_bytes=sampling_bytes,
+        prefill_bytes_per_token=prefill_bytes_per_token,
+        prefill_attention_bytes=prefill_attention_bytes,
+        decoder_bytes_per_frame=decoder_bytes_per_frame,
+        decoder_window_frames=window,
+    )
+
+
+def available_memory_bytes(device: Optional[torch.device] = None) -> Optional[int]:
+    """
+    Memory currently available for activations on `device`: free device memory plus memory the CUDA caching
+    allocator holds but does not use, or available host RAM on CPU. `None` if it cannot be determined.
+    """
+    device = torch.device(device) if device is not None else torch.device("cpu")
+    if device.type == "cuda":
+        try:
+            free, _ = torch.cuda.mem_get_info(device)
+            return int(free + torch.cuda.memory_reserved(device) - torch.cuda.memory_allocated(device))
+        except Exception:
+            return None
+    if device.type != "cpu":
+        return None
+    try:
+        import psutil
+
+        return int(psutil.virtual_memory().available)
+    except Exception:
+        pass
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def plan_batch(
+    profile: MemoryProfile,
+    num_items: int,
+    prompt_tokens: int,
+    max_new_tokens: int,
+    budget_bytes: Optional[int],
+) -> BatchPlan:
+    """
+    Pick the largest batch size (at most `num_items`) whose estimated peak fits `budget_bytes`. If not even a
+    single sequence fits, the batch size is 1 and `max_new_tokens` is lowered to the largest value that fits
+    (never below 1).
+
+    Args:
+        profile (MemoryProfile):
+            From `estimate_memory_profile`.
+        num_items (int):
+            Sequences waiting to be generated.
+        prompt_tokens (int):
+            Longest prompt (text, instruct and reference tokens / frames) among them.
+        max_new_tokens (int):
+            Requested frame limit per sequence.
+        budget_bytes (Optional[int]):
+            Bytes available for activations. `None` disables planning (one batch of `num_items`).
+
+    Returns:
+        BatchPlan
+    """
+    num_items, max_new_tokens = max(int(num_items), 1), max(int(max_new_tokens), 1)
+    if budget_bytes is None:
+        return BatchPlan(num_items, max_new_tokens, profile.peak_bytes(num_items, prompt_tokens, max_new_tokens))
+
+    def fits(batch_size, frames):
+        return profile.peak_bytes(batch_size, prompt_tokens, frames) <= budget_bytes
+
+    # the peak grows monotonically in both arguments, so bisect on each
+    if fits(1, max_new_tokens):
+        lo, hi = 1, num_items
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            lo, hi = (mid, hi) if fits(mid, max_new_tokens) else (lo, mid - 1)
+        batch_size = lo
+    else:
+        batch_size, lo, hi = 1, 1, max_new_tokens
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            lo, hi = (mid, hi) if fits(1, mid) else (lo, mid - 1)
+        max_new_tokens = lo
+    return BatchPlan(
+        batch_size=batch_size,
+        max_new_tokens=max_new_tokens,
+        peak_bytes=profile.peak_bytes(batch_size, prompt_tokens, max_new_tokens),
+        budget_bytes=budget_bytes,
+    )
+
+
+__all__ = [
+    "BatchPlan",
+    "MemoryProfile",
+    "available_memory_bytes",
+    "estimate_memory_profile",
+    "plan_batch",
+]
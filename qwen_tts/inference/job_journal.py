@@ -0,0 +1,181 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Crash-safe journal of finished blocks, so an interrupted batch job resumes where it stopped.
+
+Every block a job finishes is recorded (in SQLite, committed right away) with its generation parameters, seed and
+audio file. When a job over the same scope (an output folder, a script) runs again, blocks whose parameters match
+an open journal entry, and whose audio file still exists, are restored instead of regenerated:
+
+    run = JobJournal(path).begin(output_dir)
+    for params in blocks:
+        entry = run.lookup(params, seed)          # seed None: any recorded seed is fine
+        if entry is None:
+            ... generate with a seed, write the audio ...
+            run.record(params, seed, audio_path, sample_rate)
+    run.finish()                                  # only when the job ran to completion
+
+`finish` closes the scope's entries, so the next job over the same scope generates from scratch; a job that
+crashed, was cancelled or aborted leaves them open for the next run to pick up.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    scope TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    run INTEGER NOT NULL REFERENCES runs(id),
+    scope TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    seed INTEGER,
+    audio_file TEXT NOT NULL,
+    sample_rate INTEGER NOT NULL,
+    created REAL NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS blocks_open ON blocks (scope, fingerprint, closed);
+"""
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """Stable hash of a block's generation parameters (JSON-serializable values)."""
+    blob = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class JournalEntry:
+    """A finished block: its parameters, the seed it was generated with and where its audio is."""
+
+    id: int
+    params: Dict[str, Any]
+    seed: Optional[int]
+    audio_file: str
+    sample_rate: int
+
+
+class JobJournal:
+    """
+    SQLite journal shared by all jobs of the app. Safe to use from any thread.
+
+    Args:
+        path (str):
+            Database file; created on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL + NORMAL: a power cut can drop the last few records, never corrupt the file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def begin(self, scope: str) -> "JournalRun":
+        """Start a job over `scope` (e.g. the output folder), resuming whatever earlier jobs left open there."""
+        with self._lock:
+            cur = self._db.execute("INSERT INTO runs (scope, started) VALUES (?, ?)", (scope, time.time()))
+        return JournalRun(self, scope, cur.lastrowid)
+
+    def open_blocks(self, scope: str) -> int:
+        """Number of blocks waiting to be resumed in `scope`."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM blocks WHERE scope = ? AND closed = 0", (scope,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JournalRun:
+    """One job's view of the journal; see `JobJournal.begin`."""
+
+    def __init__(self, journal: JobJournal, scope: str, run_id: int):
+        self.journal = journal
+        self.scope = scope
+        self.run_id = run_id
+        self.restored = 0
+        # entries handed out or written by this run, so identical blocks of one job never share an entry
+        self._claimed: Set[int] = set()
+
+    def lookup(self, params: Dict[str, Any], seed: Optional[int] = None) -> Optional[JournalEntry]:
+        """
+        An open entry for a block with `params` whose audio still exists, or `None`. With a `seed`, only an
+        entry generated with that seed matches.
+        """
+        query = "SELECT id, params, seed, audio_file, sample_rate FROM blocks " \
+                "WHERE scope = ? AND fingerprint = ? AND closed = 0"
+        args = [self.scope, params_fingerprint(params)]
+        if seed is not None:
+            query += " AND seed = ?"
+            args.append(int(seed))
+        with self.journal._lock:
+            rows = self.journal._db.execute(query + " ORDER BY id DESC", args).fetchall()
+        for row_id, row_params, row_seed, audio_file, sample_rate in rows:
+            if row_id in self._claimed or not os.path.exists(audio_file):
+                continue
+            self._claimed.add(row_id)
+            self.restored += 1
+            return JournalEntry(row_id, json.loads(row_params), row_seed, audio_file, sample_rate)
+        return None
+
+    def record(self, params: Dict[str, Any], seed: Optional[int], audio_file: str, sample_rate: int) -> None:
+        """Record a finished block. Call after its audio file is written."""
+        with self.journal._lock:
+            cur = self.journal._db.execute(
+                "INSERT INTO blocks (run, scope, fingerprint, params, seed, audio_file, sample_rate, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_id, self.scope, params_fingerprint(params),
+                    json.dumps(params, sort_keys=True, ensure_ascii=False, default=str),
+                    None if seed is None else int(seed), os.path.abspath(audio_file), int(sample_rate), time.time(),
+                ),
+            )
+        self._claimed.add(cur.lastrowid)
+
+    def finish(self) -> None:
+        """The job ran to completion: close the scope's open entries."""
+        with self.journal._lock:
+            db = self.journal._db
+            db.execute("BEGIN")
+            db.execute("UPDATE blocks SET closed = 1 WHERE scope = ? AND closed = 0", (self.scope,))
+            db.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), self.run_id))
+            db.execute("COMMIT")
+
+
+__all__ = [
+    "JobJournal",
+    "JournalEntry",
+    "JournalRun",
+    "params_fingerprint",
+]
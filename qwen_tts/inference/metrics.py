@@ -0,0 +1,290 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Per-stage timing of `Qwen3TTSModel.generate_*` calls.
+
+While metrics are collected, a `StageTimer` is active in the current context. Instrumented code marks its stages
+with `timed(name)`, or `begin(name)` / `end()` where a context manager does not fit (the talker forward). Stage
+times are exclusive: a stage nested inside another is subtracted from the outer one. On CUDA the timer synchronizes
+the device at every stage boundary so that asynchronous kernels are charged to the stage that launched them. That
+costs some throughput, so timing is off unless a caller asks for it.
+"""
+import contextvars
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import torch
+
+STAGES = ("tokenize", "prompt_build", "prefill", "talker", "code_predictor", "decode", "host_copy")
+
+_active_timer: contextvars.ContextVar = contextvars.ContextVar("qwen_tts_stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Accumulates exclusive wall time per stage, plus counters such as generated frames.
+    """
+
+    def __init__(self, device: Optional[torch.device] = None):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.frames = 0
+        self._stack: List[list] = []
+        self._sync_device = device if device is not None and torch.device(device).type == "cuda" else None
+
+    def _now(self) -> float:
+        if self._sync_device is not None:
+            torch.cuda.synchronize(self._sync_device)
+        return time.perf_counter()
+
+    def begin(self, name: str) -> None:
+        now = self._now()
+        if self._stack:
+            outer = self._stack[-1]
+            self.seconds[outer[0]] += now - outer[1]
+        self._stack.append([name, now])
+
+    def end(self) -> None:
+        now = self._now()
+        name, start = self._stack.pop()
+        self.seconds[name] += now - start
+        self.calls[name] += 1
+        if self._stack:
+            self._stack[-1][1] = now
+
+    @contextmanager
+    def stage(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    """
+    The `StageTimer` collecting metrics for the running call, or `None` when metrics are off.
+    """
+    return _active_timer.get()
+
+
+def timed(name: str):
+    """
+    Context manager charging its body to stage `name` of the active timer (a no-op when metrics are off).
+    """
+    timer = _active_timer.get()
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+@contextmanager
+def stage_timing(device: Optional[torch.device] = None):
+    """
+    Activate a fresh `StageTimer` for the block and yield it, e.g. to time a direct `model.generate(...)` call.
+    """
+    timer = StageTimer(device)
+    token = _active_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _active_timer.reset(token)
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return int(getattr(info, "peak_wset", 0) or info.rss)
+    except Exception:
+        pass
+    try:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return None
+
+
+@dataclass
+class GenerationMetrics:
+    """
+    Timing and throughput of one `generate_*` call. Times are in seconds.
+
+    `talker_s` and `code_predictor_s` cover all decoding steps (`decode_steps` of them), excluding `prefill_s`.
+    Time not attributed to any stage (argument handling, post-processing) is reported as `other_s`.
+    `peak_device_memory_bytes` is the CUDA allocator peak during the call. `peak_rss_bytes` is the process peak
+    resident set size, which is a lifetime value on Linux and macOS.
+    """
+
+    method: str
+    batch_size: int
+    device: str
+    total_s: float
+    tokenize_s: float = 0.0
+    prompt_build_s: float = 0.0
+    prefill_s: float = 0.0
+    talker_s: float = 0.0
+    code_predictor_s: float = 0.0
+    decode_s: float = 0.0
+    host_copy_s: float = 0.0
+    other_s: float = 0.0
+    decode_steps: int = 0
+    frames: int = 0
+    audio_seconds: float = 0.0
+    peak_device_memory_bytes: Optional[int] = None
+    peak_rss_bytes: Optional[int] = None
+
+    @property
+    def rtf(self) -> Optional[float]:
+        """Real-time factor: wall time per second of generated audio (lower is faster)."""
+        return self.total_s / self.audio_seconds if self.audio_seconds > 0 else None
+
+    @property
+    def frames_per_second(self) -> Optional[float]:
+        return self.frames / self.total_s if self.total_s > 0 else None
+
+    @property
+    def talker_ms_per_step(self) -> Optional[float]:
+        return 1000.0 * self.talker_s / self.decode_steps if self.decode_steps else None
+
+    @property
+    def code_predictor_ms_per_step(self) -> Optional[float]:
+        return 1000.0 * self.code_predictor_s / self.decode_steps if self.decode_steps else None
+
+    def to_dict(self) -> Dict:
+        out = asdict(self)
+        out.update(
+            rtf=self.rtf,
+            frames_per_second=self.frames_per_second,
+            talker_ms_per_step=self.talker_ms_per_step,
+            code_predictor_ms_per_step=self.code_predictor_ms_per_step,
+        )
+        return out
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{s} {getattr(self, s + '_s') * 1000:.0f}ms" for s in STAGES if getattr(self, s + "_s") > 0)
+        rtf = f"{self.rtf:.3f}" if self.rtf is not None else "n/a"
+        return (
+            f"{self.method} x{self.batch_size}: {self.total_s:.2f}s for {self.audio_seconds:.2f}s audio "
+            f"(RTF {rtf}, {self.frames} frames / {self.decode_steps} steps) [{stages}]"
+        )
+
+
+class MetricsAggregator:
+    """
+    Metrics hook that accumulates records, e.g. `model.add_metrics_hook(MetricsAggregator())`.
+    """
+
+    def __init__(self):
+        self.records: List[GenerationMetrics] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: GenerationMetrics) -> None:
+        with self._lock:
+            self.records.append(metrics)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> Dict:
+        """
+        Totals over all records: calls, per-stage seconds, frames, audio seconds and the overall RTF.
+        """
+        with self._lock:
+            records = list(self.records)
+        totals = {f"{s}_s": sum(getattr(r, f"{s}_s") for r in records) for s in STAGES + ("other", "total")}
+        audio = sum(r.audio_seconds for r in records)
+        steps = sum(r.decode_steps for r in records)
+        return dict(
+            calls=len(records),
+            frames=sum(r.frames for r in records),
+            decode_steps=steps,
+            audio_seconds=audio,
+            rtf=totals["total_s"] / audio if audio > 0 else None,
+            talker_ms_per_step=1000.0 * totals["talker_s"] / steps if steps else None,
+            code_predictor_ms_per_step=1000.0 * totals["code_predictor_s"] / steps if steps else None,
+            peak_device_memory_bytes=max((r.peak_device_memory_bytes or 0 for r in records), default=0) or None,
+            **totals,
+        )
+
+
+def with_generation_metrics(method: str):
+    """
+    Decorator for `Qwen3TTSModel.generate_*`: adds a `return_metrics` keyword and, when it is set or metrics
+    hooks are registered, times the call and builds a `GenerationMetrics` record. The record is passed to
+    every hook and returned as a third element when `return_metrics=True`.
+    """
+
+    def decorator(fn: Callable):
+        @functools.wraps(fn)
+        def wrapper(self, *args, return_metrics: bool = False, **kwargs):
+            hooks = list(getattr(self, "_metrics_hooks", ()))
+            if not return_metrics and not hooks:
+                return fn(self, *args, **kwargs)
+
+            device = torch.device(self.device) if self.device is not None else torch.device("cpu")
+            on_cuda = device.type == "cuda"
+            if on_cuda:
+                torch.cuda.reset_peak_memory_stats(device)
+            with stage_timing(device) as timer:
+                start = timer._now()
+                wavs, sr = fn(self, *args, **kwargs)
+                total = timer._now() - start
+
+            stage_s = {f"{s}_s": timer.seconds.get(s, 0.0) for s in STAGES}
+            metrics = GenerationMetrics(
+                method=method,
+                batch_size=len(wavs),
+                device=str(device),
+                total_s=total,
+                other_s=max(total - sum(stage_s.values()), 0.0),
+                decode_steps=timer.calls.get("code_predictor", 0),
+                frames=timer.frames,
+                audio_seconds=sum(int(w.shape[0]) for w in wavs) / float(sr),
+                peak_device_memory_bytes=int(torch.cuda.max_memory_allocated(device)) if on_cuda else None,
+                peak_rss_bytes=_peak_rss_bytes(),
+                **stage_s,
+            )
+            for hook in hooks:
+                try:
+                    hook(metrics)
+                except Exception as e:
+                    print(f"[Qwen3TTSModel] metrics hook {hook!r} failed: {e}")
+            return (wavs, sr, metrics) if return_metrics else (wavs, sr)
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = [
+    "GenerationMetrics",
+    "MetricsAggregator",
+    "StageTimer",
+    "current_stage_timer",
+    "stage_timing",
+    "timed",
+    "with_generation_metrics",
+    "STAGES",
+]
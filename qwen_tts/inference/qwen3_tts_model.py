@@ -15,19 +15,34 @@
 # limitations under the License.
 import base64
 import io
+import os
 import random
+import re
 import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
-import librosa
 import numpy as np
 import soundfile as sf
 import torch
 from transformers import AutoConfig, AutoModel, AutoProcessor
 
 from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+from .audio_io import load_audio_file, map_concurrently, resample, to_mono_float32
+from .batch_planner import BatchPlan, available_memory_bytes, estimate_memory_profile, plan_batch
+from .metrics import GenerationMetrics, timed, with_generation_metrics
+from .render_cache import RenderCache, render_cache_key
+from .voice_prompt_cache import (
+    VoicePromptCache,
+    checkpoint_fingerprint,
+    hash_audio_array,
+    hash_audio_bytes,
+    hash_audio_file,
+    voice_prompt_cache_key,
+)
 
 AudioLike = Union[
     str,                     # wav path, URL, base64
@@ -37,6 +52,22 @@ AudioLike = Union[
 
 MaybeList = Union[Any, List[Any]]
 
+# sentence ends (incl. CJK), then clause punctuation, then whitespace; the delimiter stays with the left piece
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;。！？；…])\s+|(?<=[。！？；…])")
+_CLAUSE_SPLIT_RE = re.compile(r"(?<=[,:，、：—])\s*")
+_WORD_SPLIT_RE = re.compile(r"\s+")
+
+# `model.generate` inputs holding one entry per batch item (a voice clone prompt dict holds per-item lists)
+_PER_ITEM_INPUTS = ("instruct_ids", "ref_ids", "voice_clone_prompt", "languages", "speakers")
+
+
+def _join_pieces(pieces: List[str]) -> str:
+    out = pieces[0]
+    for p in pieces[1:]:
+        # CJK text is not space-separated
+        out += p if (out[-1:] and ord(out[-1]) > 0x2E7F) or ord(p[0]) > 0x2E7F else " " + p
+    return out
+
 
 @dataclass
 class VoiceClonePromptItem:
@@ -66,12 +97,26 @@ class Qwen3TTSModel:
       - This wrapper expects the underlying model class to be `Qwen3TTSForConditionalGeneration`
       - Language / speaker validation is done via model methods:
           model.get_supported_languages(), model.get_supported_speakers()
+      - Batched calls are split into sub-batches sized to the free memory (see `set_memory_budget`), so a long
+        list of texts does not run out of memory; results come back in input order either way. Seeded calls are
+        split only by a fixed budget, so a seed reproduces the same audio whatever memory is free.
+      - With a `RenderCache` attached (see `set_render_cache`), seeded calls whose inputs were generated before
+        return the stored audio instead of running the model.
     """
 
     def __init__(self, model: Qwen3TTSForConditionalGeneration, processor, generate_defaults: Optional[Dict[str, Any]] = None):
         self.model = model
         self.processor = processor
         self.generate_defaults = generate_defaults or {}
+        self.voice_prompt_cache: Optional[VoicePromptCache] = None
+        self.render_cache: Optional[RenderCache] = None
+        self.text_ids_memo_size = 256
+        self._text_ids_memo: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._checkpoint_id: Optional[str] = None
+        self._metrics_hooks: List[Callable[[GenerationMetrics], None]] = []
+        self.auto_batch = True
+        self.memory_budget_bytes: Optional[int] = None
+        self.memory_budget_fraction = 0.85
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -91,8 +136,10 @@ class Qwen3TTSModel:
 
         This method:
           1) Loads config via AutoConfig (so your side can register model_type -> config/model).
-          2) Loads the model via AutoModel.from_pretrained(...), forwarding `kwargs` unchanged.
-          3) Loads the processor via AutoProcessor.from_pretrained(model_path).
+          2) Loads the model via AutoModel.from_pretrained(...), forwarding `kwargs` unchanged. Local safetensors
+             checkpoints on a single device are meta-initialized and read from memory-mapped shards in parallel,
+             with the speech tokenizer loading concurrently (pass `fast_load=False` to use the regular loader).
+          3) Loads the processor via AutoProcessor.from_pretrained(model_path), concurrently with step 2.
           4) Loads optional `generate_config.json` from the model directory/repo snapshot if present.
 
         Args:
@@ -110,14 +157,18 @@ class Qwen3TTSModel:
         AutoModel.register(Qwen3TTSConfig, Qwen3TTSForConditionalGeneration)
         AutoProcessor.register(Qwen3TTSConfig, Qwen3TTSProcessor)
 
-        model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
+        # the processor (text tokenizer) is independent of the weights, so it is built while the model loads
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwen-tts-processor") as pool:
+            processor_future = pool.submit(
+                AutoProcessor.from_pretrained, pretrained_model_name_or_path, fix_mistral_regex=True,
+            )
+            model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
+            processor = processor_future.result()
         if not isinstance(model, Qwen3TTSForConditionalGeneration):
             raise TypeError(
                 f"AutoModel returned {type(model)}, expected Qwen3TTSForConditionalGeneration. "
             )
 
-        processor = AutoProcessor.from_pretrained(pretrained_model_name_or_path, fix_mistral_regex=True,)
-
         generate_defaults = model.generate_config
         return cls(model=model, processor=processor, generate_defaults=generate_defaults)
 
@@ -216,12 +267,9 @@ class Qwen3TTSModel:
             with io.BytesIO(wav_bytes) as f:
                 audio, sr = sf.read(f, dtype="float32", always_2d=False)
         else:
-            audio, sr = librosa.load(x, sr=None, mono=True)
-
-        if audio.ndim > 1:
-            audio = np.mean(audio, axis=-1)
+            return load_audio_file(x)
 
-        return audio.astype(np.float32), int(sr)
+        return to_mono_float32(audio), int(sr)
 
     def _normalize_audio_inputs(self, audios: Union[AudioLike, List[AudioLike]]) -> List[Tuple[np.ndarray, int]]:
         """
@@ -248,21 +296,19 @@ class Qwen3TTSModel:
         else:
             items = [audios]
 
-        out: List[Tuple[np.ndarray, int]] = []
         for a in items:
-            if isinstance(a, str):
-                out.append(self._load_audio_to_np(a))
-            elif isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray):
-                out.append((a[0].astype(np.float32), int(a[1])))
-            elif isinstance(a, np.ndarray):
+            if isinstance(a, np.ndarray):
                 raise ValueError("For numpy waveform input, pass a tuple (audio, sr).")
-            else:
+            if not isinstance(a, str) and not (isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray)):
                 raise TypeError(f"Unsupported audio input type: {type(a)}")
-        for i, a in enumerate(out):
-            if a[0].ndim > 1:
-                a[0] = np.mean(a[0], axis=-1).astype(np.float32)
-                out[i] = (a[0], a[1])
-        return out
+
+        def load(a: AudioLike) -> Tuple[np.ndarray, int]:
+            if isinstance(a, str):
+                return self._load_audio_to_np(a)
+            return to_mono_float32(np.array(a[0], dtype=np.float32)), int(a[1])
+
+        # paths / URLs / base64 are decoded concurrently
+        return map_concurrently(load, items)
 
     def _ensure_list(self, x: MaybeList) -> List[Any]:
         return x if isinstance(x, list) else [x]
@@ -276,14 +322,71 @@ class Qwen3TTSModel:
     def _build_instruct_text(self, instruct: str) -> str:
         return f"<|im_start|>user\n{instruct}<|im_end|>\n"
 
+    def _tokenize_to_host(self, texts: List[str], memoize: Union[bool, List[bool]] = False) -> List[List[int]]:
+        """
+        Token ids of `texts` from a single processor call. Strings flagged by `memoize` are served from and added
+        to an LRU memo (meant for instruct / ref texts, which repeat across a scene).
+        """
+        memo_flags = memoize if isinstance(memoize, list) else [memoize] * len(texts)
+        ids: List[Optional[List[int]]] = [None] * len(texts)
+        todo: List[int] = []
+        for i, (text, memo) in enumerate(zip(texts, memo_flags)):
+            cached = self._text_ids_memo.get(text) if memo else None
+            if cached is None:
+                todo.append(i)
+            else:
+                self._text_ids_memo.move_to_end(text)
+                ids[i] = cached
+        if todo:
+            unique = list(dict.fromkeys(texts[i] for i in todo))
+            encoded = dict(zip(unique, self.processor(text=unique)["input_ids"]))
+            for i in todo:
+                ids[i] = encoded[texts[i]]
+                if memo_flags[i]:
+                    self._text_ids_memo[texts[i]] = ids[i]
+            while len(self._text_ids_memo) > self.text_ids_memo_size:
+                self._text_ids_memo.popitem(last=False)
+        return ids
+
+    def _ids_to_device(self, ids: List[List[int]]) -> List[torch.Tensor]:
+        """
+        Move a list of id sequences to the device in one transfer; returns `(1, len)` views of the same tensor.
+        """
+        if not ids:
+            return []
+        flat = torch.tensor([t for seq in ids for t in seq], dtype=torch.long)
+        if self.device is not None and torch.device(self.device).type == "cuda":
+            flat = flat.pin_memory().to(self.device, non_blocking=True)
+        else:
+            flat = flat.to(self.device)
+        return [chunk.unsqueeze(0) for chunk in torch.split(flat, [len(seq) for seq in ids])]
+
     def _tokenize_texts(self, texts: List[str]) -> List[torch.Tensor]:
-        input_ids = []
-        for text in texts:
-            input = self.processor(text=text, return_tensors="pt", padding=True)
-            input_id = input["input_ids"].to(self.device)
-            input_id = input_id.unsqueeze(0) if input_id.dim() == 1 else input_id
-            input_ids.append(input_id)
-        return input_ids
+        return self._ids_to_device(self._tokenize_to_host(texts))
+
+    def _tokenize_with_conditioning(
+        self,
+        texts: List[str],
+        cond_texts: List[Optional[str]],
+    ) -> Tuple[List[torch.Tensor], List[Optional[torch.Tensor]]]:
+        """
+        Tokenize the assistant texts and their (already templated) instruct / ref texts together, with a single
+        host-to-device transfer and at most one processor call. Conditioning texts are memoized; `None` entries stay `None`.
+
+        Returns:
+            Tuple of `input_ids` (one `(1, len)` tensor per text) and conditioning ids (`(1, len)` or `None`).
+        """
+        present = [i for i, c in enumerate(cond_texts) if c is not None]
+        host_ids = self._tokenize_to_host(
+            texts + [cond_texts[i] for i in present],
+            memoize=[False] * len(texts) + [True] * len(present),
+        )
+        device_ids = self._ids_to_device(host_ids)
+
+        cond_ids: List[Optional[torch.Tensor]] = [None] * len(cond_texts)
+        for i, ids in zip(present, device_ids[len(texts):]):
+            cond_ids[i] = ids
+        return device_ids[:len(texts)], cond_ids
 
     def _merge_generate_kwargs(
         self,
@@ -359,6 +462,7 @@ class Qwen3TTSModel:
         ref_audio: Union[AudioLike, List[AudioLike]],
         ref_text: Optional[Union[str, List[Optional[str]]]] = None,
         x_vector_only_mode: Union[bool, List[bool]] = False,
+        use_cache: bool = True,
     ) -> List[VoiceClonePromptItem]:
         """
         Build voice-clone prompt items from reference audio (and optionally reference text) using Base model.
@@ -389,6 +493,9 @@ class Qwen3TTSModel:
                 Reference transcript(s). Required when x_vector_only_mode=False (ICL mode).
             x_vector_only_mode:
                 Whether to use speaker embedding only. If False, ICL mode will be used.
+            use_cache:
+                Look items up in (and store them to) `self.voice_prompt_cache` when one is attached, keyed by
+                the audio content, ref_text, mode and engine checkpoint. URL inputs are never cached.
 
         Returns:
             List[VoiceClonePromptItem]:
@@ -415,7 +522,42 @@ class Qwen3TTSModel:
             raise ValueError(
                 f"Batch size mismatch: ref_audio={len(ref_audio_list)}, ref_text={len(ref_text_list)}, x_vector_only_mode={len(xvec_list)}"
             )
+        for i, (rtext, xvec_only) in enumerate(zip(ref_text_list, xvec_list)):
+            if not xvec_only and (rtext is None or rtext == ""):
+                raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
+
+        cache = self.voice_prompt_cache if use_cache else None
+        keys: List[Optional[str]] = [None] * len(ref_audio_list)
+        sources: List[Optional[str]] = [None] * len(ref_audio_list)
+        items: List[Optional[VoiceClonePromptItem]] = [None] * len(ref_audio_list)
+        if cache is not None:
+            checkpoint_id = self._voice_prompt_checkpoint_id()
+            for i, (a, rtext, xvec_only) in enumerate(zip(ref_audio_list, ref_text_list, xvec_list)):
+                digest, sources[i] = self._audio_digest(a)
+                if digest is None:
+                    continue
+                keys[i] = voice_prompt_cache_key(digest, rtext, bool(xvec_only), checkpoint_id)
+                items[i] = cache.get(keys[i], device=self.device)
+
+        missing = [i for i, it in enumerate(items) if it is None]
+        if missing:
+            built = self._build_voice_clone_prompt_items(
+                [ref_audio_list[i] for i in missing],
+                [ref_text_list[i] for i in missing],
+                [xvec_list[i] for i in missing],
+            )
+            for i, item in zip(missing, built):
+                items[i] = item
+                if cache is not None and keys[i] is not None:
+                    cache.put(keys[i], item, source=sources[i])
+        return items
 
+    def _build_voice_clone_prompt_items(
+        self,
+        ref_audio_list: List[AudioLike],
+        ref_text_list: List[Optional[str]],
+        xvec_list: List[bool],
+    ) -> List[VoiceClonePromptItem]:
         normalized = self._normalize_audio_inputs(ref_audio_list)
 
         ref_wavs_for_code: List[np.ndarray] = []
@@ -433,16 +575,8 @@ class Qwen3TTSModel:
                 ref_codes.append(self.model.speech_tokenizer.encode(wav, sr=sr).audio_codes[0])
 
         items: List[VoiceClonePromptItem] = []
-        for i, ((wav, sr), code, rtext, xvec_only) in enumerate(zip(normalized, ref_codes, ref_text_list, xvec_list)):
-            if not xvec_only:
-                if rtext is None or rtext == "":
-                    raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
-
-            wav_resample = wav
-            if sr != self.model.speaker_encoder_sample_rate:
-                wav_resample = librosa.resample(y=wav_resample.astype(np.float32), 
-                                           orig_sr=int(sr), 
-                                           target_sr=self.model.speaker_encoder_sample_rate)
+        for (wav, sr), code, rtext, xvec_only in zip(normalized, ref_codes, ref_text_list, xvec_list):
+            wav_resample = resample(wav, int(sr), self.model.speaker_encoder_sample_rate)
 
             spk_emb = self.model.extract_speaker_embedding(audio=wav_resample,
                                                            sr=self.model.speaker_encoder_sample_rate)
@@ -458,6 +592,57 @@ class Qwen3TTSModel:
             )
         return items
 
+    def set_voice_prompt_cache(self, cache: Optional[VoicePromptCache]) -> None:
+        """
+        Attach a `VoicePromptCache` used by `create_voice_clone_prompt` (or detach it with `None`).
+
+        The same cache instance can be shared by several engines; keys include the checkpoint fingerprint.
+        """
+        self.voice_prompt_cache = cache
+
+    def set_render_cache(self, cache: Optional[RenderCache]) -> None:
+        """
+        Attach a `RenderCache` consulted by seeded `generate_*` calls (or detach it with `None`).
+
+        The same cache instance can be shared by several engines; keys include the checkpoint fingerprint, dtype,
+        device type and attention implementation.
+        """
+        self.render_cache = cache
+
+    def _render_cache_key(self, method: str, seed: Optional[int], inputs: Dict[str, Any]) -> Optional[str]:
+        # unseeded calls are random by design, never cache them
+        if self.render_cache is None or seed is None:
+            return None
+        engine_id = "|".join([
+            self._voice_prompt_checkpoint_id(),
+            str(self.model.dtype),
+            torch.device(self.device).type,
+            str(getattr(self.model.config, "_attn_implementation", None)),
+        ])
+        return render_cache_key(engine_id, method, dict(inputs, seed=int(seed)))
+
+    def _voice_prompt_checkpoint_id(self) -> str:
+        if self._checkpoint_id is None:
+            name_or_path = getattr(self.model, "name_or_path", "") or getattr(self.model.config, "_name_or_path", "")
+            self._checkpoint_id = checkpoint_fingerprint(str(name_or_path))
+        return self._checkpoint_id
+
+    def _audio_digest(self, a: AudioLike) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Content digest of one reference audio input and, for local files, its path.
+
+        URLs are not cached (their content may change) and yield `(None, None)`.
+        """
+        if isinstance(a, str):
+            if self._is_url(a):
+                return None, None
+            if self._is_probably_base64(a):
+                return hash_audio_bytes(self._decode_base64_to_wav_bytes(a)), None
+            return hash_audio_file(a), os.path.abspath(a)
+        if isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray):
+            return hash_audio_array(a[0], int(a[1])), None
+        return None, None
+
     def _prompt_items_to_voice_clone_prompt(self, items: List[VoiceClonePromptItem]) -> Dict[str, Any]:
         return dict(
             ref_code=[it.ref_code for it in items],
@@ -466,8 +651,124 @@ class Qwen3TTSModel:
             icl_mode=[it.icl_mode for it in items],
         )
 
+    def add_metrics_hook(self, hook: Callable[[GenerationMetrics], None]) -> None:
+        """
+        Register `hook(metrics)` to receive a `GenerationMetrics` record after every `generate_*` call.
+
+        While any hook is registered every call is timed per stage, which synchronizes CUDA at stage boundaries.
+        Registering the same callable twice has no effect; see `MetricsAggregator` for a ready-made hook.
+        """
+        if hook not in self._metrics_hooks:
+            self._metrics_hooks.append(hook)
+
+    def remove_metrics_hook(self, hook: Callable[[GenerationMetrics], None]) -> None:
+        if hook in self._metrics_hooks:
+            self._metrics_hooks.remove(hook)
+
+    def set_memory_budget(
+        self, budget_bytes: Optional[int] = None, fraction: float = 0.85, enabled: bool = True
+    ) -> None:
+        """
+        Configure automatic batch sizing of the batched `generate_*` calls (on by default).
+
+        Args:
+            budget_bytes (Optional[int]):
+                Bytes available for activations, weights excluded. `None` measures the free device memory (host
+                RAM on CPU) before every call and plans for `fraction` of it. Seeded calls are only split by a fixed
+                `budget_bytes`: items of a batch share the sampler's random stream, so a split that followed the
+                free memory would make the same seed give different audio from call to call.
+            fraction (float):
+                Share of the measured free memory to plan for.
+            enabled (bool):
+                `False` runs every call as one batch with the requested `max_new_tokens`.
+        """
+        self.auto_batch = bool(enabled)
+        self.memory_budget_bytes = budget_bytes
+        self.memory_budget_fraction = float(fraction)
+
+    def plan_batch(self, num_items: int, prompt_tokens: int, max_new_tokens: int, seeded: bool = False) -> BatchPlan:
+        """
+        Largest batch size (and, if a single sequence does not fit, the largest `max_new_tokens`) whose estimated
+        peak memory fits the budget configured with `set_memory_budget`.
+
+        Args:
+            num_items (int):
+                Sequences to generate.
+            prompt_tokens (int):
+                Longest prompt among them, in tokens (text, instruct and reference text) plus reference code frames.
+            max_new_tokens (int):
+                Requested frame limit.
+            seeded (bool):
+                The call has a seed: plan against a fixed `budget_bytes` only, never the measured free memory.
+
+        Returns:
+            BatchPlan
+        """
+        budget = None
+        if self.auto_batch:
+            budget = self.memory_budget_bytes
+            if budget is None and not seeded:
+                free = available_memory_bytes(self.device)
+                budget = int(free * self.memory_budget_fraction) if free is not None else None
+        return plan_batch(estimate_memory_profile(self.model), num_items, prompt_tokens, max_new_tokens, budget)
+
+    def _generate_codes(
+        self, input_ids: List[torch.Tensor], seed: Optional[int] = None, **generate_inputs
+    ) -> Tuple[List[torch.Tensor], int]:
+        """
+        `self.model.generate` over memory-planned sub-batches; per-item inputs are sliced alongside `input_ids`.
+        With a `seed`, the split does not depend on the free memory (see `plan_batch`).
+
+        Returns:
+            Tuple[List[torch.Tensor], int]:
+                (talker codes per item, planned batch size)
+        """
+        n = len(input_ids)
+        clone_prompt = generate_inputs.get("voice_clone_prompt") or {}
+        prompt_tokens = 0
+        for i in range(n):
+            length = int(input_ids[i].shape[-1])
+            for ids in (generate_inputs.get("instruct_ids"), generate_inputs.get("ref_ids")):
+                if ids is not None and ids[i] is not None:
+                    length += int(ids[i].shape[-1])
+            ref_code = clone_prompt.get("ref_code")
+            if ref_code is not None and ref_code[i] is not None:
+                length += int(ref_code[i].shape[0])
+            prompt_tokens = max(prompt_tokens, length)
+
+        requested = int(generate_inputs["max_new_tokens"])
+        plan = self.plan_batch(n, prompt_tokens, requested, seeded=seed is not None)
+        if plan.max_new_tokens < requested:
+            print(
+                f"[Qwen3TTSModel] max_new_tokens={requested} does not fit the memory budget "
+                f"({plan.budget_bytes / 2**30:.2f} GiB); generating at most {plan.max_new_tokens} frames."
+            )
+            generate_inputs["max_new_tokens"] = plan.max_new_tokens
+
+        def take(value, sl):
+            if isinstance(value, dict):
+                return {k: take(v, sl) for k, v in value.items()}
+            return value[sl] if isinstance(value, list) else value
+
+        codes: List[torch.Tensor] = []
+        for start in range(0, n, plan.batch_size):
+            sl = slice(start, start + plan.batch_size)
+            part = {k: take(v, sl) if k in _PER_ITEM_INPUTS else v for k, v in generate_inputs.items()}
+            part_codes, _ = self.model.generate(input_ids=input_ids[sl], **part)
+            codes.extend(part_codes)
+        return codes, plan.batch_size
+
+    def _decode_codes(self, codes: List[torch.Tensor], batch_size: int) -> Tuple[List[np.ndarray], int]:
+        wavs: List[np.ndarray] = []
+        fs = int(self.model.speech_tokenizer.get_output_sample_rate())
+        for start in range(0, len(codes), max(batch_size, 1)):
+            part, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes[start:start + batch_size]])
+            wavs.extend(part)
+        return wavs, fs
+
     # voice clone model
     @torch.no_grad()
+    @with_generation_metrics("voice_clone")
     def generate_voice_clone(
         self,
         text: Union[str, List[str]],
@@ -535,13 +836,15 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            return_metrics:
+                If True, time the call per stage and also return a `GenerationMetrics` record (see `add_metrics_hook`).
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
 
         Returns:
             Tuple[List[np.ndarray], int]:
-                (wavs, sample_rate)
+                (wavs, sample_rate), or (wavs, sample_rate, metrics) with `return_metrics=True`.
 
         Raises:
             ValueError:
@@ -567,7 +870,8 @@ class Qwen3TTSModel:
         if voice_clone_prompt is None:
             if ref_audio is None:
                 raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
-            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
+            with timed("prompt_build"):
+                prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
             if len(prompt_items) == 1 and len(texts) > 1:
                 prompt_items = prompt_items * len(texts)
             if len(prompt_items) != len(texts):
@@ -587,18 +891,26 @@ class Qwen3TTSModel:
                 voice_clone_prompt_dict = voice_clone_prompt
                 ref_texts_for_ids = None
 
-        input_texts = [self._build_assistant_text(t) for t in texts]
-        input_ids = self._tokenize_texts(input_texts)
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+        cache_key = self._render_cache_key("voice_clone", seed, dict(
+            texts=texts, languages=languages, prompt=voice_clone_prompt_dict, ref_texts=ref_texts_for_ids,
+            non_streaming_mode=non_streaming_mode, generate=gen_kwargs,
+        ))
+        if cache_key is not None:
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
+        input_texts = [self._build_assistant_text(t) for t in texts]
         ref_ids = None
-        if ref_texts_for_ids is not None:
-            ref_ids = []
-            for i, rt in enumerate(ref_texts_for_ids):
-                if rt is None or rt == "":
-                    ref_ids.append(None)
-                else:
-                    ref_tok = self._tokenize_texts([self._build_ref_text(rt)])[0]
-                    ref_ids.append(ref_tok)
+        with timed("tokenize"):
+            if ref_texts_for_ids is None:
+                input_ids = self._tokenize_texts(input_texts)
+            else:
+                input_ids, ref_ids = self._tokenize_with_conditioning(
+                    input_texts,
+                    [None if rt is None or rt == "" else self._build_ref_text(rt) for rt in ref_texts_for_ids],
+                )
 
         if seed is not None:
             torch.manual_seed(seed)
@@ -607,16 +919,16 @@ class Qwen3TTSModel:
             random.seed(seed)
             np.random.seed(seed)
 
-        gen_kwargs = self._merge_generate_kwargs(**kwargs)
-
-        talker_codes_list, _ = self.model.generate(
-            input_ids=input_ids,
-            ref_ids=ref_ids,
-            voice_clone_prompt=voice_clone_prompt_dict,
-            languages=languages,
-            non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
-        )
+        with timed("prompt_build"):
+            talker_codes_list, batch_size = self._generate_codes(
+                input_ids=input_ids,
+                ref_ids=ref_ids,
+                voice_clone_prompt=voice_clone_prompt_dict,
+                languages=languages,
+                non_streaming_mode=non_streaming_mode,
+                seed=seed,
+                **gen_kwargs,
+            )
 
         codes_for_decode = []
         for i, codes in enumerate(talker_codes_list):
@@ -626,7 +938,8 @@ class Qwen3TTSModel:
             else:
                 codes_for_decode.append(codes)
 
-        wavs_all, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
+        with timed("decode"):
+            wavs_all, fs = self._decode_codes(codes_for_decode, batch_size)
 
         wavs_out: List[np.ndarray] = []
         for i, wav in enumerate(wavs_all):
@@ -639,10 +952,13 @@ class Qwen3TTSModel:
             else:
                 wavs_out.append(wav)
 
+        if cache_key is not None:
+            self.render_cache.put(cache_key, wavs_out, fs)
         return wavs_out, fs
 
     # voice design model
     @torch.no_grad()
+    @with_generation_metrics("voice_design")
     def generate_voice_design(
         self,
         text: Union[str, List[str]],
@@ -685,13 +1001,15 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            return_metrics:
+                If True, time the call per stage and also return a `GenerationMetrics` record (see `add_metrics_hook`).
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
 
         Returns:
             Tuple[List[np.ndarray], int]:
-                (wavs, sample_rate)
+                (wavs, sample_rate), or (wavs, sample_rate, metrics) with `return_metrics=True`.
         """
         if self.model.tts_model_type != "voice_design":
             raise ValueError(
@@ -715,14 +1033,21 @@ class Qwen3TTSModel:
 
         self._validate_languages(languages)
 
-        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
-
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+        cache_key = self._render_cache_key("voice_design", seed, dict(
+            texts=texts, languages=languages, instructs=instructs,
+            non_streaming_mode=non_streaming_mode, generate=gen_kwargs,
+        ))
+        if cache_key is not None:
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with timed("tokenize"):
+            input_ids, instruct_ids = self._tokenize_with_conditioning(
+                [self._build_assistant_text(t) for t in texts],
+                [None if ins is None or ins == "" else self._build_instruct_text(ins) for ins in instructs],
+            )
 
         if seed is not None:
             torch.manual_seed(seed)
@@ -731,21 +1056,25 @@ class Qwen3TTSModel:
             random.seed(seed)
             np.random.seed(seed)
 
-        gen_kwargs = self._merge_generate_kwargs(**kwargs)
-
-        talker_codes_list, _ = self.model.generate(
-            input_ids=input_ids,
-            instruct_ids=instruct_ids,
-            languages=languages,
-            non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
-        )
+        with timed("prompt_build"):
+            talker_codes_list, batch_size = self._generate_codes(
+                input_ids=input_ids,
+                instruct_ids=instruct_ids,
+                languages=languages,
+                non_streaming_mode=non_streaming_mode,
+                seed=seed,
+                **gen_kwargs,
+            )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
+        with timed("decode"):
+            wavs, fs = self._decode_codes(talker_codes_list, batch_size)
+        if cache_key is not None:
+            self.render_cache.put(cache_key, wavs, fs)
         return wavs, fs
 
     # custom voice model
     @torch.no_grad()
+    @with_generation_metrics("custom_voice")
     def generate_custom_voice(
         self,
         text: Union[str, List[str]],
@@ -791,13 +1120,15 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            return_metrics:
+                If True, time the call per stage and also return a `GenerationMetrics` record (see `add_metrics_hook`).
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
 
         Returns:
             Tuple[List[np.ndarray], int]:
-                (wavs, sample_rate)
+                (wavs, sample_rate), or (wavs, sample_rate, metrics) with `return_metrics=True`.
 
         Raises:
             ValueError:
@@ -833,14 +1164,21 @@ class Qwen3TTSModel:
         self._validate_languages(languages)
         self._validate_speakers(speakers)
 
-        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
-
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+        cache_key = self._render_cache_key("custom_voice", seed, dict(
+            texts=texts, languages=languages, speakers=speakers, instructs=instructs,
+            non_streaming_mode=non_streaming_mode, generate=gen_kwargs,
+        ))
+        if cache_key is not None:
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with timed("tokenize"):
+            input_ids, instruct_ids = self._tokenize_with_conditioning(
+                [self._build_assistant_text(t) for t in texts],
+                [None if ins is None or ins == "" else self._build_instruct_text(ins) for ins in instructs],
+            )
 
         if seed is not None:
             torch.manual_seed(seed)
@@ -849,21 +1187,229 @@ class Qwen3TTSModel:
             random.seed(seed)
             np.random.seed(seed)
 
-        gen_kwargs = self._merge_generate_kwargs(**kwargs)
-
-        talker_codes_list, _ = self.model.generate(
-            input_ids=input_ids,
-            instruct_ids=instruct_ids,
-            languages=languages,
-            speakers=speakers,
-            non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
-        )
+        with timed("prompt_build"):
+            talker_codes_list, batch_size = self._generate_codes(
+                input_ids=input_ids,
+                instruct_ids=instruct_ids,
+                languages=languages,
+                speakers=speakers,
+                non_streaming_mode=non_streaming_mode,
+                seed=seed,
+                **gen_kwargs,
+            )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
+        with timed("decode"):
+            wavs, fs = self._decode_codes(talker_codes_list, batch_size)
+        if cache_key is not None:
+            self.render_cache.put(cache_key, wavs, fs)
         return wavs, fs
 
 
+    # long-form synthesis
+    def _segment_text(self, text: str, max_segment_tokens: int) -> List[Tuple[str, int, bool]]:
+        """
+        Split `text` into segments of at most `max_segment_tokens` processor tokens.
+
+        Paragraphs (blank lines or `||` cues) are never merged; inside a paragraph whole sentences are packed
+        greedily. A sentence over budget is split at clause punctuation, then between words. Token counts come
+        from one batched processor call per split level.
+
+        Returns:
+            List[Tuple[str, int, bool]]: `(segment_text, num_tokens, ends_paragraph)` triples.
+        """
+        text = text.replace("||", "\n\n")
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+        segments: List[Tuple[str, int, bool]] = []
+        for paragraph in paragraphs:
+            sentences = [s for s in _SENTENCE_SPLIT_RE.split(re.sub(r"\s+", " ", paragraph)) if s.strip()]
+            pieces = self._fit_to_budget(sentences, max_segment_tokens, [_CLAUSE_SPLIT_RE, _WORD_SPLIT_RE])
+
+            current: List[str] = []
+            current_len = 0
+            for piece, n in pieces:
+                if current and current_len + n > max_segment_tokens:
+                    segments.append((_join_pieces(current), current_len, False))
+                    current, current_len = [], 0
+                current.append(piece)
+                current_len += n
+            if current:
+                segments.append((_join_pieces(current), current_len, True))
+        return segments
+
+    def _fit_to_budget(self, pieces: List[str], budget: int, splitters: List["re.Pattern"]) -> List[Tuple[str, int]]:
+        if not pieces:
+            return []
+        out: List[Tuple[str, int]] = []
+        for piece, ids in zip(pieces, self._tokenize_to_host(pieces)):
+            parts = [p for p in splitters[0].split(piece) if p.strip()] if splitters and len(ids) > budget else []
+            if len(parts) > 1:
+                out.extend(self._fit_to_budget(parts, budget, splitters[1:]))
+            elif len(ids) > budget and len(splitters) > 1:
+                out.extend(self._fit_to_budget([piece], budget, splitters[1:]))
+            else:
+                out.append((piece, len(ids)))
+        return out
+
+    @staticmethod
+    def _stitch_segments(
+        segments: List[np.ndarray],
+        gaps: List[int],
+        crossfade: int,
+    ) -> np.ndarray:
+        """
+        Concatenate segments into one preallocated buffer. `gaps[i]` is the silence (in samples) inserted after
+        segment `i`; a zero gap overlaps neighbours by `crossfade` samples with an equal-power crossfade, a
+        non-zero gap fades the edges over `crossfade` samples instead so the silence starts and ends cleanly.
+        """
+        if not segments:
+            return np.zeros(0, dtype=np.float32)
+        offsets = []
+        pos = 0
+        for i, seg in enumerate(segments):
+            if i > 0 and gaps[i - 1] == 0:
+                pos -= min(crossfade, len(segments[i - 1]), len(seg))
+            offsets.append(pos)
+            pos += len(seg) + (gaps[i] if i < len(segments) - 1 else 0)
+        out = np.zeros(offsets[-1] + len(segments[-1]), dtype=np.float32)
+
+        for i, (seg, off) in enumerate(zip(segments, offsets)):
+            seg = seg.astype(np.float32, copy=True)
+            if i > 0:
+                n = min(crossfade, len(seg)) if gaps[i - 1] > 0 else min(crossfade, len(segments[i - 1]), len(seg))
+                if n > 0:
+                    seg[:n] *= np.sin(0.5 * np.pi * (np.arange(n, dtype=np.float32) + 0.5) / n)
+            if i < len(segments) - 1:
+                n = min(crossfade, len(seg)) if gaps[i] > 0 else min(crossfade, len(seg), len(segments[i + 1]))
+                if n > 0:
+                    seg[len(seg) - n:] *= np.cos(0.5 * np.pi * (np.arange(n, dtype=np.float32) + 0.5) / n)
+            out[off:off + len(seg)] += seg
+        return out
+
+    @torch.no_grad()
+    def generate_long(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        speaker: Optional[Union[str, List[str]]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[List[VoiceClonePromptItem]] = None,
+        max_segment_tokens: int = 96,
+        batch_size: Optional[int] = None,
+        pause_ms: float = 120.0,
+        paragraph_pause_ms: float = 400.0,
+        crossfade_ms: float = 10.0,
+        seed: Optional[int] = None,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Synthesize arbitrarily long text(s) with any of the three model types.
+
+        Each text is split into segments of at most `max_segment_tokens` tokens (measured with the real processor
+        tokenizer) on paragraph, sentence, clause and word boundaries; `||` cues are honoured as paragraph breaks.
+        Segments of all texts are generated together in batches of `batch_size` (length-sorted to limit padding),
+        with the same voice conditioning for every segment of a text, then stitched into one buffer per text.
+
+        Voice conditioning depends on the loaded model:
+          - CustomVoice: `speaker` (required) and optional `instruct`
+          - VoiceDesign: `instruct` (voice description)
+          - Base: `voice_clone_prompt`, or `ref_audio` / `ref_text` / `x_vector_only_mode`; the prompt is built
+            once per text and shared by all of its segments.
+        Each of these, and `language`, may be a scalar or one value per text.
+
+        Args:
+            max_segment_tokens:
+                Token budget per segment.
+            batch_size:
+                Number of segments per `generate_*` call. `None` passes all segments at once and lets the memory
+                planner size the batches (see `set_memory_budget`; with a `seed`, only a fixed budget splits them).
+            pause_ms:
+                Silence inserted between segments of a paragraph. `0` crossfades them instead.
+            paragraph_pause_ms:
+                Silence inserted after a paragraph.
+            crossfade_ms:
+                Crossfade length for zero pauses, and fade length at the edges of pauses.
+            seed:
+                Seed applied before every `generate_*` call.
+            **kwargs:
+                Sampling options forwarded to the underlying generate_* method. Metrics hooks receive one record
+                per `generate_*` call.
+
+        Returns:
+            Tuple[List[np.ndarray], int]:
+                (wavs, sample_rate), one stitched waveform per input text.
+        """
+        mode = self.model.tts_model_type
+        texts = self._ensure_list(text)
+
+        def per_text(value, name):
+            values = self._ensure_list(value) if isinstance(value, list) else [value] * len(texts)
+            if len(values) != len(texts):
+                raise ValueError(f"Batch size mismatch: text={len(texts)}, {name}={len(values)}")
+            return values
+
+        languages = per_text(language if language is not None else "Auto", "language")
+        instructs = per_text(instruct, "instruct")
+        if mode == "custom_voice":
+            speakers = per_text(speaker, "speaker")
+        elif mode == "base":
+            if voice_clone_prompt is None:
+                if ref_audio is None:
+                    raise ValueError("Base model requires `voice_clone_prompt` or `ref_audio` for generate_long.")
+                voice_clone_prompt = self.create_voice_clone_prompt(
+                    ref_audio=ref_audio,
+                    ref_text=ref_text,
+                    x_vector_only_mode=x_vector_only_mode,
+                )
+            prompts = per_text(voice_clone_prompt if len(voice_clone_prompt) > 1 else voice_clone_prompt[0], "voice_clone_prompt")
+        elif mode != "voice_design":
+            raise ValueError(f"Unsupported tts_model_type for generate_long: {mode}")
+
+        # (text index, segment text, num tokens, ends paragraph)
+        jobs: List[Tuple[int, str, int, bool]] = []
+        for t_idx, t in enumerate(texts):
+            for seg, n_tokens, ends_paragraph in self._segment_text(t, max_segment_tokens):
+                jobs.append((t_idx, seg, n_tokens, ends_paragraph))
+
+        # length-sorted batches keep left padding (and wasted decode steps) small
+        order = sorted(range(len(jobs)), key=lambda i: jobs[i][2])
+        seg_wavs: List[Optional[np.ndarray]] = [None] * len(jobs)
+        sr = int(self.model.speech_tokenizer.get_output_sample_rate())
+
+        step = max(int(batch_size), 1) if batch_size is not None else max(len(order), 1)
+        for start in range(0, len(order), step):
+            batch = order[start:start + step]
+            batch_texts = [jobs[i][1] for i in batch]
+            owners = [jobs[i][0] for i in batch]
+            batch_langs = [languages[o] for o in owners]
+            if mode == "custom_voice":
+                wavs, sr = self.generate_custom_voice(
+                    text=batch_texts, speaker=[speakers[o] for o in owners], language=batch_langs,
+                    instruct=[instructs[o] or "" for o in owners], seed=seed, **kwargs,
+                )
+            elif mode == "voice_design":
+                wavs, sr = self.generate_voice_design(
+                    text=batch_texts, instruct=[instructs[o] or "" for o in owners], language=batch_langs,
+                    seed=seed, **kwargs,
+                )
+            else:
+                wavs, sr = self.generate_voice_clone(
+                    text=batch_texts, language=batch_langs, voice_clone_prompt=[prompts[o] for o in owners],
+                    seed=seed, **kwargs,
+                )
+            for i, wav in zip(batch, wavs):
+                seg_wavs[i] = wav
+
+        crossfade = int(sr * crossfade_ms / 1000.0)
+        out: List[np.ndarray] = []
+        for t_idx in range(len(texts)):
+            idx = [i for i, j in enumerate(jobs) if j[0] == t_idx]
+            gaps = [int(sr * (paragraph_pause_ms if jobs[i][3] else pause_ms) / 1000.0) for i in idx]
+            out.append(self._stitch_segments([seg_wavs[i] for i in idx], gaps, crossfade))
+        return out, sr
+
     def get_supported_speakers(self) -> Optional[List[str]]:
         """
         List supported speaker names for the current model.
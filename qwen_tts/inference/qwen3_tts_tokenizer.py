@@ -14,12 +14,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import hashlib
 import io
+import os
+import threading
 import urllib.request
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
-import librosa
 import numpy as np
 import soundfile as sf
 import torch
@@ -32,6 +34,9 @@ from ..core import (
     Qwen3TTSTokenizerV2Config,
     Qwen3TTSTokenizerV2Model,
 )
+from ..core.fast_loading import hf_load_lock, load_pretrained_fast
+from .audio_io import PinnedStagingBuffer, load_audio_file, map_concurrently, resample, to_mono_float32, wavs_to_host
+from .metrics import timed
 
 AudioInput = Union[
     str,  # wav path, or base64 string
@@ -41,6 +46,56 @@ AudioInput = Union[
 ]
 
 
+_TOKENIZER_MODEL_CLASSES = {
+    Qwen3TTSTokenizerV1Config: Qwen3TTSTokenizerV1Model,
+    Qwen3TTSTokenizerV2Config: Qwen3TTSTokenizerV2Model,
+}
+
+# Resident tokenizers shared between engines, keyed by (content hash, load kwargs)
+_shared_tokenizers: Dict[Tuple[str, str], "Qwen3TTSTokenizer"] = {}
+_shared_lock = threading.Lock()
+_file_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def _file_sha256(path: str) -> str:
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _file_hash_memo.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 22), b""):
+                h.update(block)
+        digest = _file_hash_memo[key] = h.hexdigest()
+    return digest
+
+
+def tokenizer_content_hash(tokenizer_dir: str) -> str:
+    """
+    Hash of every file (configs and weights) in a speech tokenizer directory. Per-file digests are memoized by
+    (path, size, mtime) for the lifetime of the process.
+    """
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(tokenizer_dir):
+        dirs.sort()
+        for fname in sorted(files):
+            path = os.path.join(root, fname)
+            h.update(os.path.relpath(path, tokenizer_dir).replace(os.sep, "/").encode("utf-8"))
+            h.update(_file_sha256(path).encode("ascii"))
+    return h.hexdigest()
+
+
+def release_shared_speech_tokenizers() -> int:
+    """
+    Drop every tokenizer held by `Qwen3TTSTokenizer.from_pretrained_shared`. Engines that still reference one keep
+    it alive; the next shared load builds a fresh instance. Returns the number of released instances.
+    """
+    with _shared_lock:
+        n = len(_shared_tokenizers)
+        _shared_tokenizers.clear()
+    return n
+
+
 class Qwen3TTSTokenizer:
     """
     A wrapper for Qwen3 TTS Tokenizer 25Hz/12Hz with HuggingFace-style loading.
@@ -59,6 +114,7 @@ class Qwen3TTSTokenizer:
         self.feature_extractor = None
         self.config = None
         self.device = None
+        self._staging = PinnedStagingBuffer()
 
     @classmethod
     def from_pretrained(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
@@ -71,6 +127,7 @@ class Qwen3TTSTokenizer:
             **kwargs (Any):
                 Forwarded to `AutoModel.from_pretrained(...)` directly.
                 Typical examples: device_map="cuda:0", dtype=torch.bfloat16, attn_implementation="eager".
+                `fast_load=False` disables the memory-mapped loader used for local 12Hz checkpoints.
 
         Returns:
             Qwen3TTSTokenizer:
@@ -84,8 +141,18 @@ class Qwen3TTSTokenizer:
         AutoConfig.register("qwen3_tts_tokenizer_12hz", Qwen3TTSTokenizerV2Config)
         AutoModel.register(Qwen3TTSTokenizerV2Config, Qwen3TTSTokenizerV2Model)
 
+        fast_load = kwargs.pop("fast_load", True)
         inst.feature_extractor = AutoFeatureExtractor.from_pretrained(pretrained_model_name_or_path)
-        inst.model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
+        inst.model = None
+        if fast_load and os.path.isdir(pretrained_model_name_or_path):
+            config = AutoConfig.from_pretrained(pretrained_model_name_or_path)
+            model_cls = _TOKENIZER_MODEL_CLASSES.get(type(config))
+            # the 25Hz model loads extra files in its own `from_pretrained`
+            if model_cls is not None and "from_pretrained" not in vars(model_cls):
+                inst.model = load_pretrained_fast(model_cls, pretrained_model_name_or_path, config=config, **kwargs)
+        if inst.model is None:
+            with hf_load_lock:
+                inst.model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
         inst.config = inst.model.config
 
         inst.device = getattr(inst.model, "device", None)
@@ -98,6 +165,30 @@ class Qwen3TTSTokenizer:
 
         return inst
 
+    @classmethod
+    def from_pretrained_shared(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
+        """
+        Like `from_pretrained`, but returns an already resident instance when a tokenizer with identical files was
+        loaded before with the same `kwargs`.
+
+        Instances are keyed by `tokenizer_content_hash` of the directory, so engines shipping byte-identical
+        `speech_tokenizer/` folders share one instance, and it stays resident across engine switches until
+        `release_shared_speech_tokenizers()` is called. Non-local paths fall back to a plain `from_pretrained`.
+        """
+        if not os.path.isdir(pretrained_model_name_or_path):
+            return cls.from_pretrained(pretrained_model_name_or_path, **kwargs)
+
+        key = (
+            tokenizer_content_hash(pretrained_model_name_or_path),
+            repr(sorted((k, repr(v)) for k, v in kwargs.items())),
+        )
+        with _shared_lock:
+            inst = _shared_tokenizers.get(key)
+            if inst is None:
+                inst = cls.from_pretrained(pretrained_model_name_or_path, **kwargs)
+                _shared_tokenizers[key] = inst
+        return inst
+
     def _is_probably_base64(self, s: str) -> bool:
         if s.startswith("data:audio"):
             return True
@@ -147,15 +238,10 @@ class Qwen3TTSTokenizer:
             with io.BytesIO(wav_bytes) as f:
                 audio, sr = sf.read(f, dtype="float32", always_2d=False)
         else:
-            audio, sr = librosa.load(x, sr=None, mono=True)
-
-        if audio.ndim > 1:
-            audio = np.mean(audio, axis=-1)
+            # decoded and resampled once per (path, mtime)
+            return load_audio_file(x, target_sr=target_sr)[0]
 
-        if sr != target_sr:
-            audio = librosa.resample(y=audio, orig_sr=sr, target_sr=target_sr)
-
-        return audio.astype(np.float32)
+        return resample(to_mono_float32(audio), sr, target_sr)
 
     def _normalize_audio_inputs(
         self,
@@ -188,28 +274,25 @@ class Qwen3TTSTokenizer:
 
         if isinstance(audios[0], str):
             # wav path list or base64 list
-            return [self.load_audio(x, target_sr=target_sr) for x in audios]  # type: ignore[arg-type]
+            return map_concurrently(lambda x: self.load_audio(x, target_sr=target_sr), audios)  # type: ignore[arg-type]
 
         # numpy list
         if sr is None:
             raise ValueError("For numpy waveform input, you must provide `sr` (original sampling rate).")
 
-        out: List[np.ndarray] = []
         for a in audios:  # type: ignore[assignment]
             if not isinstance(a, np.ndarray):
                 raise TypeError("Mixed input types are not supported. Use all paths/base64 or all numpy arrays.")
-            if a.ndim > 1:
-                a = np.mean(a, axis=-1)
-            if int(sr) != target_sr:
-                a = librosa.resample(y=a.astype(np.float32), orig_sr=int(sr), target_sr=target_sr)
-            out.append(a.astype(np.float32))
-        return out
+        return map_concurrently(
+            lambda a: resample(np.array(to_mono_float32(a), dtype=np.float32), int(sr), target_sr), audios
+        )
 
     def encode(
         self,
         audios: AudioInput,
         sr: Optional[int] = None,
         return_dict: bool = True,
+        chunk_size: Optional[int] = None,
     ):
         """
         Batch-encode audio into discrete codes (and optional conditioning, depending on 25Hz/12Hz).
@@ -225,6 +308,10 @@ class Qwen3TTSTokenizer:
                 Original sampling rate for numpy waveform input.
             return_dict (bool, default=True):
                 Forwarded to model.encode(...). If True, returns ModelOutput.
+            chunk_size (Optional[int], default=None):
+                12Hz only. If set, the batch is encoded in streaming chunks of this many samples at the
+                tokenizer's input sample rate, so device memory does not grow with the audio length
+                (the padded waveforms stay on the host). Codes are identical to a one-shot encode.
 
         Returns:
             25Hz:
@@ -245,20 +332,34 @@ class Qwen3TTSTokenizer:
             sampling_rate=int(self.feature_extractor.sampling_rate),
             return_tensors="pt",
         )
-        inputs = inputs.to(self.device).to(self.model.dtype)
-
+        if chunk_size is None:
+            inputs = inputs.to(self.device).to(self.model.dtype)
+
+            with torch.inference_mode():
+                # model.encode expects (B, T) and (B, T)
+                enc = self.model.encode(
+                    inputs["input_values"].squeeze(1),
+                    inputs["padding_mask"].squeeze(1),
+                    return_dict=return_dict,
+                )
+            return enc
+
+        if self.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("chunk_size is only supported by the 12Hz tokenizer.")
         with torch.inference_mode():
-            # model.encode expects (B, T) and (B, T)
+            # chunks are moved to the device one at a time inside model.encode
             enc = self.model.encode(
                 inputs["input_values"].squeeze(1),
                 inputs["padding_mask"].squeeze(1),
                 return_dict=return_dict,
+                chunk_size=chunk_size,
             )
         return enc
 
     def decode(
         self,
         encoded,
+        output_dtype: str = "float32",
     ) -> Tuple[List[np.ndarray], int]:
         """
         Decode back to waveform.
@@ -277,10 +378,14 @@ class Qwen3TTSTokenizer:
                 - ModelOutput returned by `encode()`, OR
                 - dict, OR
                 - list[dict]
+            output_dtype (str, default="float32"):
+                Sample format of the returned arrays: "float32", "float16" or "int16" (PCM, full scale 32767).
+                The conversion happens on the device and the whole batch is copied to the host at once
+                (through a reusable pinned buffer on CUDA), so the lower-precision formats also halve the transfer.
 
         Returns:
             Tuple[List[np.ndarray], int]:
-                - wavs: list of 1-D float32 numpy arrays
+                - wavs: list of 1-D numpy arrays in `output_dtype`
                 - sample_rate: int, model output sampling rate
         """
         model_type = self.model.get_model_type()
@@ -361,7 +466,8 @@ class Qwen3TTSTokenizer:
             else:
                 raise ValueError(f"Unknown model type: {model_type}")
 
-        wavs = [w.to(torch.float32).detach().cpu().numpy() for w in wav_tensors]
+        with timed("host_copy"):
+            wavs = wavs_to_host(wav_tensors, dtype=output_dtype, staging=self._staging)
         return wavs, int(self.model.get_output_sample_rate())
 
     def get_model_type(self) -> str:
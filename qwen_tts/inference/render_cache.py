@@ -0,0 +1,199 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Content-addressed, size-bounded disk cache of generated audio.
+
+With a fixed seed, a `generate_*` call is a pure function of the engine (checkpoint, dtype, device type, attention
+implementation) and of its inputs: texts, languages, speakers / instructions / clone prompts and every sampling
+option. `Qwen3TTSModel.set_render_cache` makes the engine look the whole call up under a hash of exactly those
+before generating, so re-running unchanged blocks costs a file read. Calls without a seed are never cached.
+
+Entries are whole calls (a batched call is one entry): items of a batch share the sampler's random stream, so an
+item's audio depends on its batch. Eviction is least-recently-used by file modification time, which hits refresh,
+so several processes can share one directory.
+"""
+import dataclasses
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+_CACHE_FORMAT_VERSION = 1
+_SUFFIX = ".npz"
+
+
+def _feed(h: "hashlib._Hash", value: Any) -> None:
+    if isinstance(value, torch.Tensor):
+        value = value.detach().cpu()
+        if value.dtype == torch.bfloat16:
+            value = value.view(torch.int16)  # numpy has no bfloat16; hash the raw bits
+        value = value.numpy()
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        h.update(f"nd|{value.dtype.str}|{value.shape}|".encode("utf-8"))
+        h.update(memoryview(value).cast("B"))
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        h.update(f"dc|{type(value).__name__}|".encode("utf-8"))
+        _feed(h, {f.name: getattr(value, f.name) for f in dataclasses.fields(value)})
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for k in sorted(value, key=str):
+            _feed(h, str(k))
+            _feed(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for v in value:
+            _feed(h, v)
+        h.update(b"]")
+    else:
+        # scalars and strings; anything else falls back to its repr, which at worst never hits
+        h.update(f"{type(value).__name__}|{value!r}|".encode("utf-8"))
+
+
+def render_cache_key(engine_id: str, method: str, inputs: Dict[str, Any]) -> str:
+    """
+    Cache key of one `generate_*` call: hash of the engine identity, the method and all of its inputs (seed and
+    sampling options included). Tensors and arrays are hashed by content.
+    """
+    h = hashlib.sha256()
+    h.update(f"v{_CACHE_FORMAT_VERSION}|{engine_id}|{method}|".encode("utf-8"))
+    _feed(h, inputs)
+    return h.hexdigest()
+
+
+class RenderCache:
+    """
+    Disk-backed LRU cache of `(wavs, sample_rate)` results, bounded by total file size.
+
+    Usage:
+        cache = RenderCache("~/.cache/qwen_tts/renders", max_bytes=2 << 30)
+        tts.set_render_cache(cache)       # seeded generate_* calls now check the cache first
+
+    Args:
+        cache_dir (str):
+            Directory of the entries (one `.npz` per call). Created if missing.
+        max_bytes (int):
+            Upper bound on the total size of the entries; the least recently used ones are evicted beyond it.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 << 30):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = int(max_bytes)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        entries = []
+        for fname in os.listdir(self.cache_dir):
+            if fname.endswith(_SUFFIX):
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, fname))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, fname[: -len(_SUFFIX)], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def get(self, key: str) -> Optional[Tuple[List[np.ndarray], int]]:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                count = int(data["count"])
+                wavs = [data[f"wav_{i}"] for i in range(count)]
+                sample_rate = int(data["sample_rate"])
+            os.utime(path)
+            size = os.path.getsize(path)
+        except (OSError, KeyError, ValueError):
+            with self._lock:
+                self.misses += 1
+                self._bytes -= self._index.pop(key, 0)
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                # written by another process sharing the directory
+                self._index[key] = size
+                self._bytes += size
+                self._evict()
+        return wavs, sample_rate
+
+    def put(self, key: str, wavs: List[np.ndarray], sample_rate: int) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        arrays = {f"wav_{i}": np.asarray(w) for i, w in enumerate(wavs)}
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, count=np.int64(len(wavs)), sample_rate=np.int64(sample_rate), **arrays)
+            # atomic, so a reader never sees a partial entry
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"[RenderCache] Failed to store {key[:12]}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # internals
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+__all__ = [
+    "RenderCache",
+    "render_cache_key",
+]
@@ -0,0 +1,686 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Networked render workers for Batch Director scripts (standard library HTTP only).
+
+`RenderCoordinator` plans a script exactly like `SceneRenderer` (same batches, seeds fixed up front) and hands the
+batches to `RenderWorker`s on any number of hosts, which pull them over HTTP:
+
+    POST /v1/lease                        {"worker", "engines", "voices", "library", "max_batch_size"}
+                                          -> 200 a batch | 204 nothing to do right now | 410 coordinator closed
+    POST /v1/heartbeat                    {"worker"}: keeps the worker's lease alive while it renders
+    PUT  /v1/batches/<id>/blocks/<index>  one rendered block (.npy body, `X-Sample-Rate` header)
+    POST /v1/batches/<id>/done            {"worker", "failed": {index: error}, "generated", "seconds", "load_seconds"}
+    GET  /v1/status                       workers and remaining work
+
+Every lease request advertises the engines resident on the worker (the active one first), the clone voices whose
+prompts it holds and the reference audio it already has. The coordinator picks the batch for the worker's active
+engine first, then one for an engine it keeps parked, then the one sharing most clone voices, so engines are
+switched and prompts rebuilt as rarely as possible; a worker that has to switch goes to the engine with the
+fewest workers on it. Reference audio of a clone voice travels with the first lease that needs it, so workers need
+no shared filesystem.
+
+A lease lapses when its worker stops heart-beating. Its batch, like blocks a worker reports as failed, is retried
+on another worker, up to `max_attempts` renders per batch. With `render_file`, blocks are written into the
+project's `_audio` folder as they arrive.
+"""
+import base64
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .scene_render import (
+    RenderJob,
+    RenderReport,
+    SceneRenderer,
+    VoiceLibrary,
+    audio_dir_name,
+    audio_filename,
+)
+
+if TYPE_CHECKING:
+    from .qwen3_tts_model import Qwen3TTSModel
+
+_JOB_FIELDS = ("index", "text", "speaker", "language", "instruct", "temperature", "top_p", "seed")
+_MAX_BODY_BYTES = 256 * 1024 * 1024
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _Task:
+    id: str
+    jobs: List[RenderJob]
+    attempts: int = 0
+    excluded: Set[str] = field(default_factory=set)
+    worker: Optional[str] = None
+    deadline: float = 0.0
+    audio: Dict[int, Tuple[np.ndarray, int]] = field(default_factory=dict)
+
+    @property
+    def mode(self) -> str:
+        return self.jobs[0].mode
+
+
+@dataclass
+class _Worker:
+    name: str
+    engines: List[str] = field(default_factory=list)
+    voices: Set[str] = field(default_factory=set)
+    max_batch_size: int = 0
+    last_seen: float = field(default_factory=time.monotonic)
+    batches: int = 0
+
+
+class RenderCoordinator(SceneRenderer):
+    """
+    `SceneRenderer` that hands its batches to networked `RenderWorker`s.
+
+    Usage:
+        coordinator = RenderCoordinator(library, host="0.0.0.0", port=8765).start()
+        report = coordinator.render_file("book.json")     # blocks until every batch is rendered or failed
+        coordinator.close()
+
+    Args:
+        library (Optional[VoiceLibrary]):
+            Clone voices, design profiles and style instructions the scripts refer to.
+        host, port:
+            Bind address. Port 0 picks a free port (see `url`).
+        max_batch_size (int):
+            Upper bound on blocks per batch.
+        lease_timeout_s (float):
+            A worker that has not been heard of for this long loses its batch to another worker.
+        max_attempts (int):
+            Renders of a batch (first try included) before its blocks are marked failed.
+        on_status (Optional[Callable[[RenderJob], None]]):
+            Called on every status transition of a job.
+        log (Optional[Callable[[str], None]]):
+            Progress lines (`print` by default, `None` to silence).
+        access_log (bool):
+            Log every HTTP request to stderr.
+    """
+
+    def __init__(
+        self,
+        library: Optional[VoiceLibrary] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_batch_size: int = 8,
+        lease_timeout_s: float = 60.0,
+        max_attempts: int = 3,
+        on_status: Optional[Callable[[RenderJob], None]] = None,
+        log: Optional[Callable[[str], None]] = print,
+        access_log: bool = False,
+    ):
+        super().__init__(None, library, max_batch_size=max_batch_size, on_status=on_status, log=log)
+        self.lease_timeout_s = float(lease_timeout_s)
+        self.max_attempts = max(int(max_attempts), 1)
+        self.access_log = access_log
+        self._cond = threading.Condition()
+        self._render_lock = threading.Lock()
+        self._queue: List[_Task] = []
+        self._leased: Dict[str, _Task] = {}
+        self._workers: Dict[str, _Worker] = {}
+        self._report: Optional[RenderReport] = None
+        self._audio_target: Optional[Tuple[str, str]] = None
+        self._done = 0
+        self._closed = False
+        self._httpd = ThreadingHTTPServer((host, port), type("_BoundHandler", (_CoordinatorHandler,), {"app": self}))
+        self._httpd.daemon_threads = True
+        self._serve_thread: Optional[threading.Thread] = None
+
+    # lifecycle
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RenderCoordinator":
+        if self._serve_thread is None:
+            self._serve_thread = threading.Thread(
+                target=self._httpd.serve_forever, name="qwen-tts-coordinator", daemon=True
+            )
+            self._serve_thread.start()
+        return self
+
+    def close(self, grace_s: float = 5.0) -> None:
+        """
+        Turn workers away (410) for up to `grace_s` so polling workers learn to exit, then stop serving.
+        """
+        with self._cond:
+            self._closed = True
+            deadline = time.monotonic() + grace_s
+            while self._live_workers() and time.monotonic() < deadline:
+                self._cond.wait(timeout=0.2)
+        if self._serve_thread is not None:
+            self._httpd.shutdown()
+            self._serve_thread.join()
+            self._serve_thread = None
+        self._httpd.server_close()
+
+    # rendering
+    def render(
+        self,
+        script: List[Dict[str, Any]],
+        base_dir: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> Tuple[List[RenderJob], RenderReport]:
+        """
+        Render `script` on the connected workers, like `SceneRenderer.render`. Blocks until every batch is
+        rendered or failed; workers may come and go meanwhile.
+        """
+        with self._render_lock:
+            started = time.perf_counter()
+            jobs, batches, report = self.prepare(script, base_dir=base_dir, retry=retry, current_mode=current_mode)
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("RenderCoordinator is closed.")
+                self._queue = [_Task(uuid.uuid4().hex[:12], batch) for batch in batches]
+                self._report, self._done = report, 0
+                self._cond.notify_all()
+                while self._queue or self._leased:
+                    self._cond.wait(timeout=1.0)
+                    self._expire_leases()
+                self._report = None
+            report.finish(jobs, time.perf_counter() - started)
+            return jobs, report
+
+    def render_file(
+        self,
+        script_path: str,
+        output_path: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> RenderReport:
+        target = output_path or script_path
+        self._audio_target = (os.path.dirname(os.path.abspath(target)), audio_dir_name(target))
+        try:
+            return super().render_file(script_path, output_path=output_path, retry=retry, current_mode=current_mode)
+        finally:
+            self._audio_target = None
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._cond:
+            return dict(
+                closed=self._closed,
+                queued_batches=len(self._queue),
+                leased_batches=len(self._leased),
+                done_batches=self._done,
+                workers=[
+                    dict(name=w.name, engines=w.engines, voices=sorted(w.voices), max_batch_size=w.max_batch_size,
+                         batches=w.batches, idle_s=round(now - w.last_seen, 1))
+                    for w in self._workers.values()
+                ],
+            )
+
+    # protocol
+    def lease(self, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Next batch for the worker described by `body`, or `None` when there is nothing for it right now."""
+        with self._cond:
+            worker = self._seen(body)
+            if self._closed:
+                self._workers.pop(worker.name, None)
+                self._cond.notify_all()
+                raise _HTTPError(410, "Coordinator closed.")
+            self._expire_leases()
+            task = self._pick(worker)
+            if task is None:
+                return None
+            self._queue.remove(task)
+            task.worker, task.deadline, task.audio = worker.name, time.monotonic() + self.lease_timeout_s, {}
+            task.attempts += 1
+            self._leased[task.id] = task
+            for job in task.jobs:
+                self.set_status(job, "busy")
+
+        known = set(body.get("library") or ())
+        voices = {}
+        if task.mode == "base":
+            for speaker in dict.fromkeys(j.speaker for j in task.jobs):
+                if speaker in known:
+                    continue
+                profile = self.library.clone_voices.get(speaker) or {}
+                with open(profile["audio_path"], "rb") as f:
+                    voices[speaker] = dict(
+                        audio=base64.b64encode(f.read()).decode("ascii"),
+                        ext=os.path.splitext(profile["audio_path"])[1],
+                        transcript=profile.get("transcript"),
+                    )
+        return dict(
+            batch=task.id,
+            mode=task.mode,
+            jobs=[{k: getattr(job, k) for k in _JOB_FIELDS} for job in task.jobs],
+            voices=voices,
+            heartbeat_s=self.lease_timeout_s / 3.0,
+        )
+
+    def heartbeat(self, body: Dict[str, Any]) -> None:
+        with self._cond:
+            worker = self._seen(body)
+            for task in self._leased.values():
+                if task.worker == worker.name:
+                    task.deadline = time.monotonic() + self.lease_timeout_s
+
+    def receive_block(self, batch_id: str, index: int, worker: str, data: bytes, sample_rate: int) -> None:
+        wav = np.load(io.BytesIO(data), allow_pickle=False)
+        with self._cond:
+            task = self._owned(batch_id, worker)
+            job = next((j for j in task.jobs if j.index == index), None)
+            if job is None:
+                raise _HTTPError(404, f"Block {index} is not part of batch {batch_id}.")
+            task.audio[index] = (wav, sample_rate)
+            task.deadline = time.monotonic() + self.lease_timeout_s
+            target = self._audio_target
+        if target is not None:
+            import soundfile as sf
+
+            audio_dir = os.path.join(*target)
+            os.makedirs(audio_dir, exist_ok=True)
+            sf.write(os.path.join(audio_dir, audio_filename(index, job.speaker)), wav, sample_rate)
+
+    def complete(self, batch_id: str, body: Dict[str, Any]) -> None:
+        failed = {int(k): v for k, v in (body.get("failed") or {}).items()}
+        with self._cond:
+            task = self._owned(batch_id, str(body.get("worker")))
+            del self._leased[batch_id]
+            worker = self._workers.get(task.worker)
+            if worker is not None:
+                worker.batches += 1
+            report = self._report
+            report.load_seconds += float(body.get("load_seconds") or 0.0)
+
+            retry = []
+            for job in task.jobs:
+                if job.index in task.audio:
+                    job.audio, job.sample_rate = task.audio[job.index]
+                    self.set_status(job, "review")
+                else:
+                    job.error = failed.get(job.index, "No audio received")
+                    retry.append(job)
+            rendered = [job for job in task.jobs if job.status == "review"]
+            if body.get("generated") and rendered:
+                seconds = float(body.get("seconds") or 0.0)
+                audio = report.add_batch(task.jobs, seconds, worker=task.worker)
+                self._done += 1
+                self.log(
+                    f"[{self._done}] {task.mode} x{len(rendered)} on {task.worker}: {audio:.1f} s audio in "
+                    f"{seconds:.2f} s"
+                )
+            if self._audio_target is not None:
+                for job in rendered:
+                    # already in the project folder; an absolute audio_file makes write_script keep that file
+                    job.block["audio_file"] = os.path.join(
+                        *self._audio_target, audio_filename(job.index, job.speaker)
+                    )
+                    job.audio = None
+            if retry:
+                self._retry(task, retry, task.worker, retry[0].error)
+            self._cond.notify_all()
+
+    # internals
+    def _seen(self, body: Dict[str, Any]) -> _Worker:
+        name = str(body.get("worker") or "")
+        if not name:
+            raise _HTTPError(400, "`worker` is required.")
+        worker = self._workers.setdefault(name, _Worker(name))
+        worker.last_seen = time.monotonic()
+        if "engines" in body:
+            worker.engines = [str(e) for e in body.get("engines") or ()]
+            worker.voices = set(body.get("voices") or ())
+            worker.max_batch_size = int(body.get("max_batch_size") or 0)
+        return worker
+
+    def _owned(self, batch_id: str, worker: str) -> _Task:
+        task = self._leased.get(batch_id)
+        if task is None or task.worker != worker:
+            raise _HTTPError(409, f"Batch {batch_id} is not leased to {worker}.")
+        return task
+
+    def _live_workers(self) -> List[str]:
+        now = time.monotonic()
+        return [w.name for w in self._workers.values() if now - w.last_seen < self.lease_timeout_s]
+
+    def _pick(self, worker: _Worker) -> Optional[_Task]:
+        if not self._queue:
+            return None
+        live = set(self._live_workers())
+        # engines the other workers are on, to spread workers that have to switch
+        load: Dict[str, int] = {}
+        for name in live - {worker.name}:
+            engines = self._workers[name].engines
+            if engines:
+                load[engines[0]] = load.get(engines[0], 0) + 1
+
+        def score(pos_task):
+            pos, task = pos_task
+            speakers = {j.speaker for j in task.jobs} if task.mode == "base" else set()
+            return (
+                # a worker that failed a batch only gets it back when no other worker is around
+                worker.name not in task.excluded or live <= task.excluded,
+                2 if worker.engines[:1] == [task.mode] else 1 if task.mode in worker.engines else 0,
+                len(speakers & worker.voices) / len(speakers) if speakers else 0.0,
+                -load.get(task.mode, 0),
+                not worker.max_batch_size or len(task.jobs) <= worker.max_batch_size,
+                -pos,
+            )
+
+        best = max(enumerate(self._queue), key=score)
+        return best[1] if score(best)[0] else None
+
+    def _retry(self, task: _Task, jobs: List[RenderJob], worker: str, reason: str) -> None:
+        if task.attempts >= self.max_attempts:
+            for job in jobs:
+                self.set_status(job, "failed", reason)
+            return
+        self.log(f"[RenderCoordinator] Retrying {len(jobs)} block(s) of batch {task.id} off {worker}: {reason}")
+        retry = _Task(task.id, jobs, attempts=task.attempts, excluded=task.excluded | {worker})
+        for job in jobs:
+            self.set_status(job, "queued")
+        self._queue.insert(0, retry)
+
+    def _expire_leases(self) -> None:
+        now = time.monotonic()
+        for task in [t for t in self._leased.values() if t.deadline < now]:
+            del self._leased[task.id]
+            self._retry(task, task.jobs, task.worker, f"lease on {task.worker} expired")
+            self._cond.notify_all()
+
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "qwen-tts-coordinator"
+    app: RenderCoordinator = None
+
+    def log_message(self, format, *args) -> None:
+        if self.app.access_log:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, payload: Any = None) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > _MAX_BODY_BYTES:
+            raise _HTTPError(413, f"Request body over {_MAX_BODY_BYTES} bytes.")
+        return self.rfile.read(length)
+
+    def _read_json(self) -> Dict[str, Any]:
+        try:
+            body = json.loads(self._read() or b"{}")
+        except ValueError:
+            raise _HTTPError(400, "Request body must be JSON.")
+        if not isinstance(body, dict):
+            raise _HTTPError(400, "Request body must be a JSON object.")
+        return body
+
+    def _dispatch(self, fn) -> None:
+        try:
+            fn()
+        except _HTTPError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _parts(self) -> List[str]:
+        return [p for p in self.path.split("?", 1)[0].split("/") if p]
+
+    def do_GET(self) -> None:
+        if self._parts() == ["v1", "status"]:
+            self._dispatch(lambda: self.send_json(200, self.app.status()))
+        else:
+            self._dispatch(self._not_found)
+
+    def do_POST(self) -> None:
+        parts = self._parts()
+        if parts == ["v1", "lease"]:
+            self._dispatch(lambda: self.send_json(*self._lease()))
+        elif parts == ["v1", "heartbeat"]:
+            self._dispatch(lambda: self.send_json(200, self.app.heartbeat(self._read_json()) or {}))
+        elif len(parts) == 4 and parts[:2] == ["v1", "batches"] and parts[3] == "done":
+            self._dispatch(lambda: self.send_json(200, self.app.complete(parts[2], self._read_json()) or {}))
+        else:
+            self._dispatch(self._not_found)
+
+    def do_PUT(self) -> None:
+        parts = self._parts()
+        if len(parts) == 5 and parts[:2] == ["v1", "batches"] and parts[3] == "blocks" and parts[4].isdigit():
+            self._dispatch(lambda: self.send_json(200, self.app.receive_block(
+                parts[2], int(parts[4]), self.headers.get("X-Worker", ""), self._read(),
+                int(self.headers.get("X-Sample-Rate") or 24000),
+            ) or {}))
+        else:
+            self._dispatch(self._not_found)
+
+    def _lease(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        payload = self.app.lease(self._read_json())
+        return (204, None) if payload is None else (200, payload)
+
+    def _not_found(self) -> None:
+        raise _HTTPError(404, f"No route for {self.command} {self.path}")
+
+
+class RenderWorker:
+    """
+    Pulls batches from a `RenderCoordinator` and renders them on this host's engines.
+
+    Usage:
+        engines = EngineResidencyManager(lambda mode: loader(mode, "cuda:0"), idle_timeout_s=None)
+        RenderWorker("http://coordinator:8765", engines.acquire, resident=engines.resident).run()
+
+    Args:
+        coordinator (str):
+            Base URL of the coordinator.
+        engines (Callable[[str], Qwen3TTSModel]):
+            Returns the loaded engine for a mode, e.g. `EngineResidencyManager.acquire`.
+        resident (Optional[Callable[[], List[str]]]):
+            Modes of the engines this worker holds, least recently used first (e.g.
+            `EngineResidencyManager.resident`). Only the active engine is advertised without it.
+        name (Optional[str]):
+            Worker id, unique per coordinator (default: `<hostname>-<pid>`).
+        max_batch_size (int):
+            Largest batch this worker takes without splitting it, advertised to the coordinator.
+        poll_interval_s (float):
+            Pause between lease requests while there is no work.
+        retry_s (float):
+            Give up when the coordinator is unreachable for this long.
+        log (Optional[Callable[[str], None]]):
+            Progress lines (`print` by default, `None` to silence).
+    """
+
+    def __init__(
+        self,
+        coordinator: str,
+        engines: Callable[[str], "Qwen3TTSModel"],
+        resident: Optional[Callable[[], List[str]]] = None,
+        name: Optional[str] = None,
+        max_batch_size: int = 8,
+        poll_interval_s: float = 1.0,
+        retry_s: float = 60.0,
+        log: Optional[Callable[[str], None]] = print,
+    ):
+        self.coordinator = coordinator.rstrip("/")
+        self.resident = resident
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.max_batch_size = int(max_batch_size)
+        self.poll_interval_s = float(poll_interval_s)
+        self.retry_s = float(retry_s)
+        self.log = log or (lambda _msg: None)
+        self.renderer = SceneRenderer(engines, VoiceLibrary(), log=None)
+        self._voice_dir: Optional[str] = None
+
+    def run(self) -> int:
+        """
+        Render until the coordinator closes (or stays unreachable for `retry_s`).
+
+        Returns:
+            int: number of batches rendered.
+        """
+        rendered = 0
+        unreachable_since = None
+        self._voice_dir = tempfile.mkdtemp(prefix="qwen-tts-voices-")
+        try:
+            while True:
+                try:
+                    status, lease = self._request("POST", "/v1/lease", self._advert())
+                except OSError as e:
+                    unreachable_since = unreachable_since or time.monotonic()
+                    if time.monotonic() - unreachable_since > self.retry_s:
+                        self.log(f"[RenderWorker] Coordinator unreachable for {self.retry_s:.0f} s, stopping: {e}")
+                        return rendered
+                    time.sleep(self.poll_interval_s)
+                    continue
+                unreachable_since = None
+                if status == 410:
+                    return rendered
+                if status != 200:
+                    time.sleep(self.poll_interval_s)
+                    continue
+                if self._render(lease):
+                    rendered += 1
+        finally:
+            shutil.rmtree(self._voice_dir, ignore_errors=True)
+            self._voice_dir = None
+
+    # internals
+    def _advert(self) -> Dict[str, Any]:
+        active = self.renderer.active_mode
+        engines = list(reversed(self.resident())) if self.resident is not None else []
+        if active is not None:
+            engines = [active] + [e for e in engines if e != active]
+        return dict(
+            worker=self.name,
+            engines=engines,
+            voices=self.renderer.locked_voices,
+            library=list(self.renderer.library.clone_voices),
+            max_batch_size=self.max_batch_size,
+        )
+
+    def _render(self, lease: Dict[str, Any]) -> bool:
+        batch_id, mode = lease["batch"], lease["mode"]
+        for speaker, voice in (lease.get("voices") or {}).items():
+            path = os.path.join(self._voice_dir, f"{uuid.uuid4().hex}{voice.get('ext') or '.wav'}")
+            with open(path, "wb") as f:
+                f.write(base64.b64decode(voice["audio"]))
+            self.renderer.library.clone_voices[speaker] = dict(audio_path=path, transcript=voice.get("transcript"))
+        jobs = [RenderJob(block={}, mode=mode, **job) for job in lease["jobs"]]
+
+        stop = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(stop, float(lease.get("heartbeat_s") or 10.0)),
+            name="qwen-tts-worker-heartbeat", daemon=True,
+        )
+        beat.start()
+        load_started = time.perf_counter()
+        generated = False
+        try:
+            model = self.renderer.engine(mode)
+            gen_started = time.perf_counter()
+            generated = self.renderer.render_batch(model, jobs)
+        except Exception as e:
+            gen_started = time.perf_counter()
+            for job in jobs:
+                self.renderer.set_status(job, "failed", str(e))
+        seconds = time.perf_counter() - gen_started
+
+        try:
+            for job in jobs:
+                if job.status != "review":
+                    continue
+                buf = io.BytesIO()
+                np.save(buf, np.asarray(job.audio), allow_pickle=False)
+                status, _ = self._request(
+                    "PUT", f"/v1/batches/{batch_id}/blocks/{job.index}", buf.getvalue(),
+                    headers={"X-Worker": self.name, "X-Sample-Rate": str(job.sample_rate)},
+                )
+                if status != 200:
+                    self.log(f"[RenderWorker] Batch {batch_id} was taken back ({status}), dropping it")
+                    return False
+            status, _ = self._request("POST", f"/v1/batches/{batch_id}/done", dict(
+                worker=self.name,
+                failed={str(j.index): j.error for j in jobs if j.status != "review"},
+                generated=generated,
+                seconds=seconds,
+                load_seconds=gen_started - load_started,
+            ))
+        except OSError as e:
+            self.log(f"[RenderWorker] Lost the coordinator while returning batch {batch_id}: {e}")
+            return False
+        finally:
+            stop.set()
+            beat.join()
+        done = sum(j.status == "review" for j in jobs)
+        self.log(f"[RenderWorker] {mode} x{len(jobs)}: {done} rendered in {seconds:.2f} s")
+        return status == 200 and done > 0
+
+    def _heartbeat(self, stop: threading.Event, interval: float) -> None:
+        while not stop.wait(interval):
+            try:
+                self._request("POST", "/v1/heartbeat", dict(worker=self.name))
+            except OSError:
+                pass
+
+    def _request(
+        self, method: str, path: str, body: Any = None, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Any]:
+        if isinstance(body, dict):
+            data, content_type = json.dumps(body).encode("utf-8"), "application/json"
+        else:
+            data, content_type = body, "application/octet-stream"
+        request = urllib.request.Request(
+            self.coordinator + path, data=data, method=method,
+            headers={"Content-Type": content_type, **(headers or {})},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=max(60.0, self.retry_s)) as resp:
+                status, raw = resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            status, raw = e.code, e.read()
+        if raw and status == 200:
+            return status, json.loads(raw)
+        return status, None
+
+
+__all__ = [
+    "RenderCoordinator",
+    "RenderWorker",
+]
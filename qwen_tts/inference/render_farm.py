@@ -0,0 +1,427 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Multi-process render farm for Batch Director scripts.
+
+`RenderFarm` plans a script exactly like `SceneRenderer` (same batches, seeds fixed up front) and renders the
+batches in N worker processes, each pinned to one device or CPU set and holding its own engines:
+
+  - every worker starts with a contiguous shard of the engine-ordered batches, so it loads few engines;
+  - a worker whose shard runs dry steals from the tail of the largest remaining shard, preferring batches for the
+    engine it already has loaded;
+  - rendered audio comes back through `multiprocessing.shared_memory` blocks, only their names travel over the
+    worker's pipe (one pipe per worker, so a crashed worker cannot leave a shared queue locked);
+  - the batch of a worker that dies is handed to another worker once.
+
+A batch renders to the same audio in any process that uses the same device type, dtype and thread count as a
+single-process render.
+"""
+import glob
+import multiprocessing as mp
+import multiprocessing.connection as mp_connection
+import os
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .scene_render import RenderJob, RenderReport, SceneRenderer, VoiceLibrary
+
+if TYPE_CHECKING:
+    from .qwen3_tts_model import Qwen3TTSModel
+
+
+def parse_cpu_list(text: str) -> Tuple[int, ...]:
+    """Parse a Linux cpulist such as `0-15,32-47`."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return tuple(cpus)
+
+
+def numa_cpu_sets() -> List[Tuple[int, ...]]:
+    """CPU set of every NUMA node (one entry with all CPUs when the topology is not exposed)."""
+    sets = []
+    for path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist"),
+                       key=lambda p: int(p.split("/node")[-1].split("/")[0])):
+        with open(path, "r", encoding="utf-8") as f:
+            cpus = parse_cpu_list(f.read())
+        if cpus:
+            sets.append(cpus)
+    if not sets:
+        sets.append(tuple(sorted(os.sched_getaffinity(0))) if hasattr(os, "sched_getaffinity")
+                    else tuple(range(os.cpu_count() or 1)))
+    return sets
+
+
+@dataclass
+class WorkerSpec:
+    """
+    Where one render worker runs.
+
+    Args:
+        device (str):
+            `device_map` for its engines, e.g. `cuda:1` or `cpu`.
+        cpus (Optional[Tuple[int, ...]]):
+            CPU affinity of the process. `None` leaves it unpinned.
+        threads (Optional[int]):
+            `torch.set_num_threads`; defaults to the number of pinned CPUs.
+    """
+
+    device: str = "cpu"
+    cpus: Optional[Tuple[int, ...]] = None
+    threads: Optional[int] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "WorkerSpec":
+        """`cuda:1`, `cpu` or `cpu:<cpulist>` (e.g. `cpu:0-15,32-47`)."""
+        device, _, cpus = spec.partition(":")
+        if device == "cpu":
+            return cls("cpu", parse_cpu_list(cpus) if cpus else None)
+        return cls(spec)
+
+    @property
+    def name(self) -> str:
+        if self.cpus is None:
+            return self.device
+        return f"{self.device}[{self.cpus[0]}-{self.cpus[-1]}]" if len(self.cpus) > 1 else f"{self.device}[{self.cpus[0]}]"
+
+
+def default_worker_specs() -> List[WorkerSpec]:
+    """One worker per CUDA device, or one per NUMA node on CPU-only hosts."""
+    import torch
+
+    if torch.cuda.is_available():
+        return [WorkerSpec(f"cuda:{i}") for i in range(torch.cuda.device_count())]
+    return [WorkerSpec("cpu", cpus) for cpus in numa_cpu_sets()]
+
+
+@dataclass
+class PretrainedLoader:
+    """
+    Picklable engine loader for `RenderFarm` workers: `loader(mode, device)` loads `checkpoints[mode]`.
+
+    Args:
+        checkpoints (Dict[str, str]):
+            Mode (`custom`, `design`, `base`) -> checkpoint path or HF repo id.
+        dtype (str):
+            torch dtype name.
+        attn_implementation (Optional[str]):
+            e.g. `flash_attention_2`.
+        prompt_cache_dir (Optional[str]):
+            Disk tier of a `VoicePromptCache` attached to every engine.
+        render_cache_dir (Optional[str]):
+            Directory of a `RenderCache` attached to every engine (workers can share it).
+        render_cache_gb (float):
+            Size bound of the render cache, per worker process.
+    """
+
+    checkpoints: Dict[str, str]
+    dtype: str = "bfloat16"
+    attn_implementation: Optional[str] = None
+    prompt_cache_dir: Optional[str] = None
+    render_cache_dir: Optional[str] = None
+    render_cache_gb: float = 2.0
+
+    def __call__(self, mode: str, device: str) -> "Qwen3TTSModel":
+        import torch
+
+        from .qwen3_tts_model import Qwen3TTSModel
+        from .render_cache import RenderCache
+        from .voice_prompt_cache import VoicePromptCache
+
+        model = Qwen3TTSModel.from_pretrained(
+            self.checkpoints[mode],
+            device_map=device,
+            dtype=getattr(torch, self.dtype),
+            attn_implementation=self.attn_implementation,
+        )
+        if self.prompt_cache_dir:
+            model.set_voice_prompt_cache(VoicePromptCache(self.prompt_cache_dir))
+        if self.render_cache_dir:
+            model.set_render_cache(RenderCache(self.render_cache_dir, max_bytes=int(self.render_cache_gb * (1 << 30))))
+        return model
+
+
+# audio transport
+def _to_shared(wav: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+    arr = np.ascontiguousarray(wav)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+    # the coordinator takes ownership and unlinks the block; keep this process's tracker from doing it at exit
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.close()
+    return shm.name, arr.shape, arr.dtype.str
+
+
+def _from_shared(name: str, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, np.dtype(dtype), buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _worker_main(wid: int, spec: WorkerSpec, loader: Callable[[str, str], "Qwen3TTSModel"],
+                 library: VoiceLibrary, conn) -> None:
+    try:
+        if spec.cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, spec.cpus)
+        import torch
+
+        from .residency import EngineResidencyManager
+
+        threads = spec.threads or (len(spec.cpus) if spec.cpus else None)
+        if threads:
+            torch.set_num_threads(threads)
+        engines = EngineResidencyManager(lambda mode: loader(mode, spec.device), ram_budget_bytes=0, idle_timeout_s=None)
+        renderer = SceneRenderer(engines.acquire, library, log=None)
+    except BaseException:
+        conn.send(("error", traceback.format_exc()))
+        return
+    conn.send(("ready", None))
+
+    while True:
+        batch: Optional[List[RenderJob]] = conn.recv()
+        if batch is None:
+            break
+        load_started = time.perf_counter()
+        generated = False
+        try:
+            model = renderer.engine(batch[0].mode)
+            gen_started = time.perf_counter()
+            generated = renderer.render_batch(model, batch)
+        except Exception as e:
+            gen_started = time.perf_counter()
+            for job in batch:
+                renderer.set_status(job, "failed", str(e))
+        out = []
+        for job in batch:
+            audio = _to_shared(job.audio) if job.status == "review" and job.audio is not None else None
+            out.append((job.index, job.status, job.error, audio, job.sample_rate))
+        conn.send(("done", dict(
+            jobs=out,
+            generated=generated,
+            load_seconds=gen_started - load_started,
+            seconds=time.perf_counter() - gen_started,
+        )))
+    engines.close()
+    conn.close()
+
+
+class RenderFarm(SceneRenderer):
+    """
+    `SceneRenderer` that renders the batches in worker processes.
+
+    Usage:
+        farm = RenderFarm(PretrainedLoader(checkpoints, dtype="bfloat16"), [WorkerSpec("cuda:0"), WorkerSpec("cuda:1")], library)
+        report = farm.render_file("scene.json")
+
+    Args:
+        loader (Callable[[str, str], Qwen3TTSModel]):
+            Picklable `loader(mode, device)` run inside the workers, e.g. `PretrainedLoader`.
+        workers (Sequence[WorkerSpec]):
+            One process per spec (never more than there are batches). Defaults to `default_worker_specs()`.
+        library (Optional[VoiceLibrary]):
+            Clone voices, design profiles and style instructions the script refers to.
+        max_batch_size (int):
+            Upper bound on blocks per `generate_*` call.
+        on_status (Optional[Callable[[RenderJob], None]]):
+            Called on every status transition of a job (in the coordinating process).
+        log (Optional[Callable[[str], None]]):
+            Progress lines (`print` by default, `None` to silence).
+        start_method (str):
+            multiprocessing start method. `spawn` is the only one that is safe with CUDA.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], "Qwen3TTSModel"],
+        workers: Optional[Sequence[WorkerSpec]] = None,
+        library: Optional[VoiceLibrary] = None,
+        max_batch_size: int = 8,
+        on_status: Optional[Callable[[RenderJob], None]] = None,
+        log: Optional[Callable[[str], None]] = print,
+        start_method: str = "spawn",
+    ):
+        super().__init__(None, library, max_batch_size=max_batch_size, on_status=on_status, log=log)
+        self.loader = loader
+        self.workers = list(workers) if workers else default_worker_specs()
+        self.start_method = start_method
+
+    def render(
+        self,
+        script: List[Dict[str, Any]],
+        base_dir: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> Tuple[List[RenderJob], RenderReport]:
+        started = time.perf_counter()
+        jobs, batches, report = self.prepare(script, base_dir=base_dir, retry=retry, current_mode=current_mode)
+        if batches:
+            self._run(batches, {job.index: job for job in jobs}, report)
+        report.finish(jobs, time.perf_counter() - started)
+        return jobs, report
+
+    # internals
+    def _run(self, batches: List[List[RenderJob]], by_index: Dict[int, RenderJob], report: RenderReport) -> None:
+        n = min(len(self.workers), len(batches))
+        shards: List[Deque[List[RenderJob]]] = [
+            deque(batches[i * len(batches) // n:(i + 1) * len(batches) // n]) for i in range(n)
+        ]
+        names = [f"w{i}:{spec.name}" for i, spec in enumerate(self.workers[:n])]
+
+        ctx = mp.get_context(self.start_method)
+        pipes = [ctx.Pipe() for _ in range(n)]
+        conns = [parent for parent, _ in pipes]
+        procs = [
+            ctx.Process(
+                target=_worker_main,
+                args=(i, spec, self.loader, self.library, pipes[i][1]),
+                name=f"qwen-tts-render-{i}",
+                daemon=True,
+            )
+            for i, spec in enumerate(self.workers[:n])
+        ]
+        for proc, (_, child) in zip(procs, pipes):
+            proc.start()
+            child.close()
+
+        alive = set(range(n))
+        inflight: Dict[int, List[RenderJob]] = {}
+        modes: Dict[int, str] = {}
+        requeued = set()
+        done = 0
+
+        def lose(wid: int, reason: str) -> None:
+            alive.discard(wid)
+            batch = inflight.pop(wid, None)
+            self.log(f"[RenderFarm] Worker {names[wid]} stopped: {reason}")
+            if batch is None:
+                return
+            if id(batch) in requeued or not alive:
+                for job in batch:
+                    self.set_status(job, "failed", f"Render worker {names[wid]} stopped")
+            else:
+                requeued.add(id(batch))
+                shards[min(alive)].appendleft(batch)
+
+        try:
+            while alive:
+                wid = self._wait(conns, procs, alive)
+                try:
+                    kind, payload = conns[wid].recv()
+                except (EOFError, OSError):
+                    procs[wid].join(timeout=5)
+                    lose(wid, f"exit code {procs[wid].exitcode}")
+                    continue
+
+                if kind == "error":
+                    lose(wid, payload.strip().splitlines()[-1])
+                    continue
+                if kind == "done":
+                    batch = inflight.pop(wid)
+                    self._collect(batch, by_index, payload)
+                    report.load_seconds += payload["load_seconds"]
+                    if payload["generated"]:
+                        done += 1
+                        audio = report.add_batch(batch, payload["seconds"], worker=names[wid])
+                        self.log(
+                            f"[{done}] {batch[0].mode} x{len(batch)} on {names[wid]}: {audio:.1f} s audio in "
+                            f"{payload['seconds']:.2f} s"
+                        )
+
+                batch = self._next_batch(wid, shards, modes.get(wid))
+                if batch is None:
+                    conns[wid].send(None)
+                    alive.discard(wid)
+                    continue
+                inflight[wid] = batch
+                modes[wid] = batch[0].mode
+                for job in batch:
+                    self.set_status(job, "busy")
+                conns[wid].send(batch)
+        finally:
+            for wid in alive:
+                try:
+                    conns[wid].send(None)
+                except OSError:
+                    pass
+            for proc in procs:
+                proc.join(timeout=30)
+                if proc.is_alive():
+                    proc.terminate()
+
+        for shard in shards:
+            for batch in shard:
+                for job in batch:
+                    self.set_status(job, "failed", "No render worker left")
+
+    @staticmethod
+    def _wait(conns, procs, alive) -> int:
+        # a message, or the process sentinel of a worker that died without sending one
+        ready = mp_connection.wait([conns[w] for w in alive] + [procs[w].sentinel for w in alive])
+        for wid in sorted(alive):
+            if conns[wid] in ready:
+                return wid
+        for wid in sorted(alive):
+            if procs[wid].sentinel in ready:
+                return wid
+        raise RuntimeError("multiprocessing.connection.wait returned no worker")
+
+    @staticmethod
+    def _next_batch(
+        wid: int, shards: List[Deque[List[RenderJob]]], mode: Optional[str]
+    ) -> Optional[List[RenderJob]]:
+        if shards[wid]:
+            return shards[wid].popleft()
+        victims = sorted((s for s in shards if s), key=len, reverse=True)
+        if not victims:
+            return None
+        # steal from the tail, which is what the victim would render last
+        for shard in victims:
+            if shard[-1][0].mode == mode:
+                return shard.pop()
+        return victims[0].pop()
+
+    def _collect(self, batch: List[RenderJob], by_index: Dict[int, RenderJob], payload: Dict[str, Any]) -> None:
+        for index, status, error, audio, sample_rate in payload["jobs"]:
+            job = by_index[index]
+            if audio is not None:
+                job.audio, job.sample_rate = _from_shared(*audio), sample_rate
+            if status == "review":
+                self.set_status(job, status)
+            else:
+                job.error = error
+                self.set_status(job, "failed", error or "Render failed")
+
+
+__all__ = [
+    "PretrainedLoader",
+    "RenderFarm",
+    "WorkerSpec",
+    "default_worker_specs",
+    "numa_cpu_sets",
+    "parse_cpu_list",
+]
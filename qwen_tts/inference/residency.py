@@ -0,0 +1,281 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Residency manager for several `Qwen3TTSModel` engines sharing one device.
+
+Engines live in one of three tiers: on the device (ready), parked in (pinned) host memory, or evicted. Switching
+to a parked engine is a host-to-device copy instead of a full `from_pretrained` from disk. Both resident tiers
+are LRU-ordered and bounded by byte budgets; parked engines idle for longer than `idle_timeout_s` are evicted.
+"""
+import gc
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import torch
+
+from .qwen3_tts_model import Qwen3TTSModel
+
+
+def _host_memory_bytes() -> Optional[int]:
+    try:
+        import psutil
+
+        return int(psutil.virtual_memory().total)
+    except Exception:
+        return None
+
+
+def _release_device_cache() -> None:
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+        torch.cuda.empty_cache()
+
+
+@dataclass
+class _Engine:
+    name: str
+    wrapper: Qwen3TTSModel
+    home_device: torch.device
+    nbytes: int
+    on_device: bool = True
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class EngineResidencyManager:
+    """
+    Keeps recently used engines resident and moves them between the device and host memory on demand.
+
+    Only the engine's own weights move. The speech tokenizer is not a submodule (and may be shared between
+    engines, see `Qwen3TTSTokenizer.from_pretrained_shared`), so it stays on the device.
+
+    Args:
+        loader (Callable[[str], Qwen3TTSModel]):
+            Loads engine `name` from disk onto its device. Called on a miss.
+        vram_budget_bytes (Optional[int]):
+            Bytes of engine weights allowed on the device at once. `None` keeps only the active engine there.
+        ram_budget_bytes (Optional[int]):
+            Bytes of parked weights allowed in host memory. Defaults to a quarter of physical RAM (8 GiB if
+            unknown). `0` disables parking, which restores load-from-disk on every switch.
+        idle_timeout_s (Optional[float]):
+            Parked engines unused for this long are evicted by a background reaper. `None` disables it.
+        pin_memory (bool):
+            Park weights in page-locked memory for faster host-to-device copies (CUDA only).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Qwen3TTSModel],
+        vram_budget_bytes: Optional[int] = None,
+        ram_budget_bytes: Optional[int] = None,
+        idle_timeout_s: Optional[float] = 900.0,
+        pin_memory: bool = True,
+    ):
+        self.loader = loader
+        self.vram_budget_bytes = vram_budget_bytes
+        if ram_budget_bytes is None:
+            total = _host_memory_bytes()
+            ram_budget_bytes = total // 4 if total else 8 << 30
+        self.ram_budget_bytes = int(ram_budget_bytes)
+        self.idle_timeout_s = idle_timeout_s
+        self.pin_memory = pin_memory
+        self._engines: "OrderedDict[str, _Engine]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if idle_timeout_s:
+            self._reaper = threading.Thread(target=self._reap_loop, name="qwen-tts-residency", daemon=True)
+            self._reaper.start()
+
+    # public API
+    def acquire(self, name: str) -> Qwen3TTSModel:
+        """
+        Return engine `name` ready on its device, loading or un-parking it as needed.
+        """
+        with self._lock:
+            eng = self._engines.get(name)
+            if eng is not None and not hasattr(eng.wrapper, "model"):
+                # torn down from outside (e.g. a forced reset)
+                self._engines.pop(name)
+                eng = None
+
+            if eng is not None and eng.on_device:
+                self._touch(eng)
+                return eng.wrapper
+
+            if eng is not None:
+                self._make_room_on_device(eng.nbytes, keep=name)
+                self._to_device(eng)
+                self._touch(eng)
+                return eng.wrapper
+
+            self._make_room_on_device(None, keep=name)
+            wrapper = self.loader(name)
+            eng = _Engine(name, wrapper, torch.device(wrapper.device), self._nbytes(wrapper))
+            self._engines[name] = eng
+            self._touch(eng)
+            return wrapper
+
+    def resident(self) -> List[str]:
+        """
+        Names of resident engines, least recently used first.
+        """
+        with self._lock:
+            return list(self._engines.keys())
+
+    def is_parked(self, name: str) -> bool:
+        with self._lock:
+            eng = self._engines.get(name)
+            return eng is not None and not eng.on_device
+
+    def park(self, name: str) -> None:
+        """
+        Move engine `name` off the device into host memory (evicting it if it does not fit the RAM budget).
+        """
+        with self._lock:
+            eng = self._engines.get(name)
+            if eng is not None and eng.on_device:
+                self._park(eng)
+
+    def evict(self, name: str) -> None:
+        """
+        Drop engine `name` entirely.
+        """
+        with self._lock:
+            eng = self._engines.pop(name, None)
+            if eng is not None:
+                self._destroy(eng)
+        _release_device_cache()
+
+    def evict_idle(self, max_idle_s: Optional[float] = None) -> List[str]:
+        """
+        Evict parked engines unused for `max_idle_s` (default: `idle_timeout_s`). Returns their names.
+        """
+        max_idle_s = self.idle_timeout_s if max_idle_s is None else max_idle_s
+        if max_idle_s is None:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            names = [n for n, e in self._engines.items() if not e.on_device and now - e.last_used > max_idle_s]
+            for n in names:
+                self._destroy(self._engines.pop(n))
+        if names:
+            gc.collect()
+        return names
+
+    def release_all(self) -> None:
+        """
+        Forget every engine. Call after tearing engines down externally.
+        """
+        with self._lock:
+            for eng in self._engines.values():
+                self._destroy(eng)
+            self._engines.clear()
+        _release_device_cache()
+
+    def close(self) -> None:
+        self._stop.set()
+        self.release_all()
+
+    # internals
+    def _touch(self, eng: _Engine) -> None:
+        eng.last_used = time.monotonic()
+        self._engines.move_to_end(eng.name)
+
+    @staticmethod
+    def _nbytes(wrapper: Qwen3TTSModel) -> int:
+        model = wrapper.model
+        return sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers()))
+
+    @staticmethod
+    def _movable(eng: _Engine) -> bool:
+        # accelerate-dispatched models (offloaded / split across devices) carry hooks that pin them in place
+        device_map = getattr(eng.wrapper.model, "hf_device_map", None)
+        return not (device_map and len(set(str(d) for d in device_map.values())) > 1)
+
+    def _make_room_on_device(self, incoming: Optional[int], keep: str) -> None:
+        on_device = [e for e in self._engines.values() if e.on_device and e.name != keep]
+        if self.vram_budget_bytes is None or incoming is None:
+            victims = on_device
+        else:
+            used = sum(e.nbytes for e in on_device)
+            victims = []
+            for e in on_device:  # LRU first
+                if used + incoming <= self.vram_budget_bytes:
+                    break
+                victims.append(e)
+                used -= e.nbytes
+        for e in victims:
+            self._park(e)
+        if victims:
+            _release_device_cache()
+
+    def _park(self, eng: _Engine) -> None:
+        if not self._movable(eng) or eng.nbytes > self.ram_budget_bytes:
+            self._engines.pop(eng.name, None)
+            self._destroy(eng)
+            return
+        parked = [e for e in self._engines.values() if not e.on_device and e.name != eng.name]
+        used = sum(e.nbytes for e in parked)
+        for e in parked:  # LRU first
+            if used + eng.nbytes <= self.ram_budget_bytes:
+                break
+            self._engines.pop(e.name)
+            self._destroy(e)
+            used -= e.nbytes
+
+        eng.on_device = False
+        if eng.home_device.type == "cpu":
+            # already in host memory; parking only changes which budget it counts against
+            return
+        pin = self.pin_memory and eng.home_device.type == "cuda"
+        with torch.no_grad():
+            for t in list(eng.wrapper.model.parameters()) + list(eng.wrapper.model.buffers()):
+                host = t.data.to("cpu")
+                t.data = host.pin_memory() if pin else host
+        eng.wrapper.device = torch.device("cpu")
+
+    def _to_device(self, eng: _Engine) -> None:
+        eng.on_device = True
+        if eng.home_device.type == "cpu":
+            return
+        with torch.no_grad():
+            for t in list(eng.wrapper.model.parameters()) + list(eng.wrapper.model.buffers()):
+                t.data = t.data.to(eng.home_device, non_blocking=True)
+        if eng.home_device.type == "cuda":
+            torch.cuda.synchronize(eng.home_device)
+        eng.wrapper.device = eng.home_device
+
+    @staticmethod
+    def _destroy(eng: _Engine) -> None:
+        try:
+            del eng.wrapper.model
+        except AttributeError:
+            pass
+
+    def _reap_loop(self) -> None:
+        interval = max(min(float(self.idle_timeout_s) / 4.0, 60.0), 1.0)
+        while not self._stop.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"[EngineResidencyManager] idle eviction failed: {e}")
+
+
+__all__ = ["EngineResidencyManager"]
@@ -0,0 +1,626 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+UI-free render engine for Batch Director scripts.
+
+A script is the JSON list written by `BatchDirector.save_script`: one dict per block with `type`, `speaker`,
+`style`, `language`, `text`, `temp`, `top_p`, `seed`, `status` and `audio_file` (relative to the script, inside
+the `<script name>_audio/` companion folder). `SceneRenderer` applies the Batch Director's scheduling rules to it
+without any widgets:
+
+  - blocks are ordered by engine (the loaded engine first, clone blocks sorted by speaker) so each engine is
+    loaded once;
+  - clone prompts are built once per speaker and engine;
+  - consecutive blocks of one engine that share temperature, top-p and seed are rendered as one batched
+    `generate_*` call;
+  - random seeds are drawn at render time and written back into the blocks;
+  - blocks move `pending -> queued -> busy -> review | failed`, and `success` / `review` blocks whose audio still
+    exists are skipped.
+
+Blocks without a seed share one fresh seed per batch. Blocks with an explicit seed are only batched with blocks of
+the same seed, so a script saved from the Batch Director (which writes a distinct seed into every block) renders
+exactly as it does there.
+"""
+import json
+import os
+import random
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
+
+PRESET_SPEAKERS = (
+    "Vivian", "Serena", "Ryan", "Aiden", "Eric",
+    "Dylan", "Uncle_Fu", "Ono_Anna", "Sohee",
+)
+ENGINE_MODES = ("custom", "design", "base")
+DEFAULT_ENGINE_REPOS = {
+    "custom": "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice",
+    "design": "Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign",
+    "base": "Qwen/Qwen3-TTS-12Hz-1.7B-Base",
+}
+DONE_STATUSES = ("success", "review")
+
+_ENGINE_MODEL_TYPES = {"custom": "custom_voice", "design": "voice_design", "base": "base"}
+_ENGINE_ORDER = {
+    "base": ("base", "custom", "design"),
+    "design": ("design", "custom", "base"),
+}
+
+
+# scheduling rules shared with the Batch Director
+def block_engine(block_type: str, speaker: str) -> str:
+    """Engine mode (`custom`, `design` or `base`) a block needs."""
+    if block_type == "clone":
+        return "base"
+    if speaker in PRESET_SPEAKERS:
+        return "custom"
+    return "design"
+
+
+def order_by_engine(
+    items: Sequence[Any],
+    mode_of: Callable[[Any], str],
+    speaker_of: Callable[[Any], str],
+    current_mode: Optional[str] = None,
+) -> List[Any]:
+    """
+    Group `items` by engine, starting with `current_mode` (custom, design, base otherwise), with clone items
+    sorted by speaker so each clone prompt is locked once.
+    """
+    groups: Dict[str, List[Any]] = {mode: [] for mode in ENGINE_MODES}
+    for item in items:
+        groups[mode_of(item)].append(item)
+    groups["base"].sort(key=speaker_of)
+    return [item for mode in _ENGINE_ORDER.get(current_mode, ENGINE_MODES) for item in groups[mode]]
+
+
+def resolve_seed(raw: Any) -> Tuple[int, bool]:
+    """`(seed, is_new)`: the stored seed if it is a non-negative integer, else a fresh random one."""
+    try:
+        seed = int(str(raw).strip())
+        if seed >= 0:
+            return seed, False
+    except (TypeError, ValueError):
+        pass
+    return random.randint(0, 0xFFFFFFFF), True
+
+
+def normalize_language(language: Optional[str]) -> str:
+    # empty / "Auto" languages can hit meta-tensor crashes in some model builds
+    return "English" if not language or language == "Auto" else language
+
+
+def design_instruct(profile: Dict[str, Any], style_instruction: str = "") -> str:
+    """Voice design instruction of a design profile, prefixed with the block's style instruction."""
+    prof_instruct = profile.get("instruct", "")
+    return f"{style_instruction}. {prof_instruct}" if style_instruction else prof_instruct
+
+
+def audio_filename(index: int, speaker: str) -> str:
+    """Companion-folder file name of block `index` (0-based), e.g. `001_Ryan.wav`."""
+    spk_clean = "".join(x for x in (speaker or "") if x.isalnum())
+    return f"{index + 1:03d}_{spk_clean}.wav"
+
+
+def audio_dir_name(script_path: str) -> str:
+    return f"{os.path.splitext(os.path.basename(script_path))[0]}_audio"
+
+
+@dataclass
+class VoiceLibrary:
+    """
+    Named voices a script refers to, as stored in the Studio's `app_config.json`.
+
+    Args:
+        clone_voices (Dict[str, Dict]):
+            `saved_voices`: clone speaker -> `{"audio_path": ..., "transcript": ...}`.
+        design_profiles (Dict[str, Dict]):
+            design speaker -> `{"desc": ..., "instruct": ...}`.
+        style_instructions (Dict[str, str]):
+            style name -> instruction text.
+    """
+
+    clone_voices: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    design_profiles: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    style_instructions: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_app_config(cls, path: str) -> "VoiceLibrary":
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(
+            clone_voices=dict(config.get("saved_voices", {})),
+            design_profiles=dict(config.get("design_profiles", {})),
+            style_instructions=dict(config.get("style_instructions", {})),
+        )
+
+
+@dataclass
+class RenderJob:
+    """
+    One script block scheduled for rendering. `block` is the script entry itself; `seed` is `None` until a random
+    seed has been drawn for it.
+    """
+
+    index: int
+    block: Dict[str, Any]
+    mode: str
+    text: str
+    speaker: str
+    language: str
+    instruct: str
+    temperature: float
+    top_p: float
+    seed: Optional[int]
+    status: str = "pending"
+    error: Optional[str] = None
+    audio: Optional[np.ndarray] = None
+    sample_rate: int = 24000
+
+    def batch_key(self) -> Tuple:
+        # sampling options and the seed are applied per generate call, not per item
+        return (self.mode, self.temperature, self.top_p, self.seed)
+
+
+@dataclass
+class RenderReport:
+    """
+    Outcome and throughput of one `SceneRenderer.render` call.
+    """
+
+    blocks: int = 0
+    rendered: int = 0
+    failed: int = 0
+    skipped: int = 0
+    batches: int = 0
+    audio_seconds: float = 0.0
+    generate_seconds: float = 0.0
+    load_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    engines: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    workers: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio rendered per wall-clock second."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def blocks_per_minute(self) -> float:
+        return 60.0 * self.rendered / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def add_batch(self, batch: List[RenderJob], seconds: float, worker: Optional[str] = None) -> float:
+        """Account one rendered batch; returns the seconds of audio it produced."""
+        rendered = [j for j in batch if j.status == "review"]
+        audio = sum(len(j.audio) / j.sample_rate for j in rendered)
+        self.batches += 1
+        self.generate_seconds += seconds
+        self.audio_seconds += audio
+        for name, table in ((batch[0].mode, self.engines), (worker, self.workers)):
+            if name is None:
+                continue
+            stats = table.setdefault(name, dict(blocks=0, audio_seconds=0.0, generate_seconds=0.0))
+            stats["blocks"] += len(rendered)
+            stats["audio_seconds"] += audio
+            stats["generate_seconds"] += seconds
+        return audio
+
+    def finish(self, jobs: Sequence[RenderJob], wall_seconds: float) -> None:
+        self.rendered = sum(j.status == "review" for j in jobs)
+        self.failed = sum(j.status == "failed" for j in jobs)
+        self.wall_seconds = wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out.update(realtime_factor=self.realtime_factor, blocks_per_minute=self.blocks_per_minute)
+        return out
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.rendered}/{self.blocks} blocks rendered, {self.failed} failed, {self.skipped} skipped "
+            f"in {self.batches} batches",
+            f"{self.audio_seconds:.1f} s of audio in {self.wall_seconds:.1f} s "
+            f"({self.realtime_factor:.2f}x realtime, {self.blocks_per_minute:.1f} blocks/min; "
+            f"generate {self.generate_seconds:.1f} s, engine loads {self.load_seconds:.1f} s)",
+        ]
+        for name, stats in list(self.engines.items()) + list(self.workers.items()):
+            rtf = stats["audio_seconds"] / stats["generate_seconds"] if stats["generate_seconds"] > 0 else 0.0
+            lines.append(
+                f"  {name:<6}: {int(stats['blocks'])} blocks, {stats['audio_seconds']:.1f} s audio, "
+                f"{stats['generate_seconds']:.1f} s generate ({rtf:.2f}x realtime)"
+            )
+        return "\n".join(lines)
+
+
+class SceneRenderer:
+    """
+    Renders Batch Director scripts with batched generation.
+
+    Usage:
+        renderer = SceneRenderer(lambda mode: Qwen3TTSModel.from_pretrained(paths[mode], ...), library)
+        report = renderer.render_file("scene.json")   # writes scene.json + scene_audio/
+        print(report.summary())
+
+    Args:
+        engines (Callable[[str], Qwen3TTSModel]):
+            Returns the loaded engine for a mode (`custom`, `design` or `base`), e.g.
+            `EngineResidencyManager.acquire`. Called once per engine group.
+        library (Optional[VoiceLibrary]):
+            Clone voices, design profiles and style instructions the script refers to.
+        max_batch_size (int):
+            Upper bound on blocks per `generate_*` call. The engine's memory planner may split further.
+        on_status (Optional[Callable[[RenderJob], None]]):
+            Called on every status transition of a job.
+        log (Optional[Callable[[str], None]]):
+            Progress lines (`print` by default, `None` to silence).
+    """
+
+    def __init__(
+        self,
+        engines: Callable[[str], "Qwen3TTSModel"],
+        library: Optional[VoiceLibrary] = None,
+        max_batch_size: int = 8,
+        on_status: Optional[Callable[[RenderJob], None]] = None,
+        log: Optional[Callable[[str], None]] = print,
+    ):
+        self.engines = engines
+        self.library = library if library is not None else VoiceLibrary()
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.on_status = on_status
+        self.log = log or (lambda _msg: None)
+        self._prompts: Dict[str, "VoiceClonePromptItem"] = {}
+        self._mode: Optional[str] = None
+
+    # planning
+    def plan(
+        self,
+        script: List[Dict[str, Any]],
+        base_dir: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> List[RenderJob]:
+        """
+        Jobs for the blocks that need rendering, in engine order. Blocks with no text fail right away; blocks
+        already `success` / `review` with their audio on disk are skipped unless `retry`.
+        """
+        jobs = []
+        for i, block in enumerate(script):
+            if not retry and block.get("status") in DONE_STATUSES and self._existing_audio(block, base_dir):
+                continue
+            speaker = block.get("speaker", "")
+            mode = block_engine(block.get("type", block.get("block_type", "standard")), speaker)
+            seed, is_new = resolve_seed(block.get("seed", ""))
+            job = RenderJob(
+                index=i,
+                block=block,
+                mode=mode,
+                text=(block.get("text") or "").strip(),
+                speaker=speaker,
+                language=normalize_language(block.get("language")),
+                instruct=self.library.style_instructions.get(block.get("style", ""), ""),
+                temperature=float(block.get("temp", 0.8)),
+                top_p=float(block.get("top_p", 0.8)),
+                seed=None if is_new else seed,
+            )
+            if not job.text:
+                self.set_status(job, "failed", "Block has no text")
+            elif mode == "design":
+                profile = self.library.design_profiles.get(speaker)
+                if not profile:
+                    self.set_status(job, "failed", f"Profile '{speaker}' not found")
+                else:
+                    # the profile's `desc` is not an input of the VoiceDesign model, only its instruct is
+                    job.instruct = design_instruct(profile, job.instruct)
+            elif mode == "base":
+                audio_path = (self.library.clone_voices.get(speaker) or {}).get("audio_path")
+                if not audio_path or not os.path.exists(audio_path):
+                    self.set_status(job, "failed", f"Source audio missing for clone voice '{speaker}'")
+            jobs.append(job)
+        return order_by_engine(jobs, lambda j: j.mode, lambda j: j.speaker, current_mode)
+
+    def batches(self, jobs: List[RenderJob]) -> List[List[RenderJob]]:
+        """
+        Split engine-ordered `jobs` into batches of compatible jobs, keeping the engine order.
+        """
+        out: List[List[RenderJob]] = []
+        for mode in dict.fromkeys(j.mode for j in jobs):
+            groups: Dict[Tuple, List[RenderJob]] = {}
+            for job in jobs:
+                if job.mode == mode and job.status != "failed":
+                    groups.setdefault(job.batch_key(), []).append(job)
+            for group in groups.values():
+                out.extend(group[i:i + self.max_batch_size] for i in range(0, len(group), self.max_batch_size))
+        return out
+
+    # rendering
+    def render(
+        self,
+        script: List[Dict[str, Any]],
+        base_dir: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> Tuple[List[RenderJob], RenderReport]:
+        """
+        Render `script` in place: statuses and seeds are written back into its blocks. The audio stays on the
+        returned jobs; `write_script` saves it.
+
+        Returns:
+            `(jobs, report)`.
+        """
+        started = time.perf_counter()
+        jobs, batches, report = self.prepare(script, base_dir=base_dir, retry=retry, current_mode=current_mode)
+
+        mode, model, error = None, None, None
+        for n, batch in enumerate(batches, 1):
+            if batch[0].mode != mode:
+                mode = batch[0].mode
+                load_started = time.perf_counter()
+                try:
+                    model = self.engine(mode)
+                except Exception as e:
+                    model = None
+                    self.log(f"[SceneRenderer] Failed to load the {mode} engine: {e}")
+                    error = str(e)
+                report.load_seconds += time.perf_counter() - load_started
+            if model is None:
+                for job in batch:
+                    self.set_status(job, "failed", error)
+                continue
+
+            gen_started = time.perf_counter()
+            if not self.render_batch(model, batch):
+                continue
+            seconds = time.perf_counter() - gen_started
+            audio = report.add_batch(batch, seconds)
+            self.log(
+                f"[{n}/{len(batches)}] {mode} x{len(batch)}: {audio:.1f} s audio in {seconds:.2f} s "
+                f"({audio / seconds if seconds > 0 else 0.0:.2f}x realtime)"
+            )
+
+        report.finish(jobs, time.perf_counter() - started)
+        return jobs, report
+
+    def prepare(
+        self,
+        script: List[Dict[str, Any]],
+        base_dir: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> Tuple[List[RenderJob], List[List[RenderJob]], RenderReport]:
+        """
+        Plan `script`, split the jobs into batches and fix every batch's seed, so the batches can be rendered in
+        any order or process with the same result. Jobs to render are `queued` afterwards.
+
+        Returns:
+            `(jobs, batches, report)`, the report holding the block counts only.
+        """
+        jobs = self.plan(script, base_dir=base_dir, retry=retry, current_mode=current_mode)
+        batches = self.batches(jobs)
+        for batch in batches:
+            self.assign_seed(batch)
+        for job in jobs:
+            if job.status != "failed":
+                self.set_status(job, "queued")
+        return jobs, batches, RenderReport(blocks=len(script), skipped=len(script) - len(jobs))
+
+    def engine(self, mode: str) -> "Qwen3TTSModel":
+        """
+        The engine for `mode`. Clone prompts are engine-specific, so they are dropped when the mode changes.
+        """
+        if mode != self._mode:
+            self._prompts = {}
+            self._mode = None
+        model = self._acquire(mode)
+        self._mode = mode
+        return model
+
+    @property
+    def active_mode(self) -> Optional[str]:
+        """Mode of the engine returned by the last `engine` call."""
+        return self._mode
+
+    @property
+    def locked_voices(self) -> List[str]:
+        """Clone voices whose prompts are cached for the active engine."""
+        return list(self._prompts)
+
+    @staticmethod
+    def assign_seed(batch: List[RenderJob]) -> int:
+        """
+        Give every job of `batch` the batch seed (the jobs' own, or a fresh random one) and write it back.
+        """
+        seed = batch[0].seed
+        if seed is None:
+            seed, _ = resolve_seed(None)
+        for job in batch:
+            job.seed = seed
+            job.block["seed"] = str(seed)
+        return seed
+
+    def render_batch(self, model: "Qwen3TTSModel", batch: List[RenderJob]) -> bool:
+        """
+        Render one batch of compatible jobs with a single `generate_*` call. Seeds are drawn (one per batch) and
+        written back for jobs without one; jobs end up `review` with their audio set, or `failed`.
+
+        Returns:
+            bool: whether `generate_*` ran (False when every job failed before it).
+        """
+        seed = self.assign_seed(batch)
+        for job in batch:
+            self.set_status(job, "busy")
+
+        if batch[0].mode == "base":
+            ready = []
+            for job in batch:
+                try:
+                    self._clone_prompt(model, job.speaker)
+                    ready.append(job)
+                except Exception as e:
+                    self.set_status(job, "failed", str(e))
+            batch = ready
+            if not batch:
+                return False
+
+        options = dict(temperature=batch[0].temperature, top_p=batch[0].top_p, seed=seed)
+        texts = [j.text for j in batch]
+        languages = [j.language for j in batch]
+        try:
+            if batch[0].mode == "custom":
+                wavs, sr = model.generate_custom_voice(
+                    text=texts, speaker=[j.speaker for j in batch], instruct=[j.instruct for j in batch],
+                    language=languages, **options,
+                )
+            elif batch[0].mode == "design":
+                wavs, sr = model.generate_voice_design(
+                    text=texts, instruct=[j.instruct for j in batch], language=languages, **options,
+                )
+            else:
+                wavs, sr = model.generate_voice_clone(
+                    text=texts, language=languages,
+                    voice_clone_prompt=[self._prompts[j.speaker] for j in batch], **options,
+                )
+        except Exception as e:
+            for job in batch:
+                self.set_status(job, "failed", str(e))
+            return True
+
+        for job, wav in zip(batch, wavs):
+            job.audio, job.sample_rate = wav, sr
+            self.set_status(job, "review")
+        return True
+
+    def render_file(
+        self,
+        script_path: str,
+        output_path: Optional[str] = None,
+        retry: bool = False,
+        current_mode: Optional[str] = None,
+    ) -> RenderReport:
+        """
+        Render a saved script and write it (to `output_path`, or back to `script_path`) with its `_audio` folder.
+        """
+        with open(script_path, "r", encoding="utf-8") as f:
+            script = json.load(f)
+        if not isinstance(script, list):
+            raise ValueError(f"{script_path} is not a Batch Director script (expected a JSON list of blocks).")
+        base_dir = os.path.dirname(os.path.abspath(script_path))
+        jobs, report = self.render(script, base_dir=base_dir, retry=retry, current_mode=current_mode)
+        write_script(output_path or script_path, script, jobs, source_dir=base_dir)
+        return report
+
+    # internals
+    def _acquire(self, mode: str) -> "Qwen3TTSModel":
+        model = self.engines(mode)
+        loaded = getattr(getattr(model, "model", None), "tts_model_type", None)
+        if loaded != _ENGINE_MODEL_TYPES[mode]:
+            raise ValueError(f"Engine for '{mode}' is a '{loaded}' model, expected '{_ENGINE_MODEL_TYPES[mode]}'.")
+        return model
+
+    def _clone_prompt(self, model: "Qwen3TTSModel", speaker: str) -> "VoiceClonePromptItem":
+        if speaker not in self._prompts:
+            profile = self.library.clone_voices[speaker]
+            self.log(f"Locking voice: {speaker}...")
+            self._prompts[speaker] = model.create_voice_clone_prompt(
+                ref_audio=profile["audio_path"], ref_text=profile.get("transcript")
+            )[0]
+        return self._prompts[speaker]
+
+    def set_status(self, job: RenderJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.block["status"] = status
+        if error is not None:
+            job.error = error
+            self.log(f"Block {job.index + 1} failed: {error}")
+        if self.on_status is not None:
+            self.on_status(job)
+
+    @staticmethod
+    def _existing_audio(block: Dict[str, Any], base_dir: Optional[str]) -> Optional[str]:
+        audio_file = block.get("audio_file")
+        if not audio_file or not base_dir:
+            return None
+        path = os.path.join(base_dir, os.path.normpath(audio_file))
+        return path if os.path.exists(path) else None
+
+
+def write_script(
+    script_path: str,
+    script: List[Dict[str, Any]],
+    jobs: Sequence[RenderJob] = (),
+    source_dir: Optional[str] = None,
+) -> None:
+    """
+    Save `script` in the `BatchDirector.save_script` format: audio of `success` / `review` blocks goes to the
+    `<name>_audio/` companion folder as `001_Speaker.wav`, referenced by a relative `audio_file`.
+
+    Args:
+        script_path (str):
+            JSON file to write.
+        script (List[Dict]):
+            The blocks.
+        jobs (Sequence[RenderJob]):
+            Rendered jobs; their audio is written for their blocks.
+        source_dir (Optional[str]):
+            Directory the script was loaded from, to carry over audio of blocks that were not re-rendered.
+    """
+    import soundfile as sf
+
+    base_dir = os.path.dirname(os.path.abspath(script_path))
+    dir_name = audio_dir_name(script_path)
+    audio_dir = os.path.join(base_dir, dir_name)
+    rendered = {job.index: job for job in jobs if job.audio is not None}
+
+    for i, block in enumerate(script):
+        job = rendered.get(i)
+        source = None if job is not None else SceneRenderer._existing_audio(block, source_dir)
+        if block.get("status") not in DONE_STATUSES or (job is None and source is None):
+            block["audio_file"] = None
+            continue
+        os.makedirs(audio_dir, exist_ok=True)
+        filename = audio_filename(i, block.get("speaker", ""))
+        path = os.path.join(audio_dir, filename)
+        if job is not None:
+            sf.write(path, job.audio, job.sample_rate)
+        elif os.path.abspath(source) != os.path.abspath(path):
+            shutil.copyfile(source, path)
+        # relative path, so the folder and the JSON can be moved together
+        block["audio_file"] = os.path.join(dir_name, filename).replace("\\", "/")
+
+    with open(script_path, "w", encoding="utf-8") as f:
+        json.dump(script, f, indent=2)
+
+
+__all__ = [
+    "DEFAULT_ENGINE_REPOS",
+    "ENGINE_MODES",
+    "PRESET_SPEAKERS",
+    "RenderJob",
+    "RenderReport",
+    "SceneRenderer",
+    "VoiceLibrary",
+    "audio_filename",
+    "block_engine",
+    "design_instruct",
+    "order_by_engine",
+    "resolve_seed",
+    "write_script",
+]
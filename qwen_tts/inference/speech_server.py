@@ -0,0 +1,683 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+OpenAI-style HTTP speech server on top of `AsyncQwen3TTS` (standard library only).
+
+Endpoints:
+
+    POST   /v1/audio/speech   {"input": ..., "voice": ..., "instructions": ..., "response_format": "wav"|"pcm"|"opus"}
+    POST   /v1/voices         register a voice clone prompt: {"audio": base64 file | "audio_url": path or URL,
+                              "ref_text": ..., "x_vector_only_mode": false, "id": optional}; `audio_url` is
+                              refused unless the server allows it (`voice_audio_dirs`, `allow_audio_urls`)
+    GET    /v1/voices         list registered prompts;  DELETE /v1/voices/<id> drops one
+    GET    /v1/models         the loaded engine
+    GET    /metrics           Prometheus text format
+    GET    /health
+
+The meaning of `voice` follows the loaded engine: a speaker name (CustomVoice), unused (VoiceDesign, which takes
+the voice description in `instructions`), or a registered prompt id (Base).
+
+Input text is split into sentence-packed segments that are all queued at once, so segments of one request and of
+concurrent requests share `generate_*` batches. Audio is written with chunked transfer encoding segment by
+segment, in order, as soon as each one is ready (`"stream": false` returns one complete body instead). Headers are
+sent with the first segment, so a request that fails before any audio still gets a proper error status.
+"""
+import asyncio
+import base64
+import binascii
+import io
+import json
+import os
+import re
+import struct
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from .async_engine import AsyncQwen3TTS
+from .metrics import STAGES, MetricsAggregator
+from .qwen3_tts_model import _SENTENCE_SPLIT_RE, Qwen3TTSModel, VoiceClonePromptItem, _join_pieces
+
+RESPONSE_FORMATS = ("wav", "pcm", "opus")
+_CONTENT_TYPES = {"wav": "audio/wav", "pcm": "audio/pcm", "opus": "audio/ogg; codecs=opus"}
+# request fields forwarded to generate_* as sampling options
+_OPTION_KEYS = (
+    "seed",
+    "do_sample",
+    "temperature",
+    "top_k",
+    "top_p",
+    "repetition_penalty",
+    "max_new_tokens",
+    "subtalker_dosample",
+    "subtalker_top_k",
+    "subtalker_top_p",
+    "subtalker_temperature",
+)
+_VOICE_ID_RE = re.compile(r"^[A-Za-z0-9_.\-]{1,64}$")
+_REMOTE_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+_MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, error_type: str = "invalid_request_error"):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+
+
+def split_for_streaming(text: str, max_chars: int = 300) -> List[Tuple[str, bool]]:
+    """
+    Split `text` into `(segment, ends_paragraph)` pairs: paragraphs (blank lines or `||` cues) are kept apart and
+    whole sentences are packed up to `max_chars` characters. A longer sentence becomes a segment of its own.
+    """
+    segments: List[Tuple[str, bool]] = []
+    for paragraph in re.split(r"\n\s*\n", text.replace("||", "\n\n")):
+        paragraph = re.sub(r"\s+", " ", paragraph).strip()
+        current: List[str] = []
+        length = 0
+        for sentence in _SENTENCE_SPLIT_RE.split(paragraph):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if current and length + 1 + len(sentence) > max_chars:
+                segments.append((_join_pieces(current), False))
+                current, length = [], 0
+            current.append(sentence)
+            length += len(sentence) + 1
+        if current:
+            segments.append((_join_pieces(current), True))
+    return segments
+
+
+def _wav_header(sample_rate: int, data_bytes: Optional[int] = None) -> bytes:
+    # 16-bit mono PCM; an unknown length (streaming) uses the 0xFFFFFFFF convention most readers accept
+    data = 0xFFFFFFFF if data_bytes is None else data_bytes
+    riff = 0xFFFFFFFF if data_bytes is None else 36 + data_bytes
+    return (
+        b"RIFF" + struct.pack("<I", riff) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", data)
+    )
+
+
+def _to_pcm16(wav: np.ndarray) -> bytes:
+    return (np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+class _ByteSink:
+    """Write-only file object collecting what soundfile writes, drained after every write."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=0) -> int:
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out, self._chunks = b"".join(self._chunks), []
+        return out
+
+
+class AudioStreamEncoder:
+    """
+    Incremental encoder for one response: `begin()`, then `encode(chunk)` per chunk, then `finish()`. Each call
+    returns the bytes ready to send (possibly empty: Ogg pages are emitted as they fill).
+    """
+
+    def __init__(self, response_format: str, sample_rate: int):
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unsupported response_format {response_format!r}; choose from {list(RESPONSE_FORMATS)}")
+        self.format = response_format
+        self.sample_rate = int(sample_rate)
+        self.content_type = _CONTENT_TYPES[response_format]
+        self._sink = None
+        self._file = None
+        if response_format == "opus":
+            self._sink = _ByteSink()
+            self._file = sf.SoundFile(
+                self._sink, mode="w", samplerate=self.sample_rate, channels=1, format="OGG", subtype="OPUS"
+            )
+
+    def begin(self) -> bytes:
+        return _wav_header(self.sample_rate) if self.format == "wav" else b""
+
+    def encode(self, wav: np.ndarray) -> bytes:
+        if self._file is None:
+            return _to_pcm16(wav)
+        self._file.write(np.asarray(wav, dtype=np.float32))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        if self._file is None:
+            return b""
+        self._file.close()
+        return self._sink.drain()
+
+
+def encode_audio(wav: np.ndarray, response_format: str, sample_rate: int) -> bytes:
+    """
+    Encode a complete clip (non-streaming responses): a WAV with exact sizes, raw PCM16 or Ogg/Opus.
+    """
+    if response_format == "wav":
+        pcm = _to_pcm16(wav)
+        return _wav_header(sample_rate, len(pcm)) + pcm
+    encoder = AudioStreamEncoder(response_format, sample_rate)
+    return encoder.begin() + encoder.encode(wav) + encoder.finish()
+
+
+class ServerMetrics:
+    """
+    Thread-safe request counters, rendered in the Prometheus text format by `render`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.in_flight = 0
+        self.segments = 0
+        self.audio_seconds = 0.0
+        self.disconnects = 0
+        self.request_seconds = [0.0, 0]
+        self.first_audio_seconds = [0.0, 0]
+        self.started_at = time.time()
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, endpoint: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(endpoint, status)] += 1
+            self.request_seconds[0] += seconds
+            self.request_seconds[1] += 1
+
+    def observe_audio(self, seconds: float, segments: int = 1) -> None:
+        with self._lock:
+            self.audio_seconds += seconds
+            self.segments += segments
+
+    def observe_first_audio(self, seconds: float) -> None:
+        with self._lock:
+            self.first_audio_seconds[0] += seconds
+            self.first_audio_seconds[1] += 1
+
+    def observe_disconnect(self) -> None:
+        with self._lock:
+            self.disconnects += 1
+
+    def render(self, stages: Optional[Dict[str, Any]] = None) -> str:
+        def metric(name, kind, help_text, samples):
+            out = [f"# HELP qwen_tts_{name} {help_text}", f"# TYPE qwen_tts_{name} {kind}"]
+            out += [f"qwen_tts_{name}{labels} {value:.6g}" for labels, value in samples]
+            return out
+
+        with self._lock:
+            lines = metric(
+                "requests_total", "counter", "HTTP requests by endpoint and status.",
+                [(f'{{endpoint="{e}",status="{s}"}}', n) for (e, s), n in sorted(self.requests.items())],
+            )
+            lines += metric("requests_in_flight", "gauge", "Requests being served.", [("", self.in_flight)])
+            lines += metric("request_seconds", "summary", "Wall time per request.", [
+                ("_sum", self.request_seconds[0]), ("_count", self.request_seconds[1])])
+            lines += metric("time_to_first_audio_seconds", "summary", "Request start to first audio byte.", [
+                ("_sum", self.first_audio_seconds[0]), ("_count", self.first_audio_seconds[1])])
+            lines += metric("audio_seconds_total", "counter", "Audio generated.", [("", self.audio_seconds)])
+            lines += metric("segments_total", "counter", "Text segments synthesized.", [("", self.segments)])
+            lines += metric("client_disconnects_total", "counter", "Streams aborted by the client.",
+                            [("", self.disconnects)])
+            lines += metric("uptime_seconds", "gauge", "Seconds since start.", [("", time.time() - self.started_at)])
+        if stages:
+            lines += metric("generate_calls_total", "counter", "Batched generate_* calls.", [("", stages["calls"])])
+            lines += metric("generate_frames_total", "counter", "Codec frames generated.", [("", stages["frames"])])
+            lines += metric("stage_seconds_total", "counter", "Time per generation stage.", [
+                (f'{{stage="{s}"}}', stages[f"{s}_s"]) for s in STAGES + ("other",)])
+        return "\n".join(lines) + "\n"
+
+
+class SpeechServer:
+    """
+    HTTP front-end for one loaded engine. Requests are served on handler threads; generation runs on the
+    micro-batching `AsyncQwen3TTS` engine, whose event loop lives on a background thread.
+
+    Usage:
+        server = SpeechServer(Qwen3TTSModel.from_pretrained(...), port=8000)
+        server.serve_forever()          # or server.start() ... server.shutdown()
+
+    Args:
+        model (Qwen3TTSModel):
+            The loaded engine.
+        host, port:
+            Bind address. Port 0 picks a free port (see `address`).
+        max_batch_size, max_wait_ms:
+            Micro-batching settings of the underlying `AsyncQwen3TTS`.
+        max_segment_chars (int):
+            Segment size for streaming; smaller segments reach the first audio sooner.
+        pause_ms, paragraph_pause_ms:
+            Silence between segments of a paragraph and after a paragraph.
+        generate_defaults (Optional[Dict[str, Any]]):
+            Sampling options applied when a request does not set them.
+        stage_metrics (bool):
+            Also time every generate call per stage for `/metrics` (synchronizes CUDA at stage boundaries).
+        model_name (Optional[str]):
+            Id reported by `/v1/models`.
+        access_log (bool):
+            Log every request to stderr.
+        voice_audio_dirs (Sequence[str]):
+            Directories whose files `POST /v1/voices` may name in `audio_url`. Empty by default, so clients can
+            only upload base64 `audio` and never make the server read its own files.
+        allow_audio_urls (bool):
+            Let `audio_url` be an http(s) URL the server downloads. Off by default: the server would fetch
+            whatever address a client names.
+    """
+
+    def __init__(
+        self,
+        model: Qwen3TTSModel,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_segment_chars: int = 300,
+        pause_ms: float = 120.0,
+        paragraph_pause_ms: float = 400.0,
+        generate_defaults: Optional[Dict[str, Any]] = None,
+        stage_metrics: bool = False,
+        model_name: Optional[str] = None,
+        access_log: bool = True,
+        voice_audio_dirs: Sequence[str] = (),
+        allow_audio_urls: bool = False,
+    ):
+        self.model = model
+        self.mode = model.model.tts_model_type
+        self.sample_rate = int(model.model.speech_tokenizer.get_output_sample_rate())
+        self.max_segment_chars = max(int(max_segment_chars), 1)
+        self.pause_ms = float(pause_ms)
+        self.paragraph_pause_ms = float(paragraph_pause_ms)
+        self.generate_defaults = dict(generate_defaults or {})
+        self.model_name = model_name or "qwen3-tts"
+        self.access_log = access_log
+        self.voice_audio_dirs = [os.path.realpath(d) for d in voice_audio_dirs]
+        self.allow_audio_urls = bool(allow_audio_urls)
+        self.metrics = ServerMetrics()
+        self.voices: Dict[str, VoiceClonePromptItem] = {}
+        self._voices_lock = threading.Lock()
+
+        self._stage_metrics = MetricsAggregator() if stage_metrics else None
+        if self._stage_metrics is not None:
+            model.add_metrics_hook(self._stage_metrics)
+        self.engine = AsyncQwen3TTS(model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="qwen-tts-serve-loop", daemon=True)
+        self._httpd = ThreadingHTTPServer((host, port), type("_BoundHandler", (_SpeechRequestHandler,), {"app": self}))
+        self._httpd.daemon_threads = True
+        self._serve_thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return host, port
+
+    def serve_forever(self) -> None:
+        if not self._loop_thread.is_alive():
+            self._loop_thread.start()
+        self._httpd.serve_forever()
+
+    def start(self) -> "SpeechServer":
+        """Serve on a background thread and return immediately."""
+        self._serve_thread = threading.Thread(target=self.serve_forever, name="qwen-tts-serve", daemon=True)
+        self._serve_thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._loop_thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.engine.close(), self._loop).result(timeout=30)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=30)
+        if self._stage_metrics is not None:
+            self.model.remove_metrics_hook(self._stage_metrics)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # voices
+    def register_voice(
+        self,
+        ref_audio: Any,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+        voice_id: Optional[str] = None,
+    ) -> str:
+        """
+        Build a voice clone prompt (on the inference thread) and register it under `voice_id`; returns the id.
+        """
+        if self.mode != "base":
+            raise HTTPError(400, f"Voice clone prompts need a Base engine; this server runs '{self.mode}'.")
+        if voice_id is not None and not _VOICE_ID_RE.match(voice_id):
+            raise HTTPError(400, "Voice ids are 1-64 characters of letters, digits, '_', '.' or '-'.")
+        if not x_vector_only_mode and not ref_text:
+            raise HTTPError(400, "`ref_text` is required unless `x_vector_only_mode` is true.")
+        if not self._loop_thread.is_alive():
+            self._loop_thread.start()
+        item = self._run(self.engine.create_voice_clone_prompt(ref_audio, ref_text, x_vector_only_mode)).result()
+        voice_id = voice_id or f"voice_{uuid.uuid4().hex[:12]}"
+        with self._voices_lock:
+            self.voices[voice_id] = item
+        return voice_id
+
+    def resolve_audio_url(self, audio_url: str) -> str:
+        """
+        The reference audio a client's `audio_url` may load: an http(s) URL when `allow_audio_urls` is set, or a
+        file inside one of `voice_audio_dirs` (relative paths are taken from each directory, symlinks resolved).
+        Anything else raises `HTTPError(403)`.
+        """
+        if _REMOTE_URL_RE.match(audio_url):
+            if not self.allow_audio_urls:
+                raise HTTPError(403, "This server does not download `audio_url` URLs; send the file as base64 "
+                                     "`audio`.", "permission_error")
+            return audio_url
+        for root in self.voice_audio_dirs:
+            path = os.path.realpath(os.path.join(root, audio_url))
+            if os.path.commonpath([root, path]) == root and os.path.isfile(path):
+                return path
+        raise HTTPError(403, "`audio_url` must name a file inside the server's voice audio directories; send the "
+                             "file as base64 `audio` instead.", "permission_error")
+
+    def _voice(self, voice_id: Optional[str]) -> VoiceClonePromptItem:
+        with self._voices_lock:
+            item = self.voices.get(voice_id or "")
+        if item is None:
+            raise HTTPError(404, f"Unknown voice {voice_id!r}; register it with POST /v1/voices.", "not_found_error")
+        return item
+
+    # speech
+    def _speech_request(self, body: Dict[str, Any]):
+        """
+        Validate a `/v1/audio/speech` body. Returns `(segments, submit, response_format, stream)`.
+        """
+        text = body.get("input")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, "`input` must be a non-empty string.")
+        response_format = body.get("response_format", "wav")
+        if response_format not in RESPONSE_FORMATS:
+            raise HTTPError(400, f"`response_format` must be one of {list(RESPONSE_FORMATS)}.")
+        language = body.get("language") or "Auto"
+        options = dict(self.generate_defaults)
+        options.update({k: body[k] for k in _OPTION_KEYS if body.get(k) is not None})
+        instructions = body.get("instructions") or ""
+        voice = body.get("voice")
+        try:
+            self.model._validate_languages([language])
+            if self.mode == "custom_voice":
+                if not voice:
+                    raise HTTPError(400, "`voice` (a speaker name) is required for a CustomVoice engine.")
+                self.model._validate_speakers([voice])
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        if self.mode == "custom_voice":
+            def submit(segment):
+                return self.engine.generate_custom_voice(
+                    segment, speaker=voice, language=language, instruct=instructions, **options
+                )
+        elif self.mode == "voice_design":
+            if not instructions:
+                raise HTTPError(400, "`instructions` (the voice description) is required for a VoiceDesign engine.")
+
+            def submit(segment):
+                return self.engine.generate_voice_design(segment, instruct=instructions, language=language, **options)
+        else:
+            prompt = self._voice(voice)
+
+            def submit(segment):
+                return self.engine.generate_voice_clone(segment, language=language, voice_clone_prompt=prompt, **options)
+
+        segments = split_for_streaming(text, self.max_segment_chars)
+        if not segments:
+            raise HTTPError(400, "`input` has no text to speak (only pause cues and whitespace).")
+        return segments, submit, response_format, bool(body.get("stream", True))
+
+    def handle_speech(self, handler: "_SpeechRequestHandler", body: Dict[str, Any], started: float) -> int:
+        segments, submit, response_format, stream = self._speech_request(body)
+        if not self._loop_thread.is_alive():
+            self._loop_thread.start()
+        # queue every segment now so they batch with each other and with concurrent requests
+        futures = [self._run(submit(segment)) for segment, _ in segments]
+        gaps = [
+            np.zeros(int(self.sample_rate * (self.paragraph_pause_ms if ends else self.pause_ms) / 1000.0), np.float32)
+            for _, ends in segments
+        ]
+        gaps[-1] = gaps[-1][:0]
+        try:
+            if not stream:
+                wavs = []
+                for future, gap in zip(futures, gaps):
+                    wavs += [future.result()[0], gap]
+                wav = np.concatenate(wavs)
+                self.metrics.observe_audio(len(wav) / self.sample_rate, len(segments))
+                handler.send_body(200, encode_audio(wav, response_format, self.sample_rate),
+                                  _CONTENT_TYPES[response_format], {"X-Sample-Rate": str(self.sample_rate)})
+                return 200
+
+            encoder = AudioStreamEncoder(response_format, self.sample_rate)
+            for i, (future, gap) in enumerate(zip(futures, gaps)):
+                wav, _ = future.result()
+                if i == 0:
+                    self.metrics.observe_first_audio(time.perf_counter() - started)
+                    handler.begin_chunked(200, encoder.content_type, {"X-Sample-Rate": str(self.sample_rate)})
+                    handler.write_chunk(encoder.begin())
+                handler.write_chunk(encoder.encode(np.concatenate([wav, gap]) if len(gap) else wav))
+                self.metrics.observe_audio(len(wav) / self.sample_rate)
+            handler.write_chunk(encoder.finish())
+            handler.end_chunked()
+            return 200
+        except (BrokenPipeError, ConnectionResetError):
+            self.metrics.observe_disconnect()
+            handler.close_connection = True
+            return 499
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def render_metrics(self) -> str:
+        return self.metrics.render(self._stage_metrics.summary() if self._stage_metrics is not None else None)
+
+
+class _SpeechRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "qwen-tts-serve"
+    app: SpeechServer = None
+    _chunked = False
+
+    def log_message(self, format, *args) -> None:
+        if self.app.access_log:
+            super().log_message(format, *args)
+
+    # responses
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, payload: Any) -> None:
+        self.send_body(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def send_error_json(self, status: int, message: str, error_type: str = "invalid_request_error") -> None:
+        self.send_json(status, {"error": {"message": message, "type": error_type}})
+
+    def begin_chunked(self, status: int, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self._chunked = True
+
+    def write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(b"%x\r\n" % len(data) + data + b"\r\n")
+            self.wfile.flush()
+
+    def end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > _MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body over {_MAX_BODY_BYTES} bytes.")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON.")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object.")
+        return body
+
+    # routing
+    def _dispatch(self, endpoint: str, fn) -> None:
+        started = time.perf_counter()
+        self._chunked = False
+        self.app.metrics.begin()
+        status = 500
+        try:
+            status = fn(started)
+        except HTTPError as e:
+            status = e.status
+            self.send_error_json(e.status, str(e), e.error_type)
+        except (BrokenPipeError, ConnectionResetError):
+            status = 499
+            self.close_connection = True
+        except Exception as e:
+            if self._chunked:
+                # audio already went out: the only honest signal left is an unterminated stream
+                self.close_connection = True
+            else:
+                self.send_error_json(500, f"{type(e).__name__}: {e}", "server_error")
+        finally:
+            self.app.metrics.end(endpoint, status, time.perf_counter() - started)
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self._dispatch("health", lambda _: self.send_json(200, {"status": "ok"}) or 200)
+        elif path == "/metrics":
+            self._dispatch("metrics", lambda _: self.send_body(
+                200, self.app.render_metrics().encode("utf-8"), "text/plain; version=0.0.4") or 200)
+        elif path == "/v1/models":
+            self._dispatch("models", lambda _: self.send_json(200, {"object": "list", "data": [{
+                "id": self.app.model_name, "object": "model", "tts_model_type": self.app.mode,
+                "sample_rate": self.app.sample_rate}]}) or 200)
+        elif path == "/v1/voices":
+            self._dispatch("voices", self._list_voices)
+        else:
+            self._dispatch("unknown", self._not_found)
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/v1/audio/speech":
+            self._dispatch("speech", lambda started: self.app.handle_speech(self, self._read_json(), started))
+        elif path == "/v1/voices":
+            self._dispatch("voices", self._register_voice)
+        else:
+            self._dispatch("unknown", self._not_found)
+
+    def do_DELETE(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.startswith("/v1/voices/"):
+            self._dispatch("voices", lambda _: self._delete_voice(path[len("/v1/voices/"):]))
+        else:
+            self._dispatch("unknown", self._not_found)
+
+    def _not_found(self, _) -> int:
+        raise HTTPError(404, f"No route for {self.command} {self.path}", "not_found_error")
+
+    def _list_voices(self, _) -> int:
+        with self.app._voices_lock:
+            data = [
+                {"id": k, "object": "voice", "x_vector_only_mode": v.x_vector_only_mode, "icl_mode": v.icl_mode}
+                for k, v in self.app.voices.items()
+            ]
+        self.send_json(200, {"object": "list", "data": data})
+        return 200
+
+    def _register_voice(self, _) -> int:
+        body = self._read_json()
+        if isinstance(body.get("audio"), str) and body["audio"]:
+            encoded = body["audio"].split(",", 1)[1] if body["audio"].startswith("data:") else body["audio"]
+            try:
+                with io.BytesIO(base64.b64decode(encoded, validate=True)) as f:
+                    wav, sr = sf.read(f, dtype="float32", always_2d=False)
+            except (binascii.Error, ValueError, RuntimeError) as e:
+                raise HTTPError(400, f"`audio` is not a base64-encoded audio file: {e}")
+            audio = (wav if wav.ndim == 1 else wav.mean(axis=-1), int(sr))
+        elif isinstance(body.get("audio_url"), str) and body["audio_url"]:
+            audio = self.app.resolve_audio_url(body["audio_url"])
+        else:
+            raise HTTPError(400, "`audio` (a base64-encoded file) or `audio_url` (a server path or URL) is required.")
+        try:
+            voice_id = self.app.register_voice(
+                audio,
+                ref_text=body.get("ref_text"),
+                x_vector_only_mode=bool(body.get("x_vector_only_mode", False)),
+                voice_id=body.get("id"),
+            )
+        except (ValueError, OSError) as e:
+            raise HTTPError(400, f"Could not build a voice clone prompt: {e}")
+        self.send_json(200, {"id": voice_id, "object": "voice"})
+        return 200
+
+    def _delete_voice(self, voice_id: str) -> int:
+        with self.app._voices_lock:
+            removed = self.app.voices.pop(voice_id, None)
+        if removed is None:
+            raise HTTPError(404, f"Unknown voice {voice_id!r}.", "not_found_error")
+        self.send_json(200, {"id": voice_id, "object": "voice", "deleted": True})
+        return 200
+
+
+__all__ = [
+    "AudioStreamEncoder",
+    "HTTPError",
+    "RESPONSE_FORMATS",
+    "ServerMetrics",
+    "SpeechServer",
+    "encode_audio",
+    "split_for_streaming",
+]
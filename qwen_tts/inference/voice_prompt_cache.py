@@ -0,0 +1,261 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Two-tier (memory LRU + disk) cache of `VoiceClonePromptItem`s.
+
+Building a voice-clone prompt encodes the reference audio with the speech tokenizer and runs the speaker
+encoder. Both results only depend on the reference audio content, the reference text, the prompt mode and
+the engine checkpoint, so they are cached under a hash of exactly those inputs.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+_CACHE_FORMAT_VERSION = 1
+
+
+def hash_audio_bytes(data: Union[bytes, memoryview]) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_audio_file(path: str, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hash_audio_array(wav: np.ndarray, sr: int) -> str:
+    wav = np.ascontiguousarray(wav)
+    h = hashlib.sha256()
+    h.update(f"{wav.dtype.str}|{wav.shape}|{int(sr)}|".encode("utf-8"))
+    h.update(memoryview(wav).cast("B"))
+    return h.hexdigest()
+
+
+def checkpoint_fingerprint(name_or_path: str) -> str:
+    """
+    Identify an engine checkpoint. For a local directory the size and mtime of every weight file are
+    included, so re-downloading or replacing the weights invalidates prompts built with the old ones.
+    """
+    parts = [os.path.abspath(name_or_path) if os.path.isdir(name_or_path) else str(name_or_path)]
+    if os.path.isdir(name_or_path):
+        for root, _, files in sorted(os.walk(name_or_path)):
+            for fname in sorted(files):
+                if fname.endswith((".safetensors", ".bin", ".pt")):
+                    st = os.stat(os.path.join(root, fname))
+                    parts.append(f"{os.path.relpath(os.path.join(root, fname), name_or_path)}:{st.st_size}:{st.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def voice_prompt_cache_key(
+    audio_digest: str,
+    ref_text: Optional[str],
+    x_vector_only_mode: bool,
+    checkpoint_id: str,
+) -> str:
+    """
+    Cache key of one prompt item: hash of the audio content digest, reference text, prompt mode and engine
+    checkpoint fingerprint.
+    """
+    mode = "xvec" if x_vector_only_mode else "icl"
+    payload = "\x1f".join([str(_CACHE_FORMAT_VERSION), audio_digest, ref_text or "", mode, checkpoint_id])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class VoicePromptCache:
+    """
+    In-memory LRU of `VoiceClonePromptItem`s backed by an optional on-disk store.
+
+    Memory hits return the stored item as-is (tensors stay on the model device). Disk entries are written with
+    CPU tensors and moved to the requested device on load, then promoted to the memory tier. All methods are
+    thread-safe, so one cache can be shared by the UI thread and generation workers, and across engine reloads
+    (keys include the checkpoint, so entries of different engines never collide).
+
+    Args:
+        cache_dir (Optional[str]):
+            Directory of the disk tier. `None` keeps the cache in memory only.
+        max_items (int):
+            Capacity of the memory tier.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_items: int = 64):
+        self.cache_dir = cache_dir
+        self.max_items = max(int(max_items), 1)
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._sources: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pt")
+
+    def _remember(self, key: str, item: "VoiceClonePromptItem", source: Optional[str]) -> None:
+        self._items[key] = item
+        self._items.move_to_end(key)
+        self._sources[key] = source
+        while len(self._items) > self.max_items:
+            old, _ = self._items.popitem(last=False)
+            self._sources.pop(old, None)
+
+    def get(self, key: str, device: Optional[Union[str, torch.device]] = None) -> Optional["VoiceClonePromptItem"]:
+        """
+        Return the cached item for `key`, or `None`.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item
+
+        item, source = self._load(key, device)
+        with self._lock:
+            if item is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, item, source)
+        return item
+
+    def put(self, key: str, item: "VoiceClonePromptItem", source: Optional[str] = None) -> None:
+        """
+        Store `item` in both tiers. `source` (e.g. the reference audio path) is recorded for `invalidate_source`.
+        """
+        with self._lock:
+            self._remember(key, item, source)
+        if self.cache_dir is None:
+            return
+        payload = {
+            "version": _CACHE_FORMAT_VERSION,
+            "source": source,
+            "ref_code": None if item.ref_code is None else item.ref_code.detach().cpu(),
+            "ref_spk_embedding": item.ref_spk_embedding.detach().cpu(),
+            "x_vector_only_mode": bool(item.x_vector_only_mode),
+            "icl_mode": bool(item.icl_mode),
+            "ref_text": item.ref_text,
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            torch.save(payload, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[VoicePromptCache] failed to write {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, key: str, device) -> Tuple[Optional["VoiceClonePromptItem"], Optional[str]]:
+        from .qwen3_tts_model import VoiceClonePromptItem  # deferred: qwen3_tts_model imports this module
+
+        if self.cache_dir is None or not os.path.exists(self._path(key)):
+            return None, None
+        try:
+            payload = torch.load(self._path(key), map_location="cpu", weights_only=True)
+        except Exception as e:
+            print(f"[VoicePromptCache] dropping unreadable entry {key}: {e}")
+            self._remove_file(key)
+            return None, None
+        if payload.get("version") != _CACHE_FORMAT_VERSION:
+            self._remove_file(key)
+            return None, None
+        ref_code = payload["ref_code"]
+        ref_spk_embedding = payload["ref_spk_embedding"]
+        if device is not None:
+            ref_code = None if ref_code is None else ref_code.to(device)
+            ref_spk_embedding = ref_spk_embedding.to(device)
+        item = VoiceClonePromptItem(
+            ref_code=ref_code,
+            ref_spk_embedding=ref_spk_embedding,
+            x_vector_only_mode=payload["x_vector_only_mode"],
+            icl_mode=payload["icl_mode"],
+            ref_text=payload["ref_text"],
+        )
+        return item, payload.get("source")
+
+    def _remove_file(self, key: str) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop one entry from both tiers.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            self._sources.pop(key, None)
+        self._remove_file(key)
+
+    def invalidate_source(self, source: str) -> int:
+        """
+        Drop every entry that was built from `source` (e.g. after a clone profile's audio file is replaced or
+        deleted). Returns the number of entries removed.
+        """
+        source = os.path.abspath(source)
+        keys = set()
+        with self._lock:
+            keys.update(k for k, s in self._sources.items() if s is not None and os.path.abspath(s) == source)
+        if self.cache_dir is not None:
+            for fname in os.listdir(self.cache_dir):
+                if not fname.endswith(".pt"):
+                    continue
+                key = fname[:-3]
+                if key in keys:
+                    continue
+                try:
+                    s = torch.load(os.path.join(self.cache_dir, fname), map_location="cpu", weights_only=True).get("source")
+                except Exception:
+                    continue
+                if s is not None and os.path.abspath(s) == source:
+                    keys.add(key)
+        for key in keys:
+            self.invalidate(key)
+        return len(keys)
+
+    def clear(self, disk: bool = True) -> None:
+        """
+        Empty the memory tier, and the disk tier too unless `disk=False`.
+        """
+        with self._lock:
+            self._items.clear()
+            self._sources.clear()
+        if disk and self.cache_dir is not None:
+            for fname in os.listdir(self.cache_dir):
+                if fname.endswith(".pt"):
+                    self._remove_file(fname[:-3])
+
+
+__all__ = [
+    "VoicePromptCache",
+    "voice_prompt_cache_key",
+    "checkpoint_fingerprint",
+    "hash_audio_bytes",
+    "hash_audio_file",
+    "hash_audio_array",
+]
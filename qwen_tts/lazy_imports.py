@@ -0,0 +1,74 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Deferred imports for heavy dependencies.
+
+This module only depends on the standard library so it can be imported on a latency-critical path (e.g. before a
+UI window is shown) without pulling in torch, transformers or librosa.
+"""
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Usage:
+        torch = LazyModule("torch")
+        ...
+        if torch.cuda.is_available():  # torch is imported here
+            ...
+
+    The import runs at most once, under a lock, so the first access may come from any thread.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<LazyModule '{self.__name__}' ({state})>"
+
+
+def is_imported(name: str) -> bool:
+    """
+    Whether module `name` has actually been imported (a `LazyModule` that was never touched does not count).
+    """
+    return name in sys.modules
+
+
+__all__ = ["LazyModule", "is_imported"]
@@ -0,0 +1,51 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared fixtures: a tiny random-weight CustomVoice engine that runs end to end on CPU."""
+import pytest
+import torch
+
+from qwen_tts.bench.configs import BENCH_SPEAKER, TEXT_VOCAB_SIZE, build_tiny_tokenizer_12hz, build_tiny_tts_model
+from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+from qwen_tts.inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+
+
+class TinyProcessor:
+    """Character-level stand-in for the text processor, inside the tiny text vocabulary."""
+
+    def __call__(self, text=None, **kwargs):
+        texts = [text] if isinstance(text, str) else text
+        return {"input_ids": [[ord(c) % (TEXT_VOCAB_SIZE - 8) for c in t] for t in texts]}
+
+
+def build_tiny_engine(seed: int = 0) -> Qwen3TTSModel:
+    model = build_tiny_tts_model(seed=seed)
+    speech_tokenizer = Qwen3TTSTokenizer()
+    speech_tokenizer.model = build_tiny_tokenizer_12hz(seed=seed)
+    speech_tokenizer.config = speech_tokenizer.model.config
+    speech_tokenizer.device = torch.device("cpu")
+    model.load_speech_tokenizer(speech_tokenizer)
+    return Qwen3TTSModel(model, TinyProcessor())
+
+
+@pytest.fixture(scope="session")
+def tiny_engine() -> Qwen3TTSModel:
+    torch.set_num_threads(1)
+    return build_tiny_engine()
+
+
+@pytest.fixture
+def speaker() -> str:
+    return BENCH_SPEAKER
@@ -0,0 +1,47 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Host transfer and streaming file output of decoded audio."""
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from qwen_tts.inference.audio_io import StreamingAudioWriter, wavs_to_host
+
+
+def test_wavs_to_host_splits_batch_in_order():
+    wavs = [torch.linspace(-1, 1, 5), torch.full((3,), 0.5)]
+    out = wavs_to_host(wavs, dtype="int16")
+    assert [w.dtype for w in out] == [np.int16, np.int16]
+    np.testing.assert_array_equal(out[0], [-32767, -16384, 0, 16384, 32767])
+    np.testing.assert_array_equal(out[1], [16384] * 3)
+
+
+@pytest.mark.parametrize("ext, subtype", [("wav", "PCM_16"), ("flac", "PCM_16"), ("ogg", "VORBIS")])
+def test_streaming_writer_uses_container_default_subtype(tmp_path, ext, subtype):
+    path = str(tmp_path / f"scene.{ext}")
+    chunk = (0.3 * np.sin(np.arange(2400) / 10)).astype(np.float32)
+    with StreamingAudioWriter(path, 24000) as writer:
+        writer.write(chunk)
+        writer.write_silence(0.1)
+        writer.write(torch.from_numpy(chunk).half())
+    info = sf.info(path)
+    assert info.subtype == subtype
+    assert info.frames == writer.frames_written == 2 * 2400 + 2400
+    if ext != "ogg":
+        audio, sr = sf.read(path, dtype="float32")
+        assert sr == 24000
+        np.testing.assert_allclose(audio[:2400], chunk, atol=1e-4)
@@ -0,0 +1,66 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Memory-planned generation: sub-batch sizing, and seeded calls that do not depend on it."""
+import numpy as np
+import pytest
+
+from qwen_tts.inference import qwen3_tts_model
+from qwen_tts.inference.batch_planner import estimate_memory_profile
+
+TEXTS = ["hello there", "bye now", "abc", "a longer line"]
+
+
+@pytest.fixture
+def two_item_free_memory(tiny_engine, monkeypatch):
+    """Free memory that fits two of the four sequences; restores the default budget afterwards."""
+    profile = estimate_memory_profile(tiny_engine.model)
+    free = int(profile.peak_bytes(2, 64, 8) / tiny_engine.memory_budget_fraction) + 1024
+    monkeypatch.setattr(qwen3_tts_model, "available_memory_bytes", lambda device: free)
+    tiny_engine.set_memory_budget()
+    yield
+    tiny_engine.set_memory_budget()
+
+
+def _generate(engine, speaker, **kwargs):
+    return engine.generate_custom_voice(TEXTS, speaker=speaker, language="Auto", max_new_tokens=8, **kwargs)
+
+
+def test_free_memory_splits_unseeded_calls_only(tiny_engine, two_item_free_memory):
+    assert tiny_engine.plan_batch(len(TEXTS), 20, 8).batch_size == 2
+    assert tiny_engine.plan_batch(len(TEXTS), 20, 8, seeded=True).batch_size == len(TEXTS)
+
+
+def test_seeded_planned_call_matches_unplanned(tiny_engine, speaker, two_item_free_memory):
+    planned, sr = _generate(tiny_engine, speaker, seed=7)
+    tiny_engine.set_memory_budget(enabled=False)
+    unplanned, sr2 = _generate(tiny_engine, speaker, seed=7)
+    assert sr == sr2
+    for a, b in zip(planned, unplanned):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_fixed_budget_split_is_reproducible(tiny_engine, speaker):
+    profile = estimate_memory_profile(tiny_engine.model)
+    tiny_engine.set_memory_budget(budget_bytes=profile.peak_bytes(2, 64, 8))
+    try:
+        assert tiny_engine.plan_batch(len(TEXTS), 20, 8, seeded=True).batch_size == 2
+        first, _ = _generate(tiny_engine, speaker, seed=3)
+        second, _ = _generate(tiny_engine, speaker, seed=3)
+    finally:
+        tiny_engine.set_memory_budget()
+    assert len(first) == len(TEXTS)
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,58 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The shared mel front-end against the per-utterance computation it replaced."""
+import pytest
+import torch
+from librosa.filters import mel as librosa_mel_fn
+
+from qwen_tts.core.mel_frontend import batched_mel_spectrogram
+from qwen_tts.core.models.modeling_qwen3_tts import mel_spectrogram
+
+MEL_ARGS = dict(n_fft=1024, num_mels=80, sampling_rate=24000, hop_size=256, win_size=1024, fmin=0, fmax=None)
+
+
+def _reference_mel(y, n_fft, num_mels, sampling_rate, hop_size, win_size, fmin, fmax, center):
+    mel_basis = torch.from_numpy(
+        librosa_mel_fn(sr=sampling_rate, n_fft=n_fft, n_mels=num_mels, fmin=fmin, fmax=fmax)
+    ).float()
+    padding = (n_fft - hop_size) // 2
+    y = torch.nn.functional.pad(y.unsqueeze(1), (padding, padding), mode="reflect").squeeze(1)
+    spec = torch.stft(
+        y, n_fft, hop_length=hop_size, win_length=win_size, window=torch.hann_window(win_size),
+        center=center, pad_mode="reflect", normalized=False, onesided=True, return_complex=True,
+    )
+    spec = torch.sqrt(torch.view_as_real(spec).pow(2).sum(-1) + 1e-9)
+    return torch.log(torch.clamp(torch.matmul(mel_basis, spec), min=1e-5))
+
+
+@pytest.mark.parametrize("center", [False, True])
+def test_mel_spectrogram_matches_reference(center):
+    y = torch.rand(2, 12000, generator=torch.Generator().manual_seed(0)) * 1.6 - 0.8
+    expected = _reference_mel(y, center=center, **MEL_ARGS)
+    actual = mel_spectrogram(y, center=center, **MEL_ARGS)
+    assert actual.shape == expected.shape
+    torch.testing.assert_close(actual, expected, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("center", [False, True])
+def test_batched_items_match_single_items(center):
+    gen = torch.Generator().manual_seed(1)
+    wavs = [torch.rand(n, generator=gen) - 0.5 for n in (9000, 4000, 6500)]
+    mel, frame_lengths = batched_mel_spectrogram(wavs, center=center, **MEL_ARGS)
+    for i, w in enumerate(wavs):
+        expected = _reference_mel(w.unsqueeze(0), center=center, **MEL_ARGS)[0]
+        assert int(frame_lengths[i]) == expected.shape[-1]
+        torch.testing.assert_close(mel[i, :, : expected.shape[-1]], expected, rtol=1e-4, atol=1e-4)
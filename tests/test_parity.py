@@ -0,0 +1,34 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The default parity gate must pass on the tiny models."""
+from qwen_tts.bench.parity import DEFAULT_CANDIDATES, run_parity
+
+
+def test_default_chunked_decode_candidates_pass():
+    reports = run_parity("chunked_decode")
+    assert [r.candidate for r in reports] == list(DEFAULT_CANDIDATES["chunked_decode"])
+    assert all(r.passed for r in reports), "\n".join(r.format() for r in reports)
+
+
+def test_default_generate_candidates_pass():
+    reports = run_parity("generate")
+    assert reports and all(r.passed for r in reports), "\n".join(r.format() for r in reports)
+
+
+def test_bfloat16_uses_its_own_tolerance():
+    (report,) = run_parity("chunked_decode", ["bfloat16"])
+    assert report.passed, report.format()
+    assert report.min_snr_db == 30.0
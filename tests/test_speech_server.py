@@ -0,0 +1,93 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""qwen-tts-serve endpoints, over localhost, on the tiny engine."""
+import io
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+import soundfile as sf
+
+from qwen_tts.inference.speech_server import HTTPError, SpeechServer, split_for_streaming
+
+
+@pytest.fixture
+def server(tiny_engine):
+    server = SpeechServer(tiny_engine, port=0, access_log=False, generate_defaults={"max_new_tokens": 6}).start()
+    yield server
+    server.shutdown()
+
+
+def _post(server, path, body):
+    host, port = server.address
+    request = urllib.request.Request(
+        f"http://{host}:{port}{path}", data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_split_for_streaming_drops_empty_paragraphs():
+    assert split_for_streaming("||") == []
+    assert split_for_streaming("One. Two.|| Three.", max_chars=5) == [("One.", False), ("Two.", True), ("Three.", True)]
+
+
+def test_speech_streams_a_wav(server, speaker):
+    status, body = _post(server, "/v1/audio/speech", {"input": "Hello. Bye.", "voice": speaker, "seed": 1})
+    assert status == 200
+    wav, sr = sf.read(io.BytesIO(body), dtype="float32")
+    assert sr == server.sample_rate and len(wav) > 0
+
+
+@pytest.mark.parametrize("text", ["||", " || \n\n "])
+def test_input_without_text_is_a_client_error(server, speaker, text):
+    status, body = _post(server, "/v1/audio/speech", {"input": text, "voice": speaker})
+    assert status == 400
+    assert "no text to speak" in json.loads(body)["error"]["message"]
+
+
+def test_audio_url_is_refused_by_default(server, tmp_path):
+    ref = tmp_path / "ref.wav"
+    sf.write(str(ref), [0.0] * 2400, 24000)
+    for audio_url in (str(ref), "https://example.com/ref.wav"):
+        status, body = _post(server, "/v1/voices", {"audio_url": audio_url, "x_vector_only_mode": True})
+        assert status == 403, body
+
+
+def test_audio_url_is_confined_to_voice_audio_dirs(tiny_engine, tmp_path):
+    allowed = tmp_path / "voices"
+    allowed.mkdir()
+    sf.write(str(allowed / "ref.wav"), [0.0] * 2400, 24000)
+    outside = tmp_path / "secret.wav"
+    sf.write(str(outside), [0.0] * 2400, 24000)
+    (allowed / "link.wav").symlink_to(outside)
+    server = SpeechServer(tiny_engine, port=0, access_log=False, voice_audio_dirs=[str(allowed)])
+    try:
+        assert server.resolve_audio_url("ref.wav") == str((allowed / "ref.wav").resolve())
+        assert server.resolve_audio_url(str(allowed / "ref.wav")) == str((allowed / "ref.wav").resolve())
+        for audio_url in ("../secret.wav", str(outside), "link.wav", "missing.wav", "http://127.0.0.1/ref.wav"):
+            with pytest.raises(HTTPError) as e:
+                server.resolve_audio_url(audio_url)
+            assert e.value.status == 403
+        server.allow_audio_urls = True
+        assert server.resolve_audio_url("http://127.0.0.1/ref.wav") == "http://127.0.0.1/ref.wav"
+    finally:
+        server.shutdown()